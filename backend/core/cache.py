@@ -0,0 +1,64 @@
+# Bounded in-memory LRU cache
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """크기 제한이 있는 LRU 캐시입니다. 적중/미스/제거 횟수를 함께 집계합니다."""
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """값을 조회하고 가장 최근에 사용한 항목으로 표시합니다."""
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값을 저장하고 용량을 넘으면 가장 오래 사용하지 않은 항목을 제거합니다."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """항목을 제거하고 값을 반환합니다."""
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다. 집계 값은 유지합니다."""
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """현재 크기와 적중/미스/제거 횟수를 반환합니다."""
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
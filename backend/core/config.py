@@ -20,6 +20,118 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     
+    # 황금키워드 기본 조건
+    GOLDEN_MIN_SEARCH_VOLUME: int = 1000
+    GOLDEN_MAX_DOCUMENT_COUNT: int = 10000
+    GOLDEN_MIN_VIEW_COUNT: int = 0
+    GOLDEN_MIN_SEARCH_DOCUMENT_RATIO: float = 0.5
+    
+    # 대량 조회/수정 설정
+    DB_FETCH_PAGE_SIZE: int = 1000
+    DB_UPDATE_CHUNK_SIZE: int = 500
+    
+    # 키워드 일괄 업서트 설정
+    KEYWORD_BULK_CHUNK_SIZE: int = 500
+    KEYWORD_BULK_MAX_CHUNK_SIZE: int = 5000
+    
+    # 키워드 지표 제공자 및 캐시 설정
+    KEYWORD_METRICS_PROVIDER: str = "fake"
+    KEYWORD_METRICS_FAKE_LATENCY_MS: int = 50
+    KEYWORD_METRICS_CACHE_SIZE: int = 50000
+    KEYWORD_METRICS_CACHE_TTL_SECONDS: int = 3600
+    KEYWORD_METRICS_CACHE_STALE_SECONDS: int = 86400
+    KEYWORD_METRICS_RATE_LIMIT_PER_SECOND: float = 50.0
+    KEYWORD_METRICS_FAKE_RELATED_COUNT: int = 200
+    
+    # 주제 확장 파이프라인 설정
+    KEYWORD_EXPANSION_CONCURRENCY: int = 16
+    KEYWORD_EXPANSION_MAX_CONCURRENCY: int = 128
+    
+    # 기회 점수 순위 설정
+    KEYWORD_TOP_K_DEFAULT: int = 50
+    KEYWORD_TOP_K_MAX: int = 500
+    
+    # 지표 이력 설정
+    KEYWORD_HISTORY_DEFAULT_POINTS: int = 100
+    KEYWORD_HISTORY_MAX_POINTS: int = 1000
+    KEYWORD_HISTORY_MAX_BATCH_SIZE: int = 5000
+    
+    # 글 생성 설정
+    SCRIPT_GENERATOR_PROVIDER: str = "fake"
+    SCRIPT_GENERATOR_FAKE_CHUNK_DELAY_MS: int = 30
+    SCRIPT_GENERATOR_FAKE_PARAGRAPH_COUNT: int = 8
+    
+    # 글 일괄 생성 작업 설정 (SCRIPT_JOB_WORKERS가 0이면 CPU 코어 수만큼 사용)
+    SCRIPT_JOB_WORKERS: int = 0
+    SCRIPT_JOB_QUEUE_SIZE: int = 100
+    SCRIPT_JOB_MAX_KEYWORDS: int = 1000
+    SCRIPT_JOB_HISTORY_SIZE: int = 100
+    
+    # 글 부분 수정 설정
+    SCRIPT_PATCH_MAX_EDITS: int = 1000
+    
+    # 유사 글 탐지 설정 (밴드 수가 많을수록 낮은 유사도의 글도 후보가 됩니다)
+    SCRIPT_MINHASH_NUM_PERM: int = 128
+    SCRIPT_MINHASH_BANDS: int = 32
+    SCRIPT_MINHASH_SHINGLE_SIZE: int = 4
+    SCRIPT_DUPLICATE_MIN_SIMILARITY: float = 0.5
+    
+    # 글 템플릿 설정
+    SCRIPT_TEMPLATE_CACHE_SIZE: int = 256
+    
+    # 발행용 HTML 변환 캐시 설정 (디스크 캐시는 마지막 사용 후 보관 일수가 지나면 서버 시작 시 정리합니다)
+    NAVER_HTML_CACHE_SIZE: int = 256
+    NAVER_HTML_CACHE_DIR: str = "cache/naver_html"
+    NAVER_HTML_CACHE_MAX_AGE_DAYS: int = 30
+    
+    # 이어받기 업로드 설정 (마지막으로 청크를 받은 뒤 UPLOAD_SESSION_TTL_SECONDS가 지난 세션은 삭제합니다)
+    UPLOAD_STORAGE_DIR: str = "storage/uploads"
+    UPLOAD_SESSION_DIR: str = "storage/upload_sessions"
+    UPLOAD_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    UPLOAD_CHUNK_WRITE_SIZE: int = 64 * 1024
+    UPLOAD_SESSION_TTL_SECONDS: int = 24 * 60 * 60
+    UPLOAD_SESSION_PRUNE_INTERVAL_SECONDS: int = 10 * 60
+
+    # 이미지 업로드 설정 (본문은 청크 단위로 디스크에 바로 기록합니다)
+    IMAGE_STORAGE_DIR: str = "storage/images"
+    IMAGE_PUBLIC_URL_PREFIX: str = "/images"
+    IMAGE_UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024
+    IMAGE_UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    
+    # 이미지 파일 응답 설정 (파일은 내용 해시로 정해지므로 immutable로 오래 캐시하게 합니다)
+    IMAGE_CACHE_MAX_AGE_SECONDS: int = 365 * 24 * 60 * 60
+    IMAGE_LOCATION_CACHE_SIZE: int = 10000
+
+    # 파생 이미지 설정 (썸네일은 정사각형으로 자르고, 네이버용은 본문 폭에 맞춰 줄입니다)
+    IMAGE_THUMBNAIL_SIZE: int = 320
+    IMAGE_NAVER_WIDTH: int = 966
+    IMAGE_DERIVATIVE_WORKERS: int = 2
+    IMAGE_DERIVATIVE_MAX_PENDING: int = 200
+    
+    # 이미지 크기 일괄 채우기 설정 (파일 헤더만 읽으므로 I/O 대기 위주라 스레드로 병렬 처리합니다)
+    IMAGE_METADATA_BACKFILL_WORKERS: int = 8
+    IMAGE_METADATA_BACKFILL_BATCH_SIZE: int = 500
+
+    # 유사 이미지 탐지 설정 (거리는 64비트 dHash의 해밍 거리입니다)
+    IMAGE_SIMILAR_DEFAULT_DISTANCE: int = 8
+    IMAGE_SIMILAR_MAX_DISTANCE: int = 12
+
+    # 연결이 끊긴 이미지 정리 설정 (IMAGE_GC_INTERVAL_SECONDS가 0이면 자동 정리를 끕니다)
+    IMAGE_GC_INTERVAL_SECONDS: int = 300
+    IMAGE_GC_BATCH_SIZE: int = 100
+
+    # 네이버 발행 큐 설정 (속도 제한은 블로그 계정별이며, 재시도 간격은 지수적으로 늘어납니다)
+    NAVER_PUBLISHER: str = "fake"
+    NAVER_PUBLISH_FAKE_LATENCY_MS: int = 500
+    NAVER_PUBLISH_FAKE_FAILURE_RATE: float = 0.0
+    NAVER_PUBLISH_WORKERS: int = 4
+    NAVER_PUBLISH_RATE_PER_MINUTE: float = 6.0
+    NAVER_PUBLISH_MAX_ATTEMPTS: int = 5
+    NAVER_PUBLISH_RETRY_BASE_SECONDS: float = 30.0
+    NAVER_PUBLISH_RETRY_MAX_SECONDS: float = 3600.0
+    NAVER_PUBLISH_LEASE_SECONDS: int = 300
+    NAVER_PUBLISH_POLL_INTERVAL_SECONDS: float = 5.0
+
     # 기타 설정
     SECRET_KEY: str = ""
     
@@ -0,0 +1,66 @@
+# Content-addressed on-disk cache
+
+import os
+import tempfile
+import time
+from typing import Optional
+
+
+class DiskCache:
+    """키(해시 문자열)별로 파일 하나를 저장하는 디스크 캐시입니다.
+
+    키 앞 두 글자로 하위 디렉터리를 나눠 디렉터리당 파일 수를 줄이고,
+    임시 파일에 쓴 뒤 교체하므로 동시에 읽는 쪽이 쓰다 만 파일을 보지 않습니다.
+    """
+
+    def __init__(self, directory: str, suffix: str = ""):
+        self.directory = directory
+        self.suffix = suffix
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """저장된 값을 반환하고 마지막 사용 시각을 갱신합니다. 없으면 None을 반환합니다."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # 읽은 뒤 정리로 지워졌으면 다음 호출부터 캐시 미스가 됩니다
+            pass
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        """값을 원자적으로 저장합니다."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def prune(self, max_age_seconds: float) -> int:
+        """마지막 사용 후 max_age_seconds가 지난 파일을 삭제하고 삭제한 수를 반환합니다."""
+        if not os.path.isdir(self.directory):
+            return 0
+        expires_before = time.time() - max_age_seconds
+        removed = 0
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    if os.stat(path).st_mtime < expires_before:
+                        os.unlink(path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
@@ -38,3 +38,24 @@ class ForbiddenException(CustomException):
     
     def __init__(self, message: str = "Forbidden"):
         super().__init__(message, status_code=403)
+
+
+class ConflictException(CustomException):
+    """리소스 상태 충돌 시 발생하는 예외 (예: 버전 불일치)"""
+    
+    def __init__(self, message: str = "Conflict"):
+        super().__init__(message, status_code=409)
+
+
+class PayloadTooLargeException(CustomException):
+    """요청 본문이 허용 크기를 넘을 때 발생하는 예외"""
+    
+    def __init__(self, message: str = "Payload too large"):
+        super().__init__(message, status_code=413)
+
+
+class UnsupportedMediaTypeException(CustomException):
+    """지원하지 않는 파일 형식일 때 발생하는 예외"""
+    
+    def __init__(self, message: str = "Unsupported media type"):
+        super().__init__(message, status_code=415)
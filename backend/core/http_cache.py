@@ -0,0 +1,37 @@
+# Conditional GET helpers for immutable files
+
+from typing import Dict, Optional
+from fastapi import Response
+from fastapi.responses import FileResponse
+
+
+def immutable_cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    """내용이 바뀌지 않는 파일의 ETag와 Cache-Control 헤더를 반환합니다."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, immutable",
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag를 포함하는지 확인합니다. RFC 9110에 따라 약한 비교를 합니다."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified_response(etag: str, max_age: int) -> Response:
+    """본문 없는 304 응답을 반환합니다."""
+    return Response(status_code=304, headers=immutable_cache_headers(etag, max_age))
+
+
+def immutable_file_response(path: str, media_type: str, etag: str, max_age: int) -> FileResponse:
+    """파일을 그대로 보내는 응답을 반환합니다.
+
+    FileResponse가 Range/If-Range 요청은 206으로 처리하고, 서버가 http.response.pathsend 확장을 지원하면
+    파일 경로만 넘겨 서버가 sendfile로 보내게 합니다. 지정한 ETag가 mtime 기반 기본값 대신 쓰입니다.
+    """
+    return FileResponse(path, media_type=media_type, headers=immutable_cache_headers(etag, max_age))
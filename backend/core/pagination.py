@@ -0,0 +1,42 @@
+# Offset and keyset (cursor) pagination helpers
+
+from typing import Any, Optional, Sequence
+from fastapi import Response
+from core.exceptions import ValidationException
+from utils.pagination_utils import decode_cursor, encode_cursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def paginate_query(query: Any, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Any:
+    """(created_at DESC, id DESC) 순서로 정렬하고 커서 또는 오프셋 페이지를 적용합니다.
+
+    커서가 주어지면 skip은 무시하고 마지막으로 받은 행 다음부터 조회합니다.
+    """
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    if cursor is None:
+        return query.range(skip, skip + limit - 1)
+
+    try:
+        created_at, row_id = decode_cursor(cursor)
+    except ValueError as e:
+        raise ValidationException(str(e))
+    # (created_at, id) < (커서 created_at, 커서 id) 를 PostgREST 필터로 표현합니다
+    return query.or_(
+        f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{row_id}")'
+    ).limit(limit)
+
+
+def build_next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """페이지가 가득 찼으면 마지막 항목 기준의 다음 커서를 반환합니다."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    last_item = items[-1]
+    return encode_cursor(last_item.created_at.isoformat(), str(last_item.id))
+
+
+def set_next_cursor_header(response: Response, items: Sequence[Any], limit: int) -> None:
+    """다음 페이지 커서를 응답 헤더에 기록합니다."""
+    next_cursor = build_next_cursor(items, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,30 @@
+# Asyncio token bucket rate limiter
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """초당 허용량과 순간 허용량(burst)을 가진 토큰 버킷 방식의 비동기 속도 제한기입니다."""
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_second)))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 기다립니다."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
@@ -0,0 +1,24 @@
+# Server-Sent Events response helpers
+
+import json
+from typing import Any, AsyncIterator
+from fastapi.responses import StreamingResponse
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# 프록시가 응답을 모아서 보내지 않도록 버퍼링을 끕니다
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """이벤트 이름과 JSON 데이터를 SSE 메시지 형식으로 변환합니다."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """SSE 메시지 스트림을 그대로 흘려보내는 응답을 반환합니다."""
+    return StreamingResponse(events, media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
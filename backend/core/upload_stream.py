@@ -0,0 +1,194 @@
+# Streaming multipart file receiver
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import Callable, Dict, Optional
+from fastapi import Request
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+from core.exceptions import PayloadTooLargeException, UnsupportedMediaTypeException, ValidationException
+
+# Content-Length로 미리 거를 때 파일 외 multipart 경계/헤더 몫으로 허용하는 여유분
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class StreamedFile:
+    """요청 본문에서 디스크 임시 파일로 받아 둔 업로드 파일입니다."""
+
+    def __init__(self, path: str, filename: str, size: int, sha256: str, mime_type: str):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.mime_type = mime_type
+
+    def discard(self) -> None:
+        """임시 파일을 삭제합니다."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _FileSink:
+    """받은 바이트를 해시/크기 계산과 함께 고정 크기 단위로 임시 파일에 기록합니다."""
+
+    def __init__(
+        self,
+        directory: str,
+        filename: str,
+        max_bytes: int,
+        chunk_size: int,
+        sniff: Callable[[bytes], Optional[str]],
+        sniff_bytes: int,
+        on_data: Optional[Callable[[bytes], None]] = None
+    ):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        self._file = os.fdopen(fd, "wb", buffering=0)
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.mime_type: Optional[str] = None
+        self._sniff = sniff
+        self._sniff_bytes = sniff_bytes
+        self._on_data = on_data
+        self._hash = hashlib.sha256()
+        self._pending = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """파서 콜백에서 동기로 호출됩니다. 디스크 기록은 flush에서 합니다."""
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise PayloadTooLargeException(f"File exceeds {self.max_bytes} bytes")
+        self._hash.update(data)
+        if self._on_data is not None:
+            self._on_data(data)
+        self._pending += data
+        if self.mime_type is None and len(self._pending) >= self._sniff_bytes:
+            self._detect_mime_type()
+
+    def has_full_chunk(self) -> bool:
+        return len(self._pending) >= self.chunk_size
+
+    async def flush(self, final: bool = False) -> None:
+        """모인 바이트를 chunk_size 단위로 기록합니다. final이면 남은 바이트도 모두 기록합니다."""
+        while len(self._pending) >= self.chunk_size or (final and self._pending):
+            chunk = bytes(self._pending[:self.chunk_size])
+            del self._pending[:self.chunk_size]
+            await asyncio.to_thread(self._file.write, chunk)
+
+    async def close(self) -> StreamedFile:
+        if self.mime_type is None:
+            self._detect_mime_type()
+        await self.flush(final=True)
+        await asyncio.to_thread(self._file.close)
+        return StreamedFile(self.path, self.filename, self.size, self._hash.hexdigest(), self.mime_type)
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _detect_mime_type(self) -> None:
+        # 형식을 판별할 수 있는 시점에 바로 거절해 나머지 본문을 받지 않습니다
+        self.mime_type = self._sniff(bytes(self._pending[:self._sniff_bytes]))
+        if self.mime_type is None:
+            raise UnsupportedMediaTypeException("Unsupported file type")
+
+
+async def receive_multipart_file(
+    request: Request,
+    field_name: str,
+    directory: str,
+    max_bytes: int,
+    chunk_size: int,
+    sniff: Callable[[bytes], Optional[str]],
+    sniff_bytes: int,
+    on_data: Optional[Callable[[bytes], None]] = None
+) -> StreamedFile:
+    """multipart/form-data 본문을 받는 대로 파싱해 field_name 파일 필드를 임시 파일로 기록합니다.
+
+    본문 전체를 메모리나 임시 스풀에 올리지 않으므로 요청당 메모리 사용량은 chunk_size 수준으로 일정합니다.
+    크기는 Content-Length와 실제 받은 바이트 수로 두 번 확인하고, 형식은 앞부분 바이트를 sniff로 판별합니다.
+    on_data가 있으면 받은 파일 바이트를 순서대로 넘겨 헤더 해석 등을 같은 패스에서 할 수 있게 합니다.
+    다른 필드는 무시하며, 실패하면 임시 파일을 지우고 예외를 발생시킵니다.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise ValidationException("Expected multipart/form-data with a boundary")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise PayloadTooLargeException(f"File exceeds {max_bytes} bytes")
+
+    state: Dict[str, object] = {"sink": None, "receiving": False, "done": False}
+    header_field = bytearray()
+    header_value = bytearray()
+    headers: Dict[bytes, bytes] = {}
+
+    def on_part_begin() -> None:
+        headers.clear()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished() -> None:
+        _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", "replace")
+        filename = disposition.get(b"filename")
+        if state["done"] or state["sink"] is not None or name != field_name or filename is None:
+            return
+        state["sink"] = _FileSink(
+            directory, filename.decode("utf-8", "replace"), max_bytes, chunk_size, sniff, sniff_bytes, on_data
+        )
+        state["receiving"] = True
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if state["receiving"]:
+            state["sink"].write(data[start:end])
+
+    def on_part_end() -> None:
+        if state["receiving"]:
+            state["receiving"] = False
+            state["done"] = True
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            sink: Optional[_FileSink] = state["sink"]
+            if sink is not None and sink.has_full_chunk():
+                await sink.flush()
+        parser.finalize()
+        if not state["done"]:
+            raise ValidationException(f"Missing file field: {field_name}")
+        return await state["sink"].close()
+    except MultipartParseError as e:
+        if state["sink"] is not None:
+            state["sink"].discard()
+        raise ValidationException(f"Malformed multipart body: {e}")
+    except BaseException:
+        if state["sink"] is not None:
+            state["sink"].discard()
+        raise
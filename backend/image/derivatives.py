@@ -0,0 +1,210 @@
+# Image derivative (thumbnail/resize) pipeline on a process pool
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+from PIL import Image, ImageOps
+from core.config import settings
+from core.logger import logger
+from .similarity import compute_perceptual_hash
+from .storage import image_file_name, image_storage_path
+
+T = TypeVar("T")
+
+DERIVATIVE_FORMATS = {"jpeg": ("JPEG", "jpg", "image/jpeg"), "webp": ("WEBP", "webp", "image/webp")}
+
+
+class DerivativeSpec:
+    """파생 이미지 한 종류의 크기와 형식입니다.
+
+    crop이면 비율을 유지한 채 width x height를 꽉 채우도록 자르고, 아니면 그 안에 들어가도록 줄입니다.
+    height가 0이면 너비만 맞춥니다. 원본보다 크게 늘리지는 않습니다.
+    """
+
+    def __init__(self, width: int, height: int, crop: bool, format: str, quality: int):
+        self.width = width
+        self.height = height
+        self.crop = crop
+        self.format = format
+        self.quality = quality
+
+    @property
+    def media_type(self) -> str:
+        return DERIVATIVE_FORMATS[self.format][2]
+
+    @property
+    def cache_key(self) -> str:
+        """설정이 바뀌면 다른 파일이 되도록 크기/형식/품질을 모두 포함합니다."""
+        mode = "c" if self.crop else "f"
+        return f"{mode}{self.width}x{self.height}q{self.quality}.{DERIVATIVE_FORMATS[self.format][1]}"
+
+
+def build_derivative_specs() -> Dict[str, DerivativeSpec]:
+    return {
+        "thumbnail": DerivativeSpec(
+            settings.IMAGE_THUMBNAIL_SIZE, settings.IMAGE_THUMBNAIL_SIZE, crop=True, format="webp", quality=80
+        ),
+        "naver": DerivativeSpec(settings.IMAGE_NAVER_WIDTH, 0, crop=False, format="jpeg", quality=85),
+    }
+
+
+def derivative_dir(content_hash: str) -> str:
+    return os.path.join(settings.IMAGE_STORAGE_DIR, "derivatives", content_hash[:2])
+
+
+def derivative_path(content_hash: str, spec: DerivativeSpec) -> str:
+    """내용 해시와 크기/형식으로 정해지는 파생 이미지 경로를 반환합니다."""
+    return os.path.join(derivative_dir(content_hash), f"{content_hash}_{spec.cache_key}")
+
+
+def remove_derivatives(content_hash: str) -> None:
+    """원본의 파생 이미지를 이전 설정으로 만든 것까지 모두 삭제합니다."""
+    directory = derivative_dir(content_hash)
+    if not os.path.isdir(directory):
+        return
+    for file_name in os.listdir(directory):
+        if file_name.startswith(content_hash + "_"):
+            try:
+                os.unlink(os.path.join(directory, file_name))
+            except FileNotFoundError:
+                pass
+
+
+def render_derivative(
+    source_path: str,
+    target_path: str,
+    width: int,
+    height: int,
+    crop: bool,
+    format: str,
+    quality: int
+) -> Tuple[int, int]:
+    """원본을 읽어 파생 이미지를 저장하고 (너비, 높이)를 반환합니다. 프로세스 풀 작업자에서 실행됩니다."""
+    with Image.open(source_path) as source:
+        # 움직이는 GIF는 첫 프레임을 사용합니다
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        if crop and height:
+            size = (min(width, image.width), min(height, image.height))
+            image = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+        else:
+            image.thumbnail((width, height or image.height), Image.Resampling.LANCZOS)
+        pil_format = DERIVATIVE_FORMATS[format][0]
+        if pil_format == "JPEG" and image.mode != "RGB":
+            # 투명 영역은 흰 배경으로 채웁니다
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", image.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                image.save(file, pil_format, quality=quality, optimize=True)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return image.width, image.height
+
+
+class ImageDerivativePipeline:
+    """업로드된 이미지의 파생 이미지를 크기 제한 프로세스 풀에서 생성합니다.
+
+    업로드 직후에는 schedule로 모든 종류를 미리 만들고, 요청 시에는 ensure로 아직 없는 것만 만듭니다.
+    같은 파일을 동시에 요청하면 한 번만 생성합니다. 유사 이미지 탐지용 dHash 계산도 같은 풀에서 합니다.
+    미리 만들기는 대기 중인 작업이 max_pending을 넘으면 건너뛰며, 그 경우 첫 요청 때 생성됩니다.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, specs: Dict[str, DerivativeSpec]):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.specs = specs
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, "asyncio.Future[Tuple[int, int]]"] = {}
+
+    def start(self) -> None:
+        if self._pool is None:
+            # 이벤트 루프와 백그라운드 스레드가 있는 프로세스를 fork하지 않도록 spawn을 사용합니다
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Image derivative workers started: workers={self.max_workers}")
+
+    async def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._inflight.clear()
+            logger.info("Image derivative workers stopped")
+
+    def schedule(self, content_hash: str, mime_type: str) -> None:
+        """모든 종류의 파생 이미지 생성을 예약하고 바로 반환합니다."""
+        for name, spec in self.specs.items():
+            if len(self._inflight) >= self.max_pending:
+                logger.warning(f"Image derivative backlog full, deferring to first request: sha256={content_hash}")
+                return
+            if not os.path.exists(derivative_path(content_hash, spec)):
+                future = self._submit(content_hash, mime_type, spec)
+                future.add_done_callback(_log_failure)
+
+    async def ensure(self, content_hash: str, mime_type: str, name: str) -> str:
+        """파생 이미지 경로를 반환합니다. 아직 없으면 생성이 끝날 때까지 기다립니다."""
+        spec = self.specs[name]
+        path = derivative_path(content_hash, spec)
+        if not os.path.exists(path):
+            # 요청이 취소되어도 같은 파일을 기다리는 다른 요청의 생성 작업은 계속되어야 합니다
+            await asyncio.shield(self._submit(content_hash, mime_type, spec))
+        return path
+
+    async def perceptual_hash(self, content_hash: str, mime_type: str) -> int:
+        """원본의 dHash를 작업자 프로세스에서 계산해 반환합니다."""
+        source_path = image_storage_path(image_file_name(content_hash, mime_type))
+        return await asyncio.shield(self._run(compute_perceptual_hash, source_path))
+
+    def _submit(self, content_hash: str, mime_type: str, spec: DerivativeSpec) -> "asyncio.Future[Tuple[int, int]]":
+        path = derivative_path(content_hash, spec)
+        future = self._inflight.get(path)
+        if future is None:
+            source_path = image_storage_path(image_file_name(content_hash, mime_type))
+            future = self._run(
+                render_derivative, source_path, path, spec.width, spec.height, spec.crop, spec.format, spec.quality
+            )
+            self._inflight[path] = future
+            future.add_done_callback(lambda _: self._inflight.pop(path, None))
+        return future
+
+    def _run(self, function: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+        self.start()
+        try:
+            submitted = self._pool.submit(function, *args)
+        except BrokenProcessPool:
+            # 작업자가 비정상 종료(디코더 크래시 등)되면 풀을 새로 만들어 이후 요청은 계속 처리합니다
+            logger.warning("Image derivative pool was broken, restarting workers")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.start()
+            submitted = self._pool.submit(function, *args)
+        return asyncio.wrap_future(submitted)
+
+
+def _log_failure(future: "asyncio.Future[Tuple[int, int]]") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Image derivative generation failed: {future.exception()}")
+
+
+@lru_cache()
+def get_image_derivative_pipeline() -> ImageDerivativePipeline:
+    """파생 이미지 파이프라인 싱글톤 인스턴스를 반환합니다."""
+    return ImageDerivativePipeline(
+        max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+        max_pending=settings.IMAGE_DERIVATIVE_MAX_PENDING,
+        specs=build_derivative_specs(),
+    )
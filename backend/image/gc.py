@@ -0,0 +1,48 @@
+# Periodic garbage collection of orphaned image files
+
+import asyncio
+from functools import lru_cache
+from typing import Optional
+from core.config import settings
+from core.logger import logger
+from .service import get_image_service
+
+
+class ImageGarbageCollector:
+    """글 연결이 모두 끊긴 이미지를 주기적으로 정리하는 백그라운드 태스크입니다."""
+
+    def __init__(self, interval_seconds: float, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="image-gc")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def collect(self) -> int:
+        """정리 대기열을 한 번 비우고 삭제한 이미지 수를 반환합니다."""
+        return get_image_service().collect_orphaned_images(self.batch_size)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.collect)
+            except Exception as e:
+                logger.error(f"Image garbage collection failed: {e}")
+
+
+@lru_cache()
+def get_image_garbage_collector() -> ImageGarbageCollector:
+    """이미지 정리 태스크 싱글톤 인스턴스를 반환합니다."""
+    return ImageGarbageCollector(
+        interval_seconds=settings.IMAGE_GC_INTERVAL_SECONDS,
+        batch_size=settings.IMAGE_GC_BATCH_SIZE,
+    )
@@ -0,0 +1,174 @@
+# Header-only image metadata (format and dimensions) extraction
+
+import mmap
+import os
+import struct
+from typing import Generator, Optional, Tuple, Union
+
+# JPEG에서 크기 정보를 담는 SOF 마커 (DHT, JPG, DAC는 제외)
+JPEG_SOF_MARKERS = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+# 길이 필드 없이 마커만 있는 세그먼트 (TEM, RST0-7)
+JPEG_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD8)))
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+
+# 파서 요청: ("read", n)이면 다음 n바이트를, ("skip", n)이면 n바이트를 건너뛴 뒤 None을 보내야 합니다
+ParserRequest = Tuple[str, int]
+HeaderParser = Generator[ParserRequest, Optional[bytes], Optional["ImageMetadata"]]
+
+
+class ImageMetadata:
+    """파일 헤더에서 읽은 이미지 형식과 크기입니다."""
+
+    def __init__(self, mime_type: str, width: int, height: int):
+        self.mime_type = mime_type
+        self.width = width
+        self.height = height
+
+
+def _parse_header() -> HeaderParser:
+    """파일 앞에서부터 필요한 바이트만 요청하며 헤더를 해석합니다. 해석할 수 없으면 None을 반환합니다.
+
+    JPEG는 SOF 마커가 나올 때까지 세그먼트 본문(EXIF, ICC 등)을 읽지 않고 건너뜁니다.
+    """
+    head = yield ("read", 12)
+    if len(head) < 12:
+        return None
+
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        rest = yield ("read", 12)
+        if len(rest) < 12 or rest[:4] != b"IHDR":
+            return None
+        width, height = struct.unpack(">II", rest[4:12])
+        return ImageMetadata("image/png", width, height)
+
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        width, height = struct.unpack("<HH", head[6:10])
+        return ImageMetadata("image/gif", width, height)
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        chunk = yield ("read", 18)
+        if len(chunk) < 18:
+            return None
+        fourcc, data = chunk[:4], chunk[8:]
+        if fourcc == b"VP8 " and data[3:6] == b"\x9d\x01\x2a":
+            width, height = struct.unpack("<HH", data[6:10])
+            return ImageMetadata("image/webp", width & 0x3FFF, height & 0x3FFF)
+        if fourcc == b"VP8L" and data[0] == 0x2F:
+            bits = int.from_bytes(data[1:5], "little")
+            return ImageMetadata("image/webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        if fourcc == b"VP8X":
+            width = int.from_bytes(data[4:7], "little") + 1
+            height = int.from_bytes(data[7:10], "little") + 1
+            return ImageMetadata("image/webp", width, height)
+        return None
+
+    if head.startswith(b"\xff\xd8"):
+        buffer = head[2:]
+        while True:
+            while len(buffer) < 2:
+                more = yield ("read", 2 - len(buffer))
+                if not more:
+                    return None
+                buffer += more
+            if buffer[0] != 0xFF:
+                return None
+            marker = buffer[1]
+            if marker == 0xFF:
+                # 마커 앞의 채움 바이트
+                buffer = buffer[1:]
+                continue
+            if marker in JPEG_STANDALONE_MARKERS:
+                buffer = buffer[2:]
+                continue
+            if marker in (JPEG_SOS, JPEG_EOI):
+                return None
+            needed = 9 if marker in JPEG_SOF_MARKERS else 4
+            if len(buffer) < needed:
+                more = yield ("read", needed - len(buffer))
+                if len(more) < needed - len(buffer):
+                    return None
+                buffer += more
+            if marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", buffer[5:9])
+                return ImageMetadata("image/jpeg", width, height)
+            # 세그먼트 길이에는 길이 필드 2바이트가 포함됩니다
+            remaining = 2 + struct.unpack(">H", buffer[2:4])[0] - len(buffer)
+            if remaining < 0:
+                buffer = buffer[len(buffer) + remaining:]
+            else:
+                buffer = b""
+                if remaining:
+                    yield ("skip", remaining)
+    return None
+
+
+class ImageHeaderProbe:
+    """업로드 스트림에 조각 단위로 넣으면 헤더를 해석하는 대로 결과를 채웁니다.
+
+    건너뛰는 세그먼트는 보관하지 않으므로 파일 크기와 관계없이 수십 바이트만 버퍼링합니다.
+    """
+
+    def __init__(self):
+        self.metadata: Optional[ImageMetadata] = None
+        self.done = False
+        self._parser = _parse_header()
+        self._request = next(self._parser)
+        self._buffer = bytearray()
+
+    def feed(self, data: Union[bytes, memoryview]) -> None:
+        view = memoryview(data)
+        while not self.done and view:
+            kind, size = self._request
+            if kind == "skip":
+                skipped = min(size, len(view))
+                view = view[skipped:]
+                if skipped < size:
+                    self._request = (kind, size - skipped)
+                else:
+                    self._advance(None)
+            else:
+                taken = min(size - len(self._buffer), len(view))
+                self._buffer += view[:taken]
+                view = view[taken:]
+                if len(self._buffer) == size:
+                    chunk = bytes(self._buffer)
+                    self._buffer.clear()
+                    self._advance(chunk)
+
+    def finish(self) -> Optional[ImageMetadata]:
+        """스트림이 끝났을 때 호출합니다. 헤더를 끝까지 읽지 못했으면 None을 반환합니다."""
+        if not self.done and self._request[0] == "read":
+            self._advance(bytes(self._buffer))
+        self.done = True
+        return self.metadata
+
+    def _advance(self, value: Optional[bytes]) -> None:
+        try:
+            self._request = self._parser.send(value)
+        except StopIteration as stop:
+            self.metadata = stop.value
+            self.done = True
+
+
+def probe_image_file(path: str) -> Optional[ImageMetadata]:
+    """파일을 메모리 매핑해 헤더가 있는 페이지만 읽고 이미지 형식과 크기를 반환합니다."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            parser = _parse_header()
+            position = 0
+            try:
+                kind, length = next(parser)
+                while True:
+                    if kind == "skip":
+                        position += length
+                        kind, length = parser.send(None)
+                    else:
+                        chunk = mapped[position:position + length]
+                        position += len(chunk)
+                        kind, length = parser.send(chunk)
+            except StopIteration as stop:
+                return stop.value
@@ -1,24 +1,52 @@
 # Image API router
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import FileResponse
+from typing import List, Optional
+from core.config import settings
 from core.logger import logger
 from core.exceptions import CustomException
-from .schemas import ImageCreate, ImageResponse, ImageUpdate
+from core.http_cache import etag_matches, immutable_file_response, not_modified_response
+from core.pagination import set_next_cursor_header
+from .derivatives import get_image_derivative_pipeline
+from .gc import ImageGarbageCollector, get_image_garbage_collector
+from .schemas import (
+    ImageCreate,
+    ImageDimensionBackfillResponse,
+    ImageGarbageCollectionResponse,
+    ImageResponse,
+    ImageUpdate,
+    SimilarImage,
+)
 from .service import ImageService, get_image_service
 
 router = APIRouter(prefix="/api/images", tags=["images"])
 
 
-@router.post("/", response_model=ImageResponse)
-def upload_image(
-    file: UploadFile = File(...),
+# 본문을 직접 스트리밍으로 파싱하므로 문서용 요청 스키마를 따로 명시합니다
+UPLOAD_IMAGE_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+                "required": ["file"],
+            }
+        }
+    },
+}
+
+
+@router.post("/", response_model=ImageResponse, openapi_extra={"requestBody": UPLOAD_IMAGE_REQUEST_BODY})
+async def upload_image(
+    request: Request,
     service: ImageService = Depends(get_image_service)
 ) -> ImageResponse:
     """이미지를 업로드합니다."""
     try:
-        logger.info(f"Uploading image: {file.filename}")
-        image = service.upload_image(file)
+        logger.info(f"Uploading image: content_length={request.headers.get('content-length')}")
+        image = await service.upload_image(request)
         return image
     except CustomException as e:
         logger.error(f"Error uploading image: {e}")
@@ -42,23 +70,68 @@ def create_image(
 
 @router.get("/", response_model=List[ImageResponse])
 def get_images(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: ImageService = Depends(get_image_service)
 ) -> List[ImageResponse]:
     """이미지 목록을 조회합니다."""
     try:
-        logger.info(f"Fetching images: skip={skip}, limit={limit}")
-        images = service.get_images(skip=skip, limit=limit)
+        logger.info(f"Fetching images: skip={skip}, limit={limit}, cursor={cursor}")
+        images = service.get_images(skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor_header(response, images, limit)
         return images
     except CustomException as e:
         logger.error(f"Error fetching images: {e}")
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/hash/{content_hash}", response_model=ImageResponse)
+def get_image_by_hash(
+    content_hash: str = Path(..., pattern="^[0-9a-fA-F]{64}$"),
+    service: ImageService = Depends(get_image_service)
+) -> ImageResponse:
+    """내용 해시(SHA-256)로 이미 저장된 이미지를 조회합니다."""
+    try:
+        image = service.get_image_by_hash(content_hash)
+        if not image:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return image
+    except CustomException as e:
+        logger.error(f"Error fetching image by hash: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/gc", response_model=ImageGarbageCollectionResponse)
+def collect_orphaned_images(
+    collector: ImageGarbageCollector = Depends(get_image_garbage_collector)
+) -> ImageGarbageCollectionResponse:
+    """글 연결이 모두 끊긴 이미지를 바로 정리합니다."""
+    try:
+        return ImageGarbageCollectionResponse(collected=collector.collect())
+    except CustomException as e:
+        logger.error(f"Error collecting orphaned images: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/dimensions/backfill", response_model=ImageDimensionBackfillResponse)
+def backfill_image_dimensions(
+    batch_size: int = Query(settings.IMAGE_METADATA_BACKFILL_BATCH_SIZE, ge=1, le=5000),
+    workers: int = Query(settings.IMAGE_METADATA_BACKFILL_WORKERS, ge=1, le=64),
+    service: ImageService = Depends(get_image_service)
+) -> ImageDimensionBackfillResponse:
+    """너비/높이가 비어 있는 기존 업로드 이미지의 크기를 파일 헤더에서 읽어 채웁니다."""
+    try:
+        return service.backfill_dimensions(batch_size=batch_size, workers=workers)
+    except CustomException as e:
+        logger.error(f"Error backfilling image dimensions: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.get("/{image_id}", response_model=ImageResponse)
 def get_image(
-    image_id: int,
+    image_id: str,
     service: ImageService = Depends(get_image_service)
 ) -> ImageResponse:
     """특정 이미지를 조회합니다."""
@@ -73,9 +146,73 @@ def get_image(
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/{image_id}/similar", response_model=List[SimilarImage])
+async def find_similar_images(
+    image_id: str,
+    max_distance: int = Query(settings.IMAGE_SIMILAR_DEFAULT_DISTANCE, ge=0, le=settings.IMAGE_SIMILAR_MAX_DISTANCE),
+    limit: int = Query(20, ge=1, le=100),
+    service: ImageService = Depends(get_image_service)
+) -> List[SimilarImage]:
+    """다시 인코딩하거나 크기만 바꾼 것처럼 보기에 같은 이미지를 가까운 순으로 조회합니다."""
+    try:
+        similar = await service.find_similar_images(image_id, max_distance, limit)
+        if similar is None:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return similar
+    except CustomException as e:
+        logger.error(f"Error finding similar images: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+async def _send_image_file(
+    request: Request,
+    service: ImageService,
+    image_id: str,
+    derivative: Optional[str] = None
+) -> Response:
+    max_age = settings.IMAGE_CACHE_MAX_AGE_SECONDS
+    try:
+        image_file = await service.get_image_file(image_id, derivative)
+        if not image_file:
+            raise HTTPException(status_code=404, detail="Image file not found")
+        # 다시 불러오는 요청은 파일을 열거나 파생 이미지를 만들지 않고 304로 끝냅니다
+        if etag_matches(request.headers.get("if-none-match"), image_file.etag):
+            return not_modified_response(image_file.etag, max_age)
+        path = await service.resolve_image_file_path(image_file)
+        if not path:
+            raise HTTPException(status_code=404, detail="Image file not found")
+        return immutable_file_response(path, image_file.media_type, image_file.etag, max_age)
+    except CustomException as e:
+        logger.error(f"Error serving image file: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/{image_id}/file", response_class=FileResponse)
+async def get_image_file(
+    image_id: str,
+    request: Request,
+    service: ImageService = Depends(get_image_service)
+) -> Response:
+    """업로드한 원본 이미지 파일을 반환합니다. ETag(If-None-Match)와 Range 요청을 지원합니다."""
+    return await _send_image_file(request, service, image_id)
+
+
+@router.get("/{image_id}/derivatives/{name}", response_class=FileResponse)
+async def get_image_derivative(
+    image_id: str,
+    request: Request,
+    name: str = Path(..., description="파생 이미지 종류 (thumbnail | naver)"),
+    service: ImageService = Depends(get_image_service)
+) -> Response:
+    """파생 이미지 파일을 반환합니다. 아직 만들어지지 않았으면 생성한 뒤 반환합니다."""
+    if name not in get_image_derivative_pipeline().specs:
+        raise HTTPException(status_code=404, detail="Unknown image derivative")
+    return await _send_image_file(request, service, image_id, name)
+
+
 @router.put("/{image_id}", response_model=ImageResponse)
 def update_image(
-    image_id: int,
+    image_id: str,
     image_data: ImageUpdate,
     service: ImageService = Depends(get_image_service)
 ) -> ImageResponse:
@@ -93,7 +230,7 @@ def update_image(
 
 @router.delete("/{image_id}")
 def delete_image(
-    image_id: int,
+    image_id: str,
     service: ImageService = Depends(get_image_service)
 ) -> dict[str, str]:
     """이미지를 삭제합니다."""
@@ -24,9 +24,26 @@ class ImageUpdate(BaseModel):
 
 
 class ImageResponse(ImageBase):
-    id: int
+    id: str
+    filename: Optional[str] = None
+    file_size: Optional[int] = None
+    mime_type: Optional[str] = None
+    content_hash: Optional[str] = Field(None, description="업로드한 파일 내용의 SHA-256")
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class ImageGarbageCollectionResponse(BaseModel):
+    collected: int = Field(..., description="삭제한 이미지 수")
+
+
+class ImageDimensionBackfillResponse(BaseModel):
+    scanned: int = Field(..., description="확인한 이미지 수")
+    updated: int = Field(..., description="너비/높이를 채운 이미지 수")
+
+
+class SimilarImage(ImageResponse):
+    distance: int = Field(..., description="dHash 해밍 거리 (0이면 사실상 같은 이미지)")
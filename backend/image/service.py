@@ -1,11 +1,70 @@
 # Image business logic service
 
-from typing import List, Optional
-from fastapi import UploadFile
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import Request
+from core.cache import LRUCache
+from core.config import settings
 from core.logger import logger
-from core.exceptions import CustomException
+from core.exceptions import CustomException, ValidationException
 from core.database import get_db
-from .schemas import ImageCreate, ImageUpdate, ImageResponse
+from core.pagination import paginate_query
+from core.upload_stream import StreamedFile, receive_multipart_file
+from utils.file_utils import MIME_SNIFF_BYTES, sniff_image_mime_type
+from utils.hash_utils import is_sha256_hex
+from .derivatives import get_image_derivative_pipeline, remove_derivatives
+from .metadata import ImageHeaderProbe, ImageMetadata, probe_image_file
+from .schemas import ImageCreate, ImageDimensionBackfillResponse, ImageUpdate, ImageResponse, SimilarImage
+from .similarity import (
+    decode_perceptual_hash,
+    encode_perceptual_hash,
+    image_similarity_index,
+    try_compute_perceptual_hash,
+)
+from .storage import (
+    image_file_name,
+    image_incoming_dir,
+    image_public_url,
+    image_storage_path,
+    detach_image_file,
+    restore_image_file,
+    store_image_file,
+)
+
+IMAGE_COLUMNS = "id,url,filename,file_size,mime_type,content_hash,width,height,created_at,updated_at"
+CONTENT_HASH_HEADER = "X-Content-SHA256"
+
+# 이미지 ID -> (내용 해시, MIME 타입). 업로드한 이미지의 내용은 바뀌지 않으므로 삭제될 때만 비웁니다
+image_location_cache = LRUCache(settings.IMAGE_LOCATION_CACHE_SIZE)
+
+# 이미지 ID -> 진행 중인 dHash 계산. 업로드 후 백그라운드 계산과 유사 이미지 요청이 같은 작업을 공유합니다
+_perceptual_hash_tasks: Dict[str, "asyncio.Task[Optional[int]]"] = {}
+
+
+class ImageFile:
+    """응답으로 보낼 원본 또는 파생 이미지 파일입니다.
+    
+    ETag는 내용 해시(파생 이미지는 크기/형식 포함)로 정해지므로 파일을 열지 않고 조건부 요청을 판단할 수 있습니다.
+    """
+    
+    def __init__(
+        self,
+        content_hash: str,
+        mime_type: str,
+        media_type: str,
+        etag: str,
+        derivative: Optional[str] = None
+    ):
+        self.content_hash = content_hash
+        self.mime_type = mime_type
+        self.media_type = media_type
+        self.etag = etag
+        self.derivative = derivative
 
 
 def get_image_service():
@@ -20,18 +79,91 @@ class ImageService:
     def __init__(self, db=None):
         self.db = db
     
-    def upload_image(self, file: UploadFile) -> ImageResponse:
-        """이미지 파일을 업로드합니다."""
+    async def upload_image(self, request: Request) -> ImageResponse:
+        """multipart 본문의 이미지 파일을 내용 해시 기준으로 저장합니다.
+        
+        본문을 청크 단위로 디스크에 기록하면서 SHA-256과 크기를 계산하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+        크기가 IMAGE_UPLOAD_MAX_BYTES를 넘으면 PayloadTooLargeException, 이미지가 아니면 UnsupportedMediaTypeException을 발생시킵니다.
+        
+        같은 내용의 이미지가 이미 있으면 새로 저장하지 않고 기존 이미지를 반환합니다.
+        X-Content-SHA256 헤더로 해시를 미리 알려 주면 본문을 받기 전에 확인하므로 전송과 디스크 기록이 모두 생략됩니다.
+        
+        너비/높이는 받는 중에 파일 헤더만 해석해 채우며, 이미지를 디코딩하지 않습니다.
+        유사 이미지 탐지용 dHash는 응답 후 백그라운드에서 계산해 저장하고 색인합니다.
+        """
         try:
-            logger.info(f"Uploading image: {file.filename}, content_type: {file.content_type}")
-            # TODO: 이미지 파일 저장 로직 구현
-            # TODO: 이미지 리사이징 로직 구현 (선택사항)
-            # TODO: 데이터베이스에 이미지 정보 저장 로직 구현
-            raise NotImplementedError("Image upload not implemented")
+            expected_hash = request.headers.get(CONTENT_HASH_HEADER, "").strip().lower() or None
+            if expected_hash is not None:
+                if not is_sha256_hex(expected_hash):
+                    raise ValidationException(f"Invalid {CONTENT_HASH_HEADER} header")
+                existing = await asyncio.to_thread(self._fetch_image_by_hash, expected_hash)
+                if existing:
+                    logger.info(f"Image upload skipped, content already stored: sha256={expected_hash}")
+                    image = ImageResponse.model_validate(existing)
+                    self._schedule_derivatives(image)
+                    self._perceptual_hash_task(image)
+                    return image
+            
+            probe = ImageHeaderProbe()
+            upload = await receive_multipart_file(
+                request,
+                field_name="file",
+                directory=image_incoming_dir(),
+                max_bytes=settings.IMAGE_UPLOAD_MAX_BYTES,
+                chunk_size=settings.IMAGE_UPLOAD_CHUNK_SIZE,
+                sniff=sniff_image_mime_type,
+                sniff_bytes=MIME_SNIFF_BYTES,
+                on_data=probe.feed,
+            )
+            metadata = probe.finish()
+            logger.info(
+                f"Image received: filename={upload.filename}, size={upload.size}, "
+                f"mime_type={upload.mime_type}, sha256={upload.sha256}, "
+                f"dimensions={f'{metadata.width}x{metadata.height}' if metadata else None}"
+            )
+            try:
+                if expected_hash is not None and upload.sha256 != expected_hash:
+                    raise ValidationException("Uploaded content does not match the declared SHA-256")
+                image = await asyncio.to_thread(self._save_image, upload, metadata)
+            finally:
+                upload.discard()
+            # 파생 이미지와 dHash는 프로세스 풀에서 만들고 업로드 응답은 기다리지 않습니다.
+            # 풀에 다른 업로드의 파생 이미지가 밀려 있으면 dHash도 그 뒤에 계산되므로, 그 전에 온 유사 이미지
+            # 요청은 같은 계산을 기다립니다
+            self._schedule_derivatives(image)
+            self._perceptual_hash_task(image)
+            return image
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to upload image: {e}", exc_info=True)
             raise CustomException("Failed to upload image")
     
+    def _save_image(self, upload: StreamedFile, metadata: Optional[ImageMetadata]) -> ImageResponse:
+        dimensions = {"width": metadata.width, "height": metadata.height} if metadata else {}
+        existing = self._fetch_image_by_hash(upload.sha256)
+        if existing:
+            logger.info(f"Image deduplicated: sha256={upload.sha256}, id={existing['id']}")
+            if dimensions and existing.get("width") is None:
+                existing = self.db.table("images").update(dimensions).eq("id", existing["id"]).execute().data[0]
+            return ImageResponse.model_validate(existing)
+        
+        file_name = store_image_file(upload)
+        rows = self.db.table("images").upsert({
+            "url": image_public_url(file_name),
+            "filename": upload.filename,
+            "file_size": upload.size,
+            "mime_type": upload.mime_type,
+            "content_hash": upload.sha256,
+            **dimensions,
+        }, on_conflict="content_hash", ignore_duplicates=True).execute().data
+        if not rows:
+            # 같은 내용을 동시에 올린 다른 요청이 먼저 저장했으면 그 행을 반환합니다
+            return ImageResponse.model_validate(self._fetch_image_by_hash(upload.sha256))
+        # 같은 내용의 행을 삭제한 요청이 파일을 치웠을 수 있으므로 행을 저장한 뒤 파일을 다시 연결합니다
+        store_image_file(upload)
+        return ImageResponse.model_validate(rows[0])
+    
     def create_image(self, image_data: ImageCreate) -> ImageResponse:
         """이미지 정보를 생성합니다."""
         try:
@@ -42,27 +174,211 @@ class ImageService:
             logger.error(f"Failed to create image: {e}", exc_info=True)
             raise CustomException("Failed to create image")
     
-    def get_images(self, skip: int = 0, limit: int = 100) -> List[ImageResponse]:
+    async def get_image_file(self, image_id: str, derivative: Optional[str] = None) -> Optional[ImageFile]:
+        """원본(derivative가 None) 또는 파생 이미지의 응답 정보를 반환합니다. 업로드한 파일이 없으면 None을 반환합니다.
+        
+        이미지 ID별 내용 해시는 메모리 캐시에서 찾으므로 같은 이미지를 다시 요청하면 DB를 조회하지 않습니다.
+        """
+        try:
+            located = image_location_cache.get(image_id)
+            if located is None:
+                row = await asyncio.to_thread(self._fetch_image, image_id)
+                if not row or not row.get("content_hash"):
+                    return None
+                located = (row["content_hash"], row["mime_type"])
+                image_location_cache.set(image_id, located)
+            content_hash, mime_type = located
+            if derivative is None:
+                return ImageFile(content_hash, mime_type, media_type=mime_type, etag=f'"{content_hash}"')
+            spec = get_image_derivative_pipeline().specs[derivative]
+            return ImageFile(
+                content_hash,
+                mime_type,
+                media_type=spec.media_type,
+                etag=f'"{content_hash}-{spec.cache_key}"',
+                derivative=derivative,
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch image file: {e}", exc_info=True)
+            raise CustomException("Failed to fetch image file")
+    
+    async def resolve_image_file_path(self, image_file: ImageFile) -> Optional[str]:
+        """보낼 파일 경로를 반환합니다. 파생 이미지가 아직 없으면 생성하고, 원본 파일이 없으면 None을 반환합니다."""
+        try:
+            source_path = image_storage_path(image_file_name(image_file.content_hash, image_file.mime_type))
+            if not await asyncio.to_thread(os.path.isfile, source_path):
+                return None
+            if image_file.derivative is None:
+                return source_path
+            return await get_image_derivative_pipeline().ensure(
+                image_file.content_hash, image_file.mime_type, image_file.derivative
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate image derivative: {e}", exc_info=True)
+            raise CustomException("Failed to generate image derivative")
+    
+    async def find_similar_images(
+        self,
+        image_id: str,
+        max_distance: int,
+        limit: int
+    ) -> Optional[List[SimilarImage]]:
+        """dHash 해밍 거리가 max_distance 이하인 이미지를 가까운 순으로 조회합니다. 이미지가 없으면 None을 반환합니다.
+        
+        URL로 등록해 파일이 없는 이미지는 비교할 수 없으므로 빈 목록을 반환합니다.
+        """
+        try:
+            value = image_similarity_index.get(image_id)
+            if value is None:
+                row = await asyncio.to_thread(self._fetch_image, image_id)
+                if not row:
+                    return None
+                value = await self._index_perceptual_hash(ImageResponse.model_validate(row))
+                if value is None:
+                    return []
+            matches = image_similarity_index.query(value, max_distance, limit, exclude_id=image_id)
+            if not matches:
+                return []
+            rows = await asyncio.to_thread(self._fetch_images, [match_id for match_id, _ in matches])
+            rows_by_id = {row["id"]: row for row in rows}
+            return [
+                SimilarImage(**rows_by_id[match_id], distance=distance)
+                for match_id, distance in matches
+                if match_id in rows_by_id
+            ]
+        except Exception as e:
+            logger.error(f"Failed to find similar images: {e}", exc_info=True)
+            raise CustomException("Failed to find similar images")
+    
+    def rebuild_similarity_index(self, workers: int) -> int:
+        """저장된 dHash로 유사 이미지 인덱스를 다시 구축하고 색인된 이미지 수를 반환합니다.
+        
+        dHash가 없는 업로드 이미지는 workers개 작업자 프로세스에서 계산해 저장합니다.
+        """
+        try:
+            logger.info("Building image similarity index")
+            started_at = time.perf_counter()
+            rows = self._fetch_all_rows(
+                lambda: self.db.table("images")
+                .select("id,content_hash,mime_type,perceptual_hash")
+                .not_.is_("content_hash", "null")
+                .order("id")
+            )
+            hashes = []
+            missing = []
+            for row in rows:
+                value = decode_perceptual_hash(row["perceptual_hash"])
+                if value is None:
+                    missing.append(row)
+                else:
+                    hashes.append((row["id"], value))
+            hashes.extend(self._backfill_perceptual_hashes(missing, workers))
+            image_similarity_index.rebuild(hashes)
+            logger.info(
+                f"Image similarity index built: images={len(image_similarity_index)}, backfilled={len(missing)}, "
+                f"elapsed_ms={(time.perf_counter() - started_at) * 1000:.1f}"
+            )
+            return len(image_similarity_index)
+        except Exception as e:
+            logger.error(f"Failed to build image similarity index: {e}", exc_info=True)
+            raise CustomException("Failed to build image similarity index")
+    
+    def get_image_by_hash(self, content_hash: str) -> Optional[ImageResponse]:
+        """내용 해시(SHA-256)로 이미지를 조회합니다. 업로드 전에 이미 저장된 내용인지 확인할 때 사용합니다."""
+        try:
+            row = self._fetch_image_by_hash(content_hash.lower())
+            return ImageResponse.model_validate(row) if row else None
+        except Exception as e:
+            logger.error(f"Failed to fetch image by hash: {e}", exc_info=True)
+            raise CustomException("Failed to fetch image")
+    
+    def collect_orphaned_images(self, batch_size: int) -> int:
+        """마지막 글 연결이 끊긴 이미지의 행과 파일을 삭제하고 삭제한 수를 반환합니다.
+        
+        대상은 post_images 삭제 트리거가 image_gc_queue에 넣어 둔 이미지이며, 그 사이 다시 연결된 이미지는 남깁니다.
+        """
+        try:
+            collected = 0
+            while True:
+                rows = self.db.rpc("collect_orphaned_images", {"p_limit": batch_size}).execute().data
+                for row in rows:
+                    image_similarity_index.remove(row["id"])
+                    image_location_cache.pop(row["id"])
+                    self._remove_file_if_unused(row["content_hash"], row["mime_type"])
+                collected += len(rows)
+                if len(rows) < batch_size:
+                    break
+            if collected:
+                logger.info(f"Orphaned images collected: count={collected}")
+            return collected
+        except Exception as e:
+            logger.error(f"Failed to collect orphaned images: {e}", exc_info=True)
+            raise CustomException("Failed to collect orphaned images")
+    
+    def backfill_dimensions(self, batch_size: int, workers: int) -> ImageDimensionBackfillResponse:
+        """너비/높이가 비어 있는 업로드 이미지의 파일 헤더를 읽어 채웁니다.
+        
+        id 순으로 batch_size개씩 조회하고, 파일은 workers개 스레드에서 메모리 매핑으로 헤더 페이지만 읽습니다.
+        결과는 배치마다 한 번의 RPC로 기록합니다. 헤더를 해석할 수 없거나 파일이 없는 이미지는 건너뜁니다.
+        """
+        try:
+            logger.info(f"Backfilling image dimensions: batch_size={batch_size}, workers={workers}")
+            scanned = 0
+            updated = 0
+            last_id: Optional[str] = None
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-metadata") as executor:
+                while True:
+                    query = (
+                        self.db.table("images")
+                        .select("id,content_hash,mime_type")
+                        .not_.is_("content_hash", "null")
+                        .is_("width", "null")
+                    )
+                    if last_id is not None:
+                        query = query.gt("id", last_id)
+                    rows = query.order("id").limit(batch_size).execute().data
+                    if not rows:
+                        break
+                    dimensions = [
+                        {"id": row["id"], "width": metadata.width, "height": metadata.height}
+                        for row, metadata in zip(rows, executor.map(_probe_stored_image, rows))
+                        if metadata is not None
+                    ]
+                    if dimensions:
+                        updated += self.db.rpc("set_image_dimensions", {"p_dimensions": dimensions}).execute().data
+                    scanned += len(rows)
+                    last_id = rows[-1]["id"]
+                    if len(rows) < batch_size:
+                        break
+            logger.info(f"Image dimensions backfilled: scanned={scanned}, updated={updated}")
+            return ImageDimensionBackfillResponse(scanned=scanned, updated=updated)
+        except Exception as e:
+            logger.error(f"Failed to backfill image dimensions: {e}", exc_info=True)
+            raise CustomException("Failed to backfill image dimensions")
+    
+    def get_images(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ImageResponse]:
         """이미지 목록을 조회합니다."""
         try:
-            logger.info(f"Fetching images from database: skip={skip}, limit={limit}")
-            # TODO: 데이터베이스에서 이미지 목록 조회 로직 구현
-            return []
+            logger.info(f"Fetching images from database: skip={skip}, limit={limit}, cursor={cursor}")
+            query = paginate_query(self.db.table("images").select(IMAGE_COLUMNS), skip=skip, limit=limit, cursor=cursor)
+            return [ImageResponse.model_validate(row) for row in query.execute().data]
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch images: {e}", exc_info=True)
             raise CustomException("Failed to fetch images")
     
-    def get_image_by_id(self, image_id: int) -> Optional[ImageResponse]:
+    def get_image_by_id(self, image_id: str) -> Optional[ImageResponse]:
         """ID로 이미지를 조회합니다."""
         try:
             logger.info(f"Fetching image by id: {image_id}")
-            # TODO: 데이터베이스에서 이미지 조회 로직 구현
-            return None
+            row = self._fetch_image(image_id)
+            return ImageResponse.model_validate(row) if row else None
         except Exception as e:
             logger.error(f"Failed to fetch image: {e}", exc_info=True)
             raise CustomException("Failed to fetch image")
     
-    def update_image(self, image_id: int, image_data: ImageUpdate) -> Optional[ImageResponse]:
+    def update_image(self, image_id: str, image_data: ImageUpdate) -> Optional[ImageResponse]:
         """이미지를 업데이트합니다."""
         try:
             logger.info(f"Updating image: id={image_id}")
@@ -72,13 +388,130 @@ class ImageService:
             logger.error(f"Failed to update image: {e}", exc_info=True)
             raise CustomException("Failed to update image")
     
-    def delete_image(self, image_id: int) -> bool:
-        """이미지를 삭제합니다."""
+    def delete_image(self, image_id: str) -> bool:
+        """이미지를 삭제합니다. 업로드한 파일이면 저장된 파일도 함께 삭제합니다."""
         try:
             logger.info(f"Deleting image: id={image_id}")
-            # TODO: 이미지 파일 삭제 로직 구현
-            # TODO: 데이터베이스에서 이미지 정보 삭제 로직 구현
-            return False
+            rows = self.db.table("images").delete().eq("id", image_id).execute().data
+            if not rows:
+                return False
+            image_similarity_index.remove(image_id)
+            image_location_cache.pop(image_id)
+            if rows[0].get("content_hash"):
+                self._remove_file_if_unused(rows[0]["content_hash"], rows[0]["mime_type"])
+            return True
         except Exception as e:
             logger.error(f"Failed to delete image: {e}", exc_info=True)
             raise CustomException("Failed to delete image")
+    
+    def _fetch_image(self, image_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.table("images").select(IMAGE_COLUMNS).eq("id", image_id).limit(1).execute().data
+        return rows[0] if rows else None
+    
+    def _fetch_images(self, image_ids: List[str]) -> List[Dict[str, Any]]:
+        return self.db.table("images").select(IMAGE_COLUMNS).in_("id", image_ids).execute().data
+    
+    def _fetch_all_rows(self, build_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+        """range 페이지 단위로 나누어 쿼리 결과 전체를 조회합니다."""
+        rows: List[Dict[str, Any]] = []
+        page_size = settings.DB_FETCH_PAGE_SIZE
+        start = 0
+        while True:
+            page = build_query().range(start, start + page_size - 1).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            start += page_size
+    
+    async def _index_perceptual_hash(self, image: ImageResponse) -> Optional[int]:
+        """이미지의 dHash를 반환합니다. 아직 색인되지 않았으면 계산이 끝날 때까지 기다립니다."""
+        value = image_similarity_index.get(image.id)
+        if value is not None or not image.content_hash or not image.mime_type:
+            return value
+        # 요청이 취소되어도 같은 계산을 기다리는 다른 요청과 색인은 계속되어야 합니다
+        return await asyncio.shield(self._perceptual_hash_task(image))
+    
+    def _perceptual_hash_task(self, image: ImageResponse) -> "Optional[asyncio.Task[Optional[int]]]":
+        """색인되지 않은 업로드 이미지의 dHash 계산 작업을 시작하거나 진행 중인 작업을 반환합니다."""
+        if image_similarity_index.get(image.id) is not None or not image.content_hash or not image.mime_type:
+            return None
+        task = _perceptual_hash_tasks.get(image.id)
+        if task is None:
+            task = asyncio.create_task(self._compute_perceptual_hash(image))
+            _perceptual_hash_tasks[image.id] = task
+            task.add_done_callback(lambda _: _perceptual_hash_tasks.pop(image.id, None))
+        return task
+    
+    async def _compute_perceptual_hash(self, image: ImageResponse) -> Optional[int]:
+        """dHash를 계산해 저장하고 색인합니다. 실패하면 경고만 남기고 None을 반환합니다."""
+        try:
+            value = await get_image_derivative_pipeline().perceptual_hash(image.content_hash, image.mime_type)
+            await asyncio.to_thread(
+                lambda: self.db.table("images").update(
+                    {"perceptual_hash": encode_perceptual_hash(value)}
+                ).eq("id", image.id).execute()
+            )
+        except Exception as e:
+            logger.warning(f"Image perceptual hash was not computed: id={image.id}, error={e}")
+            return None
+        image_similarity_index.add(image.id, value)
+        return value
+    
+    def _backfill_perceptual_hashes(self, rows: List[Dict[str, Any]], workers: int) -> List[Tuple[str, int]]:
+        if not rows:
+            return []
+        paths = [image_storage_path(image_file_name(row["content_hash"], row["mime_type"])) for row in rows]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            values = list(executor.map(try_compute_perceptual_hash, paths, chunksize=32))
+        hashes = [(row["id"], value) for row, value in zip(rows, values) if value is not None]
+        batch_size = settings.DB_FETCH_PAGE_SIZE
+        for start in range(0, len(hashes), batch_size):
+            self.db.rpc("set_image_perceptual_hashes", {"p_hashes": [
+                {"id": image_id, "perceptual_hash": encode_perceptual_hash(value)}
+                for image_id, value in hashes[start:start + batch_size]
+            ]}).execute()
+        return hashes
+    
+    def _fetch_image_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.table("images").select(IMAGE_COLUMNS).eq("content_hash", content_hash).limit(1).execute().data
+        return rows[0] if rows else None
+    
+    def _remove_file_if_unused(self, content_hash: str, mime_type: str) -> None:
+        # 행 삭제 직후 같은 내용이 다시 업로드되었으면 새 행이 파일을 쓰고 있으므로 남깁니다.
+        # 확인한 뒤 새 행이 저장될 수도 있으므로 파일을 먼저 옮겨 두고 다시 확인해, 행이 생겼으면 되돌립니다.
+        # 다시 확인한 뒤에 저장된 행은 _save_image가 자기 임시 파일로 파일을 다시 연결합니다.
+        if self._fetch_image_by_hash(content_hash):
+            return
+        detached_path = detach_image_file(content_hash, mime_type)
+        if detached_path is not None:
+            if self._fetch_image_by_hash(content_hash):
+                restore_image_file(detached_path, content_hash, mime_type)
+                return
+            os.unlink(detached_path)
+        remove_derivatives(content_hash)
+    
+    @staticmethod
+    def _schedule_derivatives(image: ImageResponse) -> None:
+        if image.content_hash and image.mime_type:
+            get_image_derivative_pipeline().schedule(image.content_hash, image.mime_type)
+
+
+def load_image_similarity_index() -> None:
+    """서버 기동을 막지 않도록 유사 이미지 인덱스를 백그라운드 스레드에서 구축합니다."""
+    threading.Thread(target=_rebuild_image_similarity_index, name="image-similarity-index", daemon=True).start()
+
+
+def _rebuild_image_similarity_index() -> None:
+    try:
+        get_image_service().rebuild_similarity_index(workers=settings.IMAGE_DERIVATIVE_WORKERS)
+    except Exception as e:
+        logger.error(f"Image similarity index was not loaded: {e}")
+
+
+def _probe_stored_image(row: Dict[str, Any]) -> Optional[ImageMetadata]:
+    try:
+        return probe_image_file(image_storage_path(image_file_name(row["content_hash"], row["mime_type"])))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Image header was not read: id={row['id']}, error={e}")
+        return None
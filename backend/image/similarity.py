@@ -0,0 +1,155 @@
+# Near-duplicate image detection with difference hashes and a multi-index hash table
+
+import itertools
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from PIL import Image, ImageOps
+
+# 9x8 회색조로 줄여 가로로 이웃한 픽셀의 밝기 차이를 64비트로 만듭니다
+DHASH_WIDTH = 9
+DHASH_HEIGHT = 8
+PERCEPTUAL_HASH_BITS = (DHASH_WIDTH - 1) * DHASH_HEIGHT
+# 해시를 16비트씩 4조각으로 나눠 조각별 해시 테이블에 넣습니다
+HASH_CHUNKS = 4
+CHUNK_BITS = PERCEPTUAL_HASH_BITS // HASH_CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def compute_perceptual_hash(path: str) -> int:
+    """이미지의 dHash(64비트 부호 없는 정수)를 반환합니다. 프로세스 풀 작업자에서 실행됩니다.
+
+    다시 인코딩하거나 크기를 바꾼 이미지는 해밍 거리가 작게 나옵니다.
+    JPEG는 draft로 축소 디코딩하므로 원본 해상도로 풀지 않습니다.
+    """
+    with Image.open(path) as source:
+        source.seek(0)
+        source.draft("L", (DHASH_WIDTH * 8, DHASH_HEIGHT * 8))
+        image = ImageOps.exif_transpose(source).convert("L")
+        small = image.resize((DHASH_WIDTH, DHASH_HEIGHT), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def try_compute_perceptual_hash(path: str) -> Optional[int]:
+    """일괄 계산용입니다. 파일이 없거나 디코딩할 수 없으면 None을 반환합니다."""
+    try:
+        return compute_perceptual_hash(path)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def encode_perceptual_hash(value: int) -> int:
+    """부호 없는 64비트 해시를 BIGINT 열에 저장할 부호 있는 값으로 변환합니다."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def decode_perceptual_hash(value: Optional[int]) -> Optional[int]:
+    """BIGINT 열 값을 부호 없는 64비트 해시로 변환합니다."""
+    if value is None:
+        return None
+    return value + (1 << 64) if value < 0 else value
+
+
+class ImageSimilarityIndex:
+    """dHash를 조각으로 나눠 조각별로 색인하는 multi-index hash table입니다.
+
+    해밍 거리가 d 이하인 두 해시는 비둘기집 원리에 따라 적어도 한 조각의 거리가 d // HASH_CHUNKS 이하이므로,
+    각 조각에서 그 거리 안의 키만 조회해 모은 후보만 실제 거리로 비교합니다. 전체 이미지와 비교하지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._hashes: Dict[str, int] = {}
+        self._tables: List[Dict[int, Set[str]]] = [defaultdict(set) for _ in range(HASH_CHUNKS)]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def rebuild(self, hashes: List[Tuple[str, int]]) -> None:
+        """(이미지 ID, 해시) 목록으로 인덱스를 새로 구축합니다."""
+        with self._lock:
+            self._reset()
+            for image_id, value in hashes:
+                self._insert(str(image_id), value)
+
+    def add(self, image_id: str, value: int) -> None:
+        """이미지의 해시를 추가하거나 교체합니다."""
+        with self._lock:
+            image_id = str(image_id)
+            self._delete(image_id)
+            self._insert(image_id, value)
+
+    def remove(self, image_id: str) -> None:
+        """이미지를 인덱스에서 제거합니다."""
+        with self._lock:
+            self._delete(str(image_id))
+
+    def get(self, image_id: str) -> Optional[int]:
+        return self._hashes.get(str(image_id))
+
+    def query(
+        self,
+        value: int,
+        max_distance: int,
+        limit: int,
+        exclude_id: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """해밍 거리가 max_distance 이하인 이미지를 가까운 순으로 (이미지 ID, 거리) 목록으로 반환합니다."""
+        chunk_distance = max_distance // HASH_CHUNKS
+        with self._lock:
+            candidates: Set[str] = set()
+            for chunk, key in enumerate(_chunk_keys(value)):
+                table = self._tables[chunk]
+                for mask in _flip_masks(chunk_distance):
+                    bucket = table.get(key ^ mask)
+                    if bucket:
+                        candidates.update(bucket)
+            candidates.discard(exclude_id)
+            matches = []
+            for image_id in candidates:
+                distance = (self._hashes[image_id] ^ value).bit_count()
+                if distance <= max_distance:
+                    matches.append((image_id, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches[:limit]
+
+    def _insert(self, image_id: str, value: int) -> None:
+        self._hashes[image_id] = value
+        for chunk, key in enumerate(_chunk_keys(value)):
+            self._tables[chunk][key].add(image_id)
+
+    def _delete(self, image_id: str) -> None:
+        value = self._hashes.pop(image_id, None)
+        if value is None:
+            return
+        for chunk, key in enumerate(_chunk_keys(value)):
+            bucket = self._tables[chunk].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(image_id)
+            if not bucket:
+                del self._tables[chunk][key]
+
+
+def _chunk_keys(value: int) -> List[int]:
+    return [(value >> (chunk * CHUNK_BITS)) & CHUNK_MASK for chunk in range(HASH_CHUNKS)]
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(distance: int) -> Tuple[int, ...]:
+    """조각 안에서 distance개 이하의 비트를 뒤집는 모든 마스크를 반환합니다."""
+    return tuple(
+        sum(1 << position for position in positions)
+        for flips in range(distance + 1)
+        for positions in itertools.combinations(range(CHUNK_BITS), flips)
+    )
+
+
+image_similarity_index = ImageSimilarityIndex()
@@ -0,0 +1,63 @@
+# Image file storage layout
+
+import os
+import uuid
+from typing import Optional
+from core.config import settings
+from core.upload_stream import StreamedFile
+from utils.file_utils import IMAGE_EXTENSIONS
+
+
+def image_incoming_dir() -> str:
+    """업로드 중인 임시 파일 디렉터리. 최종 위치로 rename할 수 있도록 같은 파일시스템에 둡니다."""
+    return os.path.join(settings.IMAGE_STORAGE_DIR, ".incoming")
+
+
+def image_file_name(sha256: str, mime_type: str) -> str:
+    return f"{sha256}.{IMAGE_EXTENSIONS[mime_type]}"
+
+
+def image_storage_path(file_name: str) -> str:
+    """파일 이름 앞 두 글자로 하위 디렉터리를 나눈 저장 경로를 반환합니다."""
+    return os.path.join(settings.IMAGE_STORAGE_DIR, file_name[:2], file_name)
+
+
+def image_public_url(file_name: str) -> str:
+    return f"{settings.IMAGE_PUBLIC_URL_PREFIX}/{file_name}"
+
+
+def store_image_file(upload: StreamedFile) -> str:
+    """임시 파일을 내용 해시 이름으로 연결하고 파일 이름을 반환합니다. 같은 내용이 이미 있으면 그대로 둡니다.
+
+    하드 링크로 연결하므로 임시 파일은 남아 있습니다. 행을 저장한 뒤 다시 호출하면 그 사이 정리로 지워진 파일을
+    되살릴 수 있고, 임시 파일은 호출한 쪽이 discard로 지웁니다.
+    """
+    file_name = image_file_name(upload.sha256, upload.mime_type)
+    path = image_storage_path(file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.link(upload.path, path)
+    except FileExistsError:
+        pass
+    return file_name
+
+
+def detach_image_file(sha256: str, mime_type: str) -> Optional[str]:
+    """저장된 파일을 임시 디렉터리로 옮기고 옮긴 경로를 반환합니다. 파일이 없으면 None을 반환합니다.
+
+    삭제를 확정하기 전에 다시 업로드되었는지 확인할 수 있도록 바로 지우지 않습니다.
+    """
+    if mime_type not in IMAGE_EXTENSIONS:
+        return None
+    os.makedirs(image_incoming_dir(), exist_ok=True)
+    detached_path = os.path.join(image_incoming_dir(), f"removing-{uuid.uuid4().hex}")
+    try:
+        os.replace(image_storage_path(image_file_name(sha256, mime_type)), detached_path)
+    except FileNotFoundError:
+        return None
+    return detached_path
+
+
+def restore_image_file(detached_path: str, sha256: str, mime_type: str) -> None:
+    """detach_image_file로 옮긴 파일을 원래 자리로 되돌립니다. 내용이 같으므로 그 사이 생긴 파일은 덮어씁니다."""
+    os.replace(detached_path, image_storage_path(image_file_name(sha256, mime_type)))
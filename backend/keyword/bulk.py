@@ -0,0 +1,213 @@
+# Keyword bulk upsert writer and payload parsing
+
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from fastapi import Request
+from pydantic import ValidationError
+from core.config import settings
+from core.logger import logger
+from core.exceptions import ValidationException
+from .history import HISTORY_METRICS, KeywordMetricsHistoryStore
+from .normalizer import keyword_name_hash
+from .schemas import BulkRowStatus, KeywordBulkItem, KeywordBulkResponse, KeywordBulkRowResult
+from .search_index import keyword_search_index
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+KEYWORD_UPSERT_CONFLICT_COLUMNS = "subject_id,normalized_hash"
+
+DedupKey = Tuple[Optional[str], str]
+
+
+class BulkRowError:
+    """파싱에 실패한 입력 행을 나타냅니다."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class KeywordBulkWriter:
+    """키워드를 청크 단위로 모아 한 번의 왕복으로 업서트합니다.
+
+    이름을 표준형 해시로 바꿔 (subject_id, normalized_hash) 기준으로 배치 전체의 중복을 걸러내므로
+    띄어쓰기/전각/NFD 차이만 있는 변형은 DB에 도달하기 전에 제거됩니다.
+    """
+
+    def __init__(self, db, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.KEYWORD_BULK_CHUNK_SIZE
+        self.results: List[KeywordBulkRowResult] = []
+        self.chunk_count = 0
+        self._pending: List[Tuple[DedupKey, int, KeywordBulkItem]] = []
+        self._duplicates: List[Tuple[DedupKey, int, KeywordBulkItem]] = []
+        self._seen: Set[DedupKey] = set()
+        self._saved_ids: Dict[DedupKey, str] = {}
+        self._failed: Dict[DedupKey, str] = {}
+        self._started_at = time.perf_counter()
+
+    def add(self, index: int, item: KeywordBulkItem) -> None:
+        """업서트할 행을 버퍼에 추가하고 청크가 차면 기록합니다. 이미 받은 키워드는 중복으로 기록합니다."""
+        key = (item.subject_id, keyword_name_hash(item.name))
+        if key in self._seen:
+            self._duplicates.append((key, index, item))
+            return
+        self._seen.add(key)
+        self._pending.append((key, index, item))
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def reject(self, index: int, name: Optional[str], error: str) -> None:
+        """검증에 실패한 행을 결과에 기록합니다."""
+        self.results.append(
+            KeywordBulkRowResult(index=index, name=name, status=BulkRowStatus.INVALID, error=error)
+        )
+
+    def flush(self) -> None:
+        """버퍼에 쌓인 행을 upsert 요청으로 기록합니다.
+
+        입력에 없는 열은 보내지 않아 기존 값을 덮어쓰지 않습니다. 여러 행을 한 요청으로 보내면 일부 행에만 있는
+        열이 나머지 행에서 NULL/기본값으로 채워지므로, 보내는 열 구성이 같은 행끼리 묶어 요청합니다.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        groups: Dict[Tuple[str, ...], List[Tuple[DedupKey, int, KeywordBulkItem, Dict[str, Any]]]] = {}
+        for key, index, item in pending:
+            values = {
+                **item.model_dump(mode="json", exclude_unset=True),
+                "name": item.name,
+                "subject_id": item.subject_id,
+                "normalized_hash": key[1],
+            }
+            groups.setdefault(tuple(sorted(values)), []).append((key, index, item, values))
+        for rows in groups.values():
+            self._upsert(rows)
+
+    def _upsert(self, rows: List[Tuple[DedupKey, int, KeywordBulkItem, Dict[str, Any]]]) -> None:
+        self.chunk_count += 1
+        payload = [values for _, _, _, values in rows]
+        try:
+            response = (
+                self.db.table("keywords")
+                .upsert(payload, on_conflict=KEYWORD_UPSERT_CONFLICT_COLUMNS)
+                .execute()
+            )
+        except Exception as e:
+            logger.error(f"Failed to upsert keyword chunk: size={len(payload)}, error={e}", exc_info=True)
+            for key, index, item, _ in rows:
+                self._failed[key] = str(e)
+                self.results.append(
+                    KeywordBulkRowResult(index=index, name=item.name, status=BulkRowStatus.FAILED, error=str(e))
+                )
+            return
+
+        for row in response.data:
+            self._saved_ids[(row.get("subject_id"), row["normalized_hash"])] = row["id"]
+            keyword_search_index.add(row["id"], row["name"])
+        self._record_history(response.data)
+        for key, index, item, _ in rows:
+            self.results.append(
+                KeywordBulkRowResult(
+                    index=index,
+                    name=item.name,
+                    status=BulkRowStatus.UPSERTED,
+                    id=self._saved_ids.get(key),
+                )
+            )
+
+    def _record_history(self, rows: List[Dict[str, Any]]) -> None:
+        """저장된 지표를 이력에 덧붙입니다. 이력 기록 실패는 업서트 결과에 영향을 주지 않습니다."""
+        snapshots = [
+            {"keyword_id": row["id"], **{metric: row.get(metric) or 0 for metric in HISTORY_METRICS}}
+            for row in rows
+        ]
+        try:
+            KeywordMetricsHistoryStore(self.db).append(snapshots)
+        except Exception as e:
+            logger.warning(f"Failed to record keyword metrics history: size={len(snapshots)}, error={e}")
+
+    def _resolve_duplicates(self) -> None:
+        """중복 행에 먼저 받은 행의 저장 결과를 기록합니다."""
+        for key, index, item in self._duplicates:
+            if key in self._failed:
+                self.results.append(
+                    KeywordBulkRowResult(
+                        index=index, name=item.name, status=BulkRowStatus.FAILED, error=self._failed[key]
+                    )
+                )
+                continue
+            self.results.append(
+                KeywordBulkRowResult(
+                    index=index,
+                    name=item.name,
+                    status=BulkRowStatus.DUPLICATE,
+                    id=self._saved_ids.get(key),
+                )
+            )
+        self._duplicates = []
+
+    def finish(self) -> KeywordBulkResponse:
+        """남은 행을 기록하고 처리 결과와 처리량을 반환합니다."""
+        self.flush()
+        self._resolve_duplicates()
+        elapsed_seconds = time.perf_counter() - self._started_at
+        results = sorted(self.results, key=lambda result: result.index)
+        counts = {status: 0 for status in BulkRowStatus}
+        for result in results:
+            counts[result.status] += 1
+        upserted_count = counts[BulkRowStatus.UPSERTED]
+        return KeywordBulkResponse(
+            total_count=len(results),
+            upserted_count=upserted_count,
+            duplicate_count=counts[BulkRowStatus.DUPLICATE],
+            invalid_count=counts[BulkRowStatus.INVALID],
+            failed_count=counts[BulkRowStatus.FAILED],
+            chunk_size=self.chunk_size,
+            chunk_count=self.chunk_count,
+            elapsed_ms=elapsed_seconds * 1000,
+            rows_per_second=upserted_count / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            results=results,
+        )
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Pydantic 검증 오류를 한 줄 메시지로 변환합니다."""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def parse_ndjson_line(line: bytes) -> Any:
+    """NDJSON 한 줄을 파싱하고, 실패하면 BulkRowError를 반환합니다."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return BulkRowError(f"Invalid JSON line: {e}")
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """바이트 스트림을 비어있지 않은 줄 단위로 나누어 반환합니다."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def read_bulk_rows(request: Request) -> List[Any]:
+    """JSON 배열 또는 NDJSON 스트림 요청 본문을 행 목록으로 읽습니다."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        return [parse_ndjson_line(line) async for line in iter_ndjson_lines(request.stream())]
+
+    try:
+        payload = json.loads(await request.body())
+    except ValueError as e:
+        raise ValidationException(f"Invalid JSON body: {e}")
+    if not isinstance(payload, list):
+        raise ValidationException("Request body must be a JSON array of keywords")
+    return payload
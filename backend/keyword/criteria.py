@@ -0,0 +1,36 @@
+# Golden keyword criteria store
+
+from datetime import datetime, timezone
+from .schemas import GoldenCriteria
+
+GOLDEN_CRITERIA_TABLE = "golden_criteria"
+GOLDEN_CRITERIA_COLUMNS = "min_search_volume,max_document_count,min_view_count,min_search_document_ratio"
+# 기준은 전역 단일 행으로 보관합니다
+GOLDEN_CRITERIA_ROW_ID = 1
+
+
+class GoldenCriteriaStore:
+    """현재 적용 중인 황금키워드 기준을 golden_criteria 테이블에 보관합니다."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self) -> GoldenCriteria:
+        """저장된 기준을 반환합니다. 저장된 값이 없으면 설정 기본값을 반환합니다."""
+        rows = (
+            self.db.table(GOLDEN_CRITERIA_TABLE)
+            .select(GOLDEN_CRITERIA_COLUMNS)
+            .eq("id", GOLDEN_CRITERIA_ROW_ID)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return GoldenCriteria.model_validate(rows[0]) if rows else GoldenCriteria()
+
+    def save(self, criteria: GoldenCriteria) -> None:
+        """기준을 저장합니다."""
+        self.db.table(GOLDEN_CRITERIA_TABLE).upsert({
+            "id": GOLDEN_CRITERIA_ROW_ID,
+            **criteria.model_dump(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }).execute()
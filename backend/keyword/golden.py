@@ -0,0 +1,113 @@
+# Golden keyword vectorized filtering
+
+import numpy as np
+from typing import Any, Dict, List
+from .schemas import GoldenCriteria
+
+KEYWORD_METRIC_COLUMNS = "id,search_volume,view_count,document_count,is_golden"
+# keywords.opportunity_score 생성 열과 같은 식입니다 (search_volume / GREATEST(document_count, 1))
+OPPORTUNITY_SCORE_COLUMN = "opportunity_score"
+
+
+class KeywordMetricColumns:
+    """연관키워드 지표를 열 단위 NumPy 배열로 보관합니다."""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        search_volume: np.ndarray,
+        view_count: np.ndarray,
+        document_count: np.ndarray,
+        is_golden: np.ndarray
+    ):
+        self.ids = ids
+        self.search_volume = search_volume
+        self.view_count = view_count
+        self.document_count = document_count
+        self.is_golden = is_golden
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "KeywordMetricColumns":
+        """DB 조회 결과 행 목록을 열 배열로 변환합니다."""
+        count = len(rows)
+        return cls(
+            ids=np.array([row["id"] for row in rows], dtype=object),
+            search_volume=np.fromiter((row.get("search_volume") or 0 for row in rows), dtype=np.int64, count=count),
+            view_count=np.fromiter((row.get("view_count") or 0 for row in rows), dtype=np.int64, count=count),
+            document_count=np.fromiter((row.get("document_count") or 0 for row in rows), dtype=np.int64, count=count),
+            is_golden=np.fromiter((bool(row.get("is_golden")) for row in rows), dtype=bool, count=count),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def select_ids(self, mask: np.ndarray) -> List[str]:
+        """마스크에 해당하는 키워드 ID 목록을 반환합니다."""
+        return self.ids[mask].tolist()
+
+
+def compute_search_document_ratio(search_volume: np.ndarray, document_count: np.ndarray) -> np.ndarray:
+    """검색량/문서수 비율(기회 점수)을 계산합니다. 문서수가 0이면 1로 간주합니다."""
+    return search_volume.astype(np.float64) / np.maximum(document_count, 1)
+
+
+def compute_golden_mask(columns: KeywordMetricColumns, criteria: GoldenCriteria) -> np.ndarray:
+    """임계값과 비율 조건을 한 번에 적용해 황금키워드 여부 마스크를 반환합니다."""
+    ratio = compute_search_document_ratio(columns.search_volume, columns.document_count)
+    return (
+        (columns.search_volume >= criteria.min_search_volume)
+        & (columns.document_count <= criteria.max_document_count)
+        & (columns.view_count >= criteria.min_view_count)
+        & (ratio >= criteria.min_search_document_ratio)
+    )
+
+
+def is_criteria_tightened(previous: GoldenCriteria, current: GoldenCriteria) -> bool:
+    """기존 황금키워드 중 해제될 수 있는 행이 생기는지, 즉 하나라도 조건이 엄격해졌는지 반환합니다."""
+    return (
+        current.min_search_volume > previous.min_search_volume
+        or current.max_document_count < previous.max_document_count
+        or current.min_view_count > previous.min_view_count
+        or current.min_search_document_ratio > previous.min_search_document_ratio
+    )
+
+
+def is_criteria_loosened(previous: GoldenCriteria, current: GoldenCriteria) -> bool:
+    """새로 황금키워드가 될 수 있는 행이 생기는지, 즉 하나라도 조건이 완화됐는지 반환합니다."""
+    return (
+        current.min_search_volume < previous.min_search_volume
+        or current.max_document_count > previous.max_document_count
+        or current.min_view_count < previous.min_view_count
+        or current.min_search_document_ratio < previous.min_search_document_ratio
+    )
+
+
+def build_promotion_band_filter(previous: GoldenCriteria, current: GoldenCriteria) -> str:
+    """이전 기준에서 탈락했던 구간 중 완화된 조건의 구간만 고르는 PostgREST or 필터를 반환합니다.
+
+    새로 황금키워드가 되는 행은 완화된 조건 중 하나에서 이전에 탈락했던 행뿐입니다.
+    """
+    conditions = []
+    if current.min_search_volume < previous.min_search_volume:
+        conditions.append(f"search_volume.lt.{previous.min_search_volume}")
+    if current.max_document_count > previous.max_document_count:
+        conditions.append(f"document_count.gt.{previous.max_document_count}")
+    if current.min_view_count < previous.min_view_count:
+        conditions.append(f"view_count.lt.{previous.min_view_count}")
+    if current.min_search_document_ratio < previous.min_search_document_ratio:
+        conditions.append(f"{OPPORTUNITY_SCORE_COLUMN}.lt.{previous.min_search_document_ratio}")
+    return ",".join(conditions)
+
+
+def build_demotion_band_filter(previous: GoldenCriteria, current: GoldenCriteria) -> str:
+    """새 기준에서 탈락하는 구간 중 엄격해진 조건의 구간만 고르는 PostgREST or 필터를 반환합니다."""
+    conditions = []
+    if current.min_search_volume > previous.min_search_volume:
+        conditions.append(f"search_volume.lt.{current.min_search_volume}")
+    if current.max_document_count < previous.max_document_count:
+        conditions.append(f"document_count.gt.{current.max_document_count}")
+    if current.min_view_count > previous.min_view_count:
+        conditions.append(f"view_count.lt.{current.min_view_count}")
+    if current.min_search_document_ratio > previous.min_search_document_ratio:
+        conditions.append(f"{OPPORTUNITY_SCORE_COLUMN}.lt.{current.min_search_document_ratio}")
+    return ",".join(conditions)
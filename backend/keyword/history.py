@@ -0,0 +1,89 @@
+# Keyword metrics history stored as per-keyword array series
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .schemas import KeywordMetricsHistory
+
+HISTORY_TABLE = "keyword_metrics_history"
+HISTORY_METRICS = ("search_volume", "view_count", "document_count")
+
+
+class KeywordMetricsHistoryStore:
+    """키워드 지표 스냅샷을 키워드당 한 행의 배열 열에 누적합니다."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def append(self, snapshots: List[Dict[str, Any]], observed_at: Optional[datetime] = None) -> None:
+        """여러 키워드의 스냅샷을 한 번의 RPC 호출로 덧붙입니다."""
+        if not snapshots:
+            return
+        observed_at = observed_at or datetime.now(timezone.utc)
+        self.db.rpc(
+            "append_keyword_metrics_history",
+            {"p_observed_at": observed_at.isoformat(), "p_snapshots": snapshots},
+        ).execute()
+
+    def fetch(self, keyword_ids: List[str]) -> List[Dict[str, Any]]:
+        """여러 키워드의 시계열 행을 한 번의 쿼리로 조회합니다."""
+        if not keyword_ids:
+            return []
+        return self.db.rpc("get_keyword_metrics_history", {"p_keyword_ids": keyword_ids}).execute().data
+
+
+def build_history(
+    keyword_id: str,
+    row: Optional[Dict[str, Any]],
+    points: int,
+    since: Optional[datetime] = None
+) -> KeywordMetricsHistory:
+    """저장된 시계열 행을 기간으로 자르고 최대 points개 구간으로 다운샘플링합니다."""
+    if not row or not row.get("offsets"):
+        return KeywordMetricsHistory(keyword_id=keyword_id)
+
+    base_time = _as_utc(_parse_timestamp(row["base_time"]))
+    offsets = np.asarray(row["offsets"], dtype=np.int64)
+    series = {metric: np.asarray(row[metric], dtype=np.float64) for metric in HISTORY_METRICS}
+    if since is not None:
+        keep = offsets >= (_as_utc(since) - base_time).total_seconds()
+        offsets = offsets[keep]
+        series = {metric: values[keep] for metric, values in series.items()}
+
+    offsets, series = downsample_series(offsets, series, points)
+    return KeywordMetricsHistory(
+        keyword_id=keyword_id,
+        observed_at=[base_time + timedelta(seconds=int(offset)) for offset in offsets],
+        **{metric: np.rint(values).astype(np.int64).tolist() for metric, values in series.items()},
+    )
+
+
+def downsample_series(
+    offsets: np.ndarray,
+    series: Dict[str, np.ndarray],
+    points: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """시간 축을 points개의 같은 폭 구간으로 나누고 구간별 평균을 반환합니다. 빈 구간은 생략합니다."""
+    if len(offsets) <= points:
+        return offsets, series
+    edges = np.linspace(offsets[0], offsets[-1], points + 1)
+    buckets = np.clip(np.searchsorted(edges, offsets, side="right") - 1, 0, points - 1)
+    counts = np.bincount(buckets, minlength=points)
+    filled = counts > 0
+    averaged_offsets = np.bincount(buckets, weights=offsets, minlength=points)[filled] / counts[filled]
+    averaged_series = {
+        metric: np.bincount(buckets, weights=values, minlength=points)[filled] / counts[filled]
+        for metric, values in series.items()
+    }
+    return np.rint(averaged_offsets).astype(np.int64), averaged_series
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """시간대가 없는 시각은 UTC로 간주합니다."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
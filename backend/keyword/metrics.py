@@ -0,0 +1,182 @@
+# Keyword metrics providers and cache
+
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from core.cache import LRUCache
+from core.config import settings
+from core.logger import logger
+from core.rate_limit import AsyncRateLimiter
+from .normalizer import normalize_keyword_name
+from .schemas import KeywordMetrics, KeywordMetricsCacheStats
+
+FAKE_RELATED_SUFFIXES = ["추천", "후기", "가격", "순위", "비교", "방법", "장단점", "효과", "종류", "맛집"]
+
+
+class KeywordMetricsProvider(ABC):
+    """키워드 검색량/조회수/문서량을 조회하는 외부 지표 제공자 인터페이스"""
+
+    @abstractmethod
+    async def fetch_metrics(self, keyword: str) -> KeywordMetrics:
+        """키워드 하나의 지표를 조회합니다."""
+
+    @abstractmethod
+    async def fetch_related_keywords(self, subject_name: str) -> List[str]:
+        """주제의 연관키워드 목록을 조회합니다."""
+
+
+class FakeKeywordMetricsProvider(KeywordMetricsProvider):
+    """키워드 해시로 결정적인 지표를 만들어내는 로컬 제공자입니다. 지연을 흉내낼 수 있습니다."""
+
+    def __init__(self, latency_seconds: float = 0.0, related_count: int = 200):
+        self.latency_seconds = latency_seconds
+        self.related_count = related_count
+        self.call_count = 0
+
+    async def fetch_metrics(self, keyword: str) -> KeywordMetrics:
+        self.call_count += 1
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        digest = hashlib.sha256(keyword.encode("utf-8")).digest()
+        return KeywordMetrics(
+            keyword=keyword,
+            search_volume=int.from_bytes(digest[0:4], "big") % 100000,
+            view_count=int.from_bytes(digest[4:8], "big") % 500000,
+            document_count=int.from_bytes(digest[8:12], "big") % 200000,
+        )
+
+    async def fetch_related_keywords(self, subject_name: str) -> List[str]:
+        self.call_count += 1
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        related = [f"{subject_name} {suffix}" for suffix in FAKE_RELATED_SUFFIXES]
+        index = 1
+        while len(related) < self.related_count:
+            related.append(f"{subject_name} {FAKE_RELATED_SUFFIXES[index % len(FAKE_RELATED_SUFFIXES)]} {index}")
+            index += 1
+        return related[:self.related_count]
+
+
+class CachedKeywordMetricsProvider(KeywordMetricsProvider):
+    """TTL과 LRU 제거를 적용하고, 만료된 값은 백그라운드에서 재검증하는 동안 그대로 응답합니다.
+
+    - TTL 이내: 캐시 값을 즉시 반환
+    - TTL 경과 후 stale 구간 이내: 캐시 값을 즉시 반환하고 백그라운드에서 갱신
+    - stale 구간도 지났거나 캐시에 없음: 제공자를 호출해 응답 (같은 키의 동시 요청은 한 번만 호출)
+    """
+
+    def __init__(
+        self,
+        provider: KeywordMetricsProvider,
+        max_size: int,
+        ttl_seconds: float,
+        stale_seconds: float,
+        rate_limiter: Optional[AsyncRateLimiter] = None
+    ):
+        self.provider = provider
+        self.rate_limiter = rate_limiter
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.provider_calls = 0
+        self._cache = LRUCache(max_size)
+        self._inflight: Dict[str, "asyncio.Task[KeywordMetrics]"] = {}
+
+    async def fetch_metrics(self, keyword: str) -> KeywordMetrics:
+        # 표기만 다른 변형은 같은 캐시 항목을 공유합니다
+        key = normalize_keyword_name(keyword)
+        entry: Optional[Tuple[KeywordMetrics, float]] = self._cache.get(key)
+        if entry is not None:
+            metrics, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl_seconds:
+                self.hits += 1
+                return metrics
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh(key, keyword)
+                return metrics
+
+        self.misses += 1
+        # 호출자 하나가 취소되어도 같은 키를 기다리는 다른 호출자와 캐시 채우기는 계속되도록 공유 태스크를 보호합니다
+        return await asyncio.shield(self._load(key, keyword))
+
+    async def fetch_related_keywords(self, subject_name: str) -> List[str]:
+        await self._acquire_provider_slot()
+        return await self.provider.fetch_related_keywords(subject_name)
+
+    def stats(self) -> KeywordMetricsCacheStats:
+        """캐시 적중/미스/제거 통계를 반환합니다."""
+        cache_stats = self._cache.stats()
+        return KeywordMetricsCacheStats(
+            size=cache_stats["size"],
+            max_size=cache_stats["max_size"],
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            misses=self.misses,
+            evictions=cache_stats["evictions"],
+            refreshes=self.refreshes,
+            refresh_failures=self.refresh_failures,
+            provider_calls=self.provider_calls,
+        )
+
+    def _load(self, key: str, keyword: str) -> "asyncio.Task[KeywordMetrics]":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, keyword))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    def _schedule_refresh(self, key: str, keyword: str) -> None:
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        self._load(key, keyword).add_done_callback(self._record_refresh_result)
+
+    def _record_refresh_result(self, task: "asyncio.Task[KeywordMetrics]") -> None:
+        if task.cancelled() or task.exception() is not None:
+            self.refresh_failures += 1
+            logger.warning(f"Keyword metrics refresh failed: {task.exception() if not task.cancelled() else 'cancelled'}")
+
+    async def _acquire_provider_slot(self) -> None:
+        # 캐시 적중은 제한하지 않고 실제 제공자 호출에만 속도 제한을 적용합니다
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        self.provider_calls += 1
+
+    async def _fetch_and_store(self, key: str, keyword: str) -> KeywordMetrics:
+        await self._acquire_provider_slot()
+        metrics = await self.provider.fetch_metrics(keyword)
+        self._cache.set(key, (metrics, time.monotonic()))
+        return metrics
+
+
+METRICS_PROVIDER_FACTORIES = {
+    "fake": lambda: FakeKeywordMetricsProvider(
+        latency_seconds=settings.KEYWORD_METRICS_FAKE_LATENCY_MS / 1000,
+        related_count=settings.KEYWORD_METRICS_FAKE_RELATED_COUNT,
+    ),
+}
+
+
+@lru_cache()
+def get_keyword_metrics_provider() -> CachedKeywordMetricsProvider:
+    """설정된 지표 제공자를 속도 제한과 캐시로 감싼 싱글톤 인스턴스를 반환합니다."""
+    factory = METRICS_PROVIDER_FACTORIES.get(settings.KEYWORD_METRICS_PROVIDER)
+    if factory is None:
+        raise ValueError(f"Unknown keyword metrics provider: {settings.KEYWORD_METRICS_PROVIDER}")
+    return CachedKeywordMetricsProvider(
+        provider=factory(),
+        max_size=settings.KEYWORD_METRICS_CACHE_SIZE,
+        ttl_seconds=settings.KEYWORD_METRICS_CACHE_TTL_SECONDS,
+        stale_seconds=settings.KEYWORD_METRICS_CACHE_STALE_SECONDS,
+        rate_limiter=AsyncRateLimiter(settings.KEYWORD_METRICS_RATE_LIMIT_PER_SECOND),
+    )
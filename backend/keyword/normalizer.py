@@ -0,0 +1,26 @@
+# Keyword name normalization for deduplication
+
+import re
+import unicodedata
+from utils.hash_utils import md5_hex
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# 한글 앞뒤의 공백은 띄어쓰기 차이로 보고 제거합니다 (예: "캠핑 의자" == "캠핑의자")
+HANGUL_ADJACENT_SPACE_PATTERN = re.compile(r"\s+(?=[가-힣ㄱ-ㅣ])|(?<=[가-힣ㄱ-ㅣ])\s+")
+
+
+def normalize_keyword_name(name: str) -> str:
+    """키워드 이름을 중복 판별용 표준형으로 변환합니다.
+
+    NFKC 정규화(NFC 결합과 전각/반각 통일), 소문자 변환, 연속 공백 정리,
+    한글 앞뒤 공백 제거를 차례로 적용합니다.
+    migrations/006_keyword_normalized_hash.sql의 백필 식과 같은 규칙을 유지해야 합니다.
+    """
+    normalized = unicodedata.normalize("NFKC", name).lower()
+    normalized = WHITESPACE_PATTERN.sub(" ", normalized).strip()
+    return HANGUL_ADJACENT_SPACE_PATTERN.sub("", normalized)
+
+
+def keyword_name_hash(name: str) -> str:
+    """표준형 키워드 이름의 해시를 반환합니다. keywords.normalized_hash에 저장됩니다."""
+    return md5_hex(normalize_keyword_name(name))
@@ -0,0 +1,156 @@
+# Subject expansion pipeline with bounded concurrent metric lookups
+
+import asyncio
+import time
+from typing import List, Optional, Set, Tuple, Union
+from pydantic import ValidationError
+from core.logger import logger
+from core.models import KeywordType, Subject
+from .bulk import BulkRowError, KeywordBulkWriter, format_validation_error
+from .metrics import KeywordMetricsProvider
+from .normalizer import keyword_name_hash
+from .schemas import (
+    BulkRowStatus,
+    GoldenCriteria,
+    KeywordBulkItem,
+    KeywordBulkResponse,
+    SubjectExpansionResponse,
+)
+from .service import KeywordService
+
+# (입력 순번, 이름, 저장할 행 또는 검증 실패)
+PipelineRow = Tuple[int, str, Union[KeywordBulkItem, BulkRowError]]
+
+
+class SubjectExpansionPipeline:
+    """주제를 연관키워드로 확장하고, 지표를 동시에 조회해 도착 순서대로 일괄 저장한 뒤 황금키워드를 추출합니다."""
+
+    def __init__(
+        self,
+        keyword_service: KeywordService,
+        provider: KeywordMetricsProvider,
+        concurrency: int,
+        chunk_size: Optional[int] = None
+    ):
+        self.keyword_service = keyword_service
+        self.provider = provider
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+
+    async def run(self, subject: Subject, criteria: Optional[GoldenCriteria] = None) -> SubjectExpansionResponse:
+        """주제 하나를 확장하고 처리 결과와 순차 실행 대비 소요 시간을 반환합니다."""
+        started_at = time.perf_counter()
+        related_names = await self.provider.fetch_related_keywords(subject.name)
+        # 표기만 다른 변형은 지표 조회 전에 제거합니다
+        unique_names = dedupe_keyword_names(related_names)
+        logger.info(
+            f"Expanding subject: id={subject.id}, related={len(related_names)}, unique={len(unique_names)}, "
+            f"concurrency={self.concurrency}"
+        )
+
+        writer = KeywordBulkWriter(self.keyword_service.db, self.chunk_size)
+        queue: "asyncio.Queue[Optional[PipelineRow]]" = asyncio.Queue(maxsize=writer.chunk_size * 2)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        lookup_seconds: List[float] = []
+        failed_names: List[str] = []
+
+        async def lookup(index: int, name: str) -> None:
+            async with semaphore:
+                lookup_started_at = time.perf_counter()
+                try:
+                    metrics = await self.provider.fetch_metrics(name)
+                except Exception as e:
+                    logger.warning(f"Keyword metrics lookup failed: name={name}, error={e}")
+                    failed_names.append(name)
+                    return
+                finally:
+                    lookup_seconds.append(time.perf_counter() - lookup_started_at)
+            try:
+                row: Union[KeywordBulkItem, BulkRowError] = KeywordBulkItem(
+                    name=name,
+                    type=KeywordType.RELATED,
+                    search_volume=metrics.search_volume,
+                    view_count=metrics.view_count,
+                    document_count=metrics.document_count,
+                    subject_id=subject.id,
+                )
+            except ValidationError as e:
+                # 주제 이름 뒤에 접미사가 붙어 길이 제한을 넘는 경우 등은 해당 행만 실패로 기록합니다
+                row = BulkRowError(format_validation_error(e))
+            await queue.put((index, name, row))
+
+        writer_task = asyncio.create_task(self._drain_to_writer(queue, writer))
+        lookups_started_at = time.perf_counter()
+        try:
+            await asyncio.gather(*(lookup(index, name) for index, name in enumerate(unique_names)))
+            lookups_elapsed = time.perf_counter() - lookups_started_at
+            await queue.put(None)
+            bulk_result = await writer_task
+        finally:
+            # 조회 중 예외가 나도 기록 태스크가 남아 있지 않도록 정리합니다
+            if not writer_task.done():
+                writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+
+        golden_result = await asyncio.to_thread(self.keyword_service.extract_golden, subject.id, criteria)
+
+        serial_baseline_seconds = sum(lookup_seconds)
+        wall_clock_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"Subject expanded: id={subject.id}, wall_clock_ms={wall_clock_ms:.1f}, "
+            f"serial_baseline_ms={serial_baseline_seconds * 1000:.1f}, golden={golden_result.golden_count}"
+        )
+        return SubjectExpansionResponse(
+            subject_id=subject.id,
+            related_count=len(related_names),
+            duplicate_name_count=len(related_names) - len(unique_names),
+            lookup_failed_count=len(failed_names),
+            concurrency=self.concurrency,
+            wall_clock_ms=wall_clock_ms,
+            serial_baseline_ms=serial_baseline_seconds * 1000,
+            speedup=serial_baseline_seconds / lookups_elapsed if lookups_elapsed > 0 else 0.0,
+            bulk=bulk_result.model_copy(update={
+                "results": [result for result in bulk_result.results if result.status != BulkRowStatus.UPSERTED]
+            }),
+            golden=golden_result,
+        )
+
+    async def _drain_to_writer(
+        self,
+        queue: "asyncio.Queue[Optional[PipelineRow]]",
+        writer: KeywordBulkWriter
+    ) -> KeywordBulkResponse:
+        """조회가 끝난 행을 청크 단위로 모아 이벤트 루프를 막지 않도록 스레드에서 기록합니다."""
+        pending: List[PipelineRow] = []
+        while True:
+            row = await queue.get()
+            if row is None:
+                break
+            pending.append(row)
+            if len(pending) >= writer.chunk_size:
+                await asyncio.to_thread(_add_rows, writer, pending)
+                pending = []
+        if pending:
+            await asyncio.to_thread(_add_rows, writer, pending)
+        return await asyncio.to_thread(writer.finish)
+
+
+def _add_rows(writer: KeywordBulkWriter, rows: List[PipelineRow]) -> None:
+    for index, name, row in rows:
+        if isinstance(row, BulkRowError):
+            writer.reject(index, name, row.message)
+        else:
+            writer.add(index, row)
+
+
+def dedupe_keyword_names(names: List[str]) -> List[str]:
+    """표준형이 같은 이름 중 처음 나온 것만 순서대로 남깁니다."""
+    seen: Set[str] = set()
+    unique_names: List[str] = []
+    for name in names:
+        name_hash = keyword_name_hash(name)
+        if name_hash in seen:
+            continue
+        seen.add(name_hash)
+        unique_names.append(name)
+    return unique_names
@@ -1,10 +1,32 @@
 # Keyword API router
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import List, Optional
+from core.config import settings
 from core.logger import logger
 from core.exceptions import CustomException
-from .schemas import KeywordCreate, KeywordResponse, KeywordUpdate
+from core.pagination import set_next_cursor_header
+from .schemas import (
+    KeywordCreate,
+    KeywordResponse,
+    KeywordUpdate,
+    GoldenCriteria,
+    GoldenExtractionResponse,
+    GoldenReclassificationResponse,
+    KeywordBulkResponse,
+    KeywordRankingItem,
+    KeywordSearchResult,
+    KeywordMetrics,
+    KeywordMetricsCacheStats,
+    KeywordMetricsHistory,
+    KeywordMetricsHistoryQuery,
+    SubjectExpansionResponse,
+)
+from .bulk import read_bulk_rows
+from .metrics import CachedKeywordMetricsProvider, get_keyword_metrics_provider
+from .pipeline import SubjectExpansionPipeline
 from .service import KeywordService, get_keyword_service
 
 router = APIRouter(prefix="/api/keywords", tags=["keywords"])
@@ -12,23 +34,172 @@ router = APIRouter(prefix="/api/keywords", tags=["keywords"])
 
 @router.get("/", response_model=List[KeywordResponse])
 def get_keywords(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: KeywordService = Depends(get_keyword_service)
 ) -> List[KeywordResponse]:
     """키워드 목록을 조회합니다."""
     try:
-        logger.info(f"Fetching keywords: skip={skip}, limit={limit}")
-        keywords = service.get_keywords(skip=skip, limit=limit)
+        logger.info(f"Fetching keywords: skip={skip}, limit={limit}, cursor={cursor}")
+        keywords = service.get_keywords(skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor_header(response, keywords, limit)
         return keywords
     except CustomException as e:
         logger.error(f"Error fetching keywords: {e}")
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/search", response_model=List[KeywordSearchResult])
+def search_keywords(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=100),
+    service: KeywordService = Depends(get_keyword_service)
+) -> List[KeywordSearchResult]:
+    """키워드 자동완성/부분 일치 검색을 수행합니다."""
+    try:
+        return service.search_keywords(q, limit)
+    except CustomException as e:
+        logger.error(f"Error searching keywords: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/top", response_model=List[KeywordRankingItem])
+def get_top_keywords(
+    subject_id: str,
+    k: int = Query(settings.KEYWORD_TOP_K_DEFAULT, ge=1, le=settings.KEYWORD_TOP_K_MAX),
+    service: KeywordService = Depends(get_keyword_service)
+) -> List[KeywordRankingItem]:
+    """주제의 키워드를 기회 점수 순으로 상위 k개 조회합니다."""
+    try:
+        return service.get_top_keywords(subject_id, k)
+    except CustomException as e:
+        logger.error(f"Error fetching top keywords: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/metrics", response_model=KeywordMetrics)
+async def get_keyword_metrics(
+    q: str = Query(..., min_length=1, max_length=100),
+    provider: CachedKeywordMetricsProvider = Depends(get_keyword_metrics_provider)
+) -> KeywordMetrics:
+    """검색어의 검색량/조회수/문서량을 조회합니다."""
+    try:
+        logger.info(f"Fetching keyword metrics: q={q}")
+        return await provider.fetch_metrics(q)
+    except Exception as e:
+        logger.error(f"Error fetching keyword metrics: {e}", exc_info=True)
+        raise HTTPException(status_code=502, detail="Failed to fetch keyword metrics")
+
+
+@router.get("/metrics/cache", response_model=KeywordMetricsCacheStats)
+def get_keyword_metrics_cache_stats(
+    provider: CachedKeywordMetricsProvider = Depends(get_keyword_metrics_provider)
+) -> KeywordMetricsCacheStats:
+    """키워드 지표 캐시 통계를 조회합니다."""
+    return provider.stats()
+
+
+@router.post("/bulk", response_model=KeywordBulkResponse)
+async def bulk_upsert_keywords(
+    request: Request,
+    chunk_size: Optional[int] = Query(None, ge=1, le=settings.KEYWORD_BULK_MAX_CHUNK_SIZE),
+    service: KeywordService = Depends(get_keyword_service)
+) -> KeywordBulkResponse:
+    """JSON 배열 또는 NDJSON 스트림으로 받은 키워드를 일괄 업서트합니다."""
+    try:
+        raw_rows = await read_bulk_rows(request)
+        logger.info(f"Bulk upserting keywords: rows={len(raw_rows)}")
+        return await run_in_threadpool(service.bulk_upsert_keywords, raw_rows, chunk_size)
+    except CustomException as e:
+        logger.error(f"Error bulk upserting keywords: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/history", response_model=List[KeywordMetricsHistory])
+def get_keywords_history(
+    query: KeywordMetricsHistoryQuery,
+    service: KeywordService = Depends(get_keyword_service)
+) -> List[KeywordMetricsHistory]:
+    """여러 키워드의 지표 이력을 한 번에 조회합니다."""
+    try:
+        return service.get_keyword_history(query.keyword_ids, query.points, query.since)
+    except CustomException as e:
+        logger.error(f"Error fetching keywords history: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/golden/criteria", response_model=GoldenCriteria)
+def get_golden_criteria(
+    service: KeywordService = Depends(get_keyword_service)
+) -> GoldenCriteria:
+    """현재 적용 중인 황금키워드 기준을 조회합니다."""
+    try:
+        logger.info("Fetching golden criteria")
+        return service.get_golden_criteria()
+    except CustomException as e:
+        logger.error(f"Error fetching golden criteria: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.put("/golden/criteria", response_model=GoldenReclassificationResponse)
+def update_golden_criteria(
+    criteria: GoldenCriteria,
+    service: KeywordService = Depends(get_keyword_service)
+) -> GoldenReclassificationResponse:
+    """황금키워드 기준을 변경하고 상태가 바뀌는 키워드만 재분류합니다."""
+    try:
+        logger.info(f"Updating golden criteria: {criteria.model_dump()}")
+        return service.update_golden_criteria(criteria)
+    except CustomException as e:
+        logger.error(f"Error updating golden criteria: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/subjects/{subject_id}/golden", response_model=GoldenExtractionResponse)
+def extract_golden_keywords(
+    subject_id: str,
+    criteria: Optional[GoldenCriteria] = None,
+    service: KeywordService = Depends(get_keyword_service)
+) -> GoldenExtractionResponse:
+    """주제의 연관키워드에서 황금키워드를 추출합니다."""
+    try:
+        logger.info(f"Extracting golden keywords: subject_id={subject_id}")
+        return service.extract_golden(subject_id, criteria)
+    except CustomException as e:
+        logger.error(f"Error extracting golden keywords: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/subjects/{subject_id}/expand", response_model=SubjectExpansionResponse)
+async def expand_subject(
+    subject_id: str,
+    criteria: Optional[GoldenCriteria] = None,
+    concurrency: Optional[int] = Query(None, ge=1, le=settings.KEYWORD_EXPANSION_MAX_CONCURRENCY),
+    service: KeywordService = Depends(get_keyword_service),
+    provider: CachedKeywordMetricsProvider = Depends(get_keyword_metrics_provider)
+) -> SubjectExpansionResponse:
+    """주제를 연관키워드로 확장해 지표를 저장하고 황금키워드를 추출합니다."""
+    try:
+        logger.info(f"Expanding subject: id={subject_id}")
+        subject = await run_in_threadpool(service.get_subject, subject_id)
+        if not subject:
+            raise HTTPException(status_code=404, detail="Subject not found")
+        pipeline = SubjectExpansionPipeline(
+            keyword_service=service,
+            provider=provider,
+            concurrency=concurrency or settings.KEYWORD_EXPANSION_CONCURRENCY,
+        )
+        return await pipeline.run(subject, criteria)
+    except CustomException as e:
+        logger.error(f"Error expanding subject: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.get("/{keyword_id}", response_model=KeywordResponse)
 def get_keyword(
-    keyword_id: int,
+    keyword_id: str,
     service: KeywordService = Depends(get_keyword_service)
 ) -> KeywordResponse:
     """특정 키워드를 조회합니다."""
@@ -43,6 +214,21 @@ def get_keyword(
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/{keyword_id}/history", response_model=KeywordMetricsHistory)
+def get_keyword_history(
+    keyword_id: str,
+    points: int = Query(settings.KEYWORD_HISTORY_DEFAULT_POINTS, ge=1, le=settings.KEYWORD_HISTORY_MAX_POINTS),
+    since: Optional[datetime] = None,
+    service: KeywordService = Depends(get_keyword_service)
+) -> KeywordMetricsHistory:
+    """키워드의 지표 이력을 다운샘플링해 조회합니다."""
+    try:
+        return service.get_keyword_history([keyword_id], points, since)[0]
+    except CustomException as e:
+        logger.error(f"Error fetching keyword history: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.post("/", response_model=KeywordResponse)
 def create_keyword(
     keyword_data: KeywordCreate,
@@ -60,7 +246,7 @@ def create_keyword(
 
 @router.put("/{keyword_id}", response_model=KeywordResponse)
 def update_keyword(
-    keyword_id: int,
+    keyword_id: str,
     keyword_data: KeywordUpdate,
     service: KeywordService = Depends(get_keyword_service)
 ) -> KeywordResponse:
@@ -78,7 +264,7 @@ def update_keyword(
 
 @router.delete("/{keyword_id}")
 def delete_keyword(
-    keyword_id: int,
+    keyword_id: str,
     service: KeywordService = Depends(get_keyword_service)
 ) -> dict[str, str]:
     """키워드를 삭제합니다."""
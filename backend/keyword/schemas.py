@@ -1,8 +1,11 @@
 # Keyword Pydantic schemas
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from enum import Enum
+from core.config import settings
+from core.models import KeywordType
 
 
 class KeywordBase(BaseModel):
@@ -20,9 +23,140 @@ class KeywordUpdate(BaseModel):
 
 
 class KeywordResponse(KeywordBase):
-    id: int
+    id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class KeywordSearchResult(BaseModel):
+    id: str
+    name: str
+
+
+class KeywordRankingItem(BaseModel):
+    id: str
+    name: str
+    search_volume: int = 0
+    view_count: int = 0
+    document_count: int = 0
+    opportunity_score: float = Field(..., description="기회 점수 (검색량/문서수)")
+    is_golden: bool = False
+
+
+class GoldenCriteria(BaseModel):
+    min_search_volume: int = Field(settings.GOLDEN_MIN_SEARCH_VOLUME, description="최소 검색량", ge=0)
+    max_document_count: int = Field(settings.GOLDEN_MAX_DOCUMENT_COUNT, description="최대 문서수", ge=0)
+    min_view_count: int = Field(settings.GOLDEN_MIN_VIEW_COUNT, description="최소 조회수", ge=0)
+    min_search_document_ratio: float = Field(
+        settings.GOLDEN_MIN_SEARCH_DOCUMENT_RATIO, description="최소 검색량/문서수 비율", ge=0
+    )
+
+
+class GoldenExtractionResponse(BaseModel):
+    subject_id: str
+    total_count: int = Field(..., description="평가한 연관키워드 수")
+    golden_count: int = Field(..., description="조건을 통과한 황금키워드 수")
+    promoted_count: int = Field(..., description="새로 황금키워드로 지정된 수")
+    demoted_count: int = Field(..., description="황금키워드에서 해제된 수")
+    golden_keyword_ids: List[str] = Field(default_factory=list, description="황금키워드 ID 목록")
+    persisted: bool = Field(True, description="분류 결과를 저장했는지 여부. 저장된 기준과 다른 기준이면 저장하지 않습니다")
+    elapsed_ms: float = Field(..., description="처리 시간 (ms)")
+
+
+class GoldenReclassificationResponse(BaseModel):
+    previous_criteria: GoldenCriteria
+    criteria: GoldenCriteria
+    scanned_count: int = Field(..., description="재평가를 위해 조회한 후보 행 수")
+    promoted_count: int = Field(..., description="새로 황금키워드로 지정된 수")
+    demoted_count: int = Field(..., description="황금키워드에서 해제된 수")
+    elapsed_ms: float = Field(..., description="처리 시간 (ms)")
+
+
+class KeywordBulkItem(KeywordBase):
+    # 생략한 필드는 업서트에서 보내지 않으므로 기존 행의 값은 유지되고, 새 행은 DB 기본값을 씁니다
+    type: Optional[KeywordType] = Field(None, description="키워드 종류")
+    search_volume: int = Field(0, description="검색량", ge=0)
+    view_count: int = Field(0, description="조회수", ge=0)
+    document_count: int = Field(0, description="문서량", ge=0)
+    subject_id: Optional[str] = Field(None, description="주제 ID")
+    related_keyword_id: Optional[str] = Field(None, description="연관 키워드 ID")
+
+
+class BulkRowStatus(str, Enum):
+    UPSERTED = "upserted"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+class KeywordBulkRowResult(BaseModel):
+    index: int = Field(..., description="입력 행 순번 (0부터 시작)")
+    name: Optional[str] = None
+    status: BulkRowStatus
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class KeywordBulkResponse(BaseModel):
+    total_count: int
+    upserted_count: int
+    duplicate_count: int
+    invalid_count: int
+    failed_count: int
+    chunk_size: int
+    chunk_count: int = Field(..., description="DB 왕복 횟수")
+    elapsed_ms: float
+    rows_per_second: float = Field(..., description="업서트 처리량 (rows/s)")
+    results: List[KeywordBulkRowResult] = Field(default_factory=list)
+
+
+class KeywordMetrics(BaseModel):
+    keyword: str = Field(..., description="키워드")
+    search_volume: int = Field(0, description="검색량", ge=0)
+    view_count: int = Field(0, description="조회수", ge=0)
+    document_count: int = Field(0, description="문서량", ge=0)
+
+
+class KeywordMetricsCacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int = Field(..., description="TTL 안의 캐시 적중 수")
+    stale_hits: int = Field(..., description="만료 후 재검증 중 기존 값으로 응답한 수")
+    misses: int
+    evictions: int
+    refreshes: int = Field(..., description="백그라운드 재검증 수")
+    refresh_failures: int
+    provider_calls: int = Field(..., description="외부 제공자 호출 수")
+
+
+class SubjectExpansionResponse(BaseModel):
+    subject_id: str
+    related_count: int = Field(..., description="조회한 연관키워드 수")
+    duplicate_name_count: int = Field(..., description="표기만 달라 지표 조회 전에 제거된 연관키워드 수")
+    lookup_failed_count: int = Field(..., description="지표 조회에 실패한 수")
+    concurrency: int
+    wall_clock_ms: float = Field(..., description="전체 소요 시간 (ms)")
+    serial_baseline_ms: float = Field(..., description="지표 조회를 순차 실행했을 때의 추정 소요 시간 (ms)")
+    speedup: float = Field(..., description="serial_baseline_ms / 지표 조회 구간 소요 시간")
+    bulk: KeywordBulkResponse = Field(..., description="일괄 저장 요약 (성공 행은 results에서 제외)")
+    golden: GoldenExtractionResponse
+
+
+class KeywordMetricsHistory(BaseModel):
+    keyword_id: str
+    observed_at: List[datetime] = Field(default_factory=list, description="관측 시각 (다운샘플링 시 구간 평균 시각)")
+    search_volume: List[int] = Field(default_factory=list)
+    view_count: List[int] = Field(default_factory=list)
+    document_count: List[int] = Field(default_factory=list)
+
+
+class KeywordMetricsHistoryQuery(BaseModel):
+    keyword_ids: List[str] = Field(..., min_length=1, max_length=settings.KEYWORD_HISTORY_MAX_BATCH_SIZE)
+    points: int = Field(
+        settings.KEYWORD_HISTORY_DEFAULT_POINTS, description="키워드당 최대 데이터 포인트 수",
+        ge=1, le=settings.KEYWORD_HISTORY_MAX_POINTS
+    )
+    since: Optional[datetime] = Field(None, description="이 시각 이후의 관측만 반환")
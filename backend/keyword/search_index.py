@@ -0,0 +1,194 @@
+# In-process keyword autocomplete and partial-match index
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.string_utils import char_ngrams, decompose_hangul, normalize_search_text, remove_whitespace
+
+# 후보가 이보다 많으면 정렬 없이 앞에서부터 검증해 응답 시간을 일정하게 유지합니다
+INFIX_RANKING_CANDIDATE_LIMIT = 2000
+
+
+class _IndexedKeyword:
+    __slots__ = ("keyword_id", "name", "jamo")
+
+    def __init__(self, keyword_id: str, name: str, jamo: str):
+        self.keyword_id = keyword_id
+        self.name = name
+        self.jamo = jamo
+
+
+def build_search_keys(text: str) -> Tuple[str, str]:
+    """검색용 (공백 제거 정규화 문자열, 자모 분해 문자열)을 반환합니다."""
+    compact = remove_whitespace(normalize_search_text(text))
+    return compact, decompose_hangul(compact)
+
+
+class KeywordSearchIndex:
+    """접두어 조회와 문자 bigram 역색인을 결합한 키워드 자동완성 인덱스입니다.
+
+    접두어 조회는 자모 분해 키를 정렬 배열에 보관하고 bisect로 범위를 찾습니다.
+    (노드 단위 trie와 같은 조회를 훨씬 적은 메모리로 처리합니다)
+    중간 일치는 음절 bigram으로 후보를 좁히고, 마지막 음절이 입력 중인 경우를 위해
+    자모 bigram과 자모 부분 문자열 검증을 함께 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: List[Optional[_IndexedKeyword]] = []
+        self._free_slots: List[int] = []
+        self._slot_by_id: Dict[str, int] = {}
+        self._prefix_keys: List[str] = []
+        self._prefix_slots: List[int] = []
+        self._syllable_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._jamo_postings: Dict[str, Set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    def rebuild(self, keywords: Iterable[Tuple[str, str]]) -> None:
+        """(id, name) 목록으로 인덱스를 새로 구축합니다."""
+        with self._lock:
+            self._reset()
+            prefix_entries: List[Tuple[str, int]] = []
+            for keyword_id, name in keywords:
+                slot, jamo = self._insert_entry(str(keyword_id), name)
+                prefix_entries.append((jamo, slot))
+            # 건별 bisect 삽입 대신 한 번에 정렬합니다
+            prefix_entries.sort()
+            self._prefix_keys = [jamo for jamo, _ in prefix_entries]
+            self._prefix_slots = [slot for _, slot in prefix_entries]
+
+    def add(self, keyword_id: str, name: str) -> None:
+        """키워드를 추가하거나, 이미 있으면 새 이름으로 교체합니다."""
+        with self._lock:
+            keyword_id = str(keyword_id)
+            if keyword_id in self._slot_by_id:
+                self._delete(keyword_id)
+            self._insert(keyword_id, name)
+
+    def remove(self, keyword_id: str) -> None:
+        """키워드를 인덱스에서 제거합니다."""
+        with self._lock:
+            keyword_id = str(keyword_id)
+            if keyword_id in self._slot_by_id:
+                self._delete(keyword_id)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """접두어 일치를 먼저, 이어서 중간 일치를 (id, name) 목록으로 반환합니다."""
+        compact, jamo = build_search_keys(query)
+        if not jamo or limit <= 0:
+            return []
+        with self._lock:
+            slots = self._search_prefix(jamo, limit)
+            if len(slots) < limit:
+                seen = set(slots)
+                for slot in self._search_infix(compact, jamo, limit):
+                    if slot not in seen:
+                        slots.append(slot)
+                        seen.add(slot)
+                    if len(slots) >= limit:
+                        break
+            return [(self._entries[slot].keyword_id, self._entries[slot].name) for slot in slots]
+
+    def _search_prefix(self, jamo: str, limit: int) -> List[int]:
+        start = bisect.bisect_left(self._prefix_keys, jamo)
+        matches: List[Tuple[int, str, int]] = []
+        # 짧은 이름을 우선하기 위해 limit보다 넉넉히 모은 뒤 길이순으로 자릅니다
+        for position in range(start, min(start + limit * 4, len(self._prefix_keys))):
+            key = self._prefix_keys[position]
+            if not key.startswith(jamo):
+                break
+            matches.append((len(key), key, self._prefix_slots[position]))
+        matches.sort()
+        return [slot for _, _, slot in matches[:limit]]
+
+    def _search_infix(self, compact: str, jamo: str, limit: int) -> List[int]:
+        # 마지막 음절은 입력 중일 수 있으므로 음절 bigram은 그 앞까지만 사용합니다
+        syllable_bigrams = char_ngrams(compact[:-1])
+        if syllable_bigrams:
+            candidates = self._intersect(self._syllable_postings, syllable_bigrams)
+        else:
+            jamo_bigrams = char_ngrams(jamo)
+            if not jamo_bigrams:
+                return []
+            candidates = self._intersect(self._jamo_postings, jamo_bigrams)
+
+        if len(candidates) > INFIX_RANKING_CANDIDATE_LIMIT:
+            matches = []
+            for slot in candidates:
+                if jamo in self._entries[slot].jamo:
+                    matches.append(slot)
+                    if len(matches) >= limit:
+                        break
+            return matches
+
+        ranked: List[Tuple[int, int, int]] = []
+        for slot in candidates:
+            position = self._entries[slot].jamo.find(jamo)
+            if position >= 0:
+                ranked.append((position, len(self._entries[slot].jamo), slot))
+        ranked.sort()
+        return [slot for _, _, slot in ranked[:limit]]
+
+    @staticmethod
+    def _intersect(postings: Dict[str, Set[int]], grams: List[str]) -> Set[int]:
+        posting_sets = [postings.get(gram) for gram in set(grams)]
+        if not all(posting_sets):
+            return set()
+        posting_sets.sort(key=len)
+        return posting_sets[0].intersection(*posting_sets[1:])
+
+    def _insert(self, keyword_id: str, name: str) -> None:
+        slot, jamo = self._insert_entry(keyword_id, name)
+        position = bisect.bisect_left(self._prefix_keys, jamo)
+        self._prefix_keys.insert(position, jamo)
+        self._prefix_slots.insert(position, slot)
+
+    def _insert_entry(self, keyword_id: str, name: str) -> Tuple[int, str]:
+        compact, jamo = build_search_keys(name)
+        slot = self._free_slots.pop() if self._free_slots else len(self._entries)
+        entry = _IndexedKeyword(keyword_id, name, jamo)
+        if slot == len(self._entries):
+            self._entries.append(entry)
+        else:
+            self._entries[slot] = entry
+        self._slot_by_id[keyword_id] = slot
+        for gram in set(char_ngrams(compact)):
+            self._syllable_postings[gram].add(slot)
+        for gram in set(char_ngrams(jamo)):
+            self._jamo_postings[gram].add(slot)
+        return slot, jamo
+
+    def _delete(self, keyword_id: str) -> None:
+        slot = self._slot_by_id.pop(keyword_id)
+        entry = self._entries[slot]
+        compact, jamo = build_search_keys(entry.name)
+
+        position = bisect.bisect_left(self._prefix_keys, jamo)
+        while self._prefix_slots[position] != slot:
+            position += 1
+        del self._prefix_keys[position]
+        del self._prefix_slots[position]
+        self._discard_postings(self._syllable_postings, char_ngrams(compact), slot)
+        self._discard_postings(self._jamo_postings, char_ngrams(jamo), slot)
+
+        self._entries[slot] = None
+        self._free_slots.append(slot)
+
+    @staticmethod
+    def _discard_postings(postings: Dict[str, Set[int]], grams: List[str], slot: int) -> None:
+        for gram in set(grams):
+            posting = postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(slot)
+            if not posting:
+                del postings[gram]
+
+
+keyword_search_index = KeywordSearchIndex()
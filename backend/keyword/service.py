@@ -1,10 +1,54 @@
 # Keyword business logic service
 
-from typing import List, Optional
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import ValidationError
+from core.config import settings
 from core.logger import logger
-from core.exceptions import CustomException
+from core.exceptions import ConflictException, CustomException
 from core.database import get_db
-from .schemas import KeywordCreate, KeywordUpdate, KeywordResponse
+from core.pagination import paginate_query
+from core.models import KeywordType, Subject
+from .schemas import (
+    KeywordCreate,
+    KeywordUpdate,
+    KeywordResponse,
+    GoldenCriteria,
+    GoldenExtractionResponse,
+    GoldenReclassificationResponse,
+    KeywordBulkItem,
+    KeywordBulkResponse,
+    KeywordMetricsHistory,
+    KeywordRankingItem,
+    KeywordSearchResult,
+)
+from .bulk import BulkRowError, KeywordBulkWriter, format_validation_error
+from .criteria import GoldenCriteriaStore
+from .golden import (
+    KEYWORD_METRIC_COLUMNS,
+    OPPORTUNITY_SCORE_COLUMN,
+    KeywordMetricColumns,
+    build_demotion_band_filter,
+    build_promotion_band_filter,
+    compute_golden_mask,
+    is_criteria_loosened,
+    is_criteria_tightened,
+)
+from .history import KeywordMetricsHistoryStore, build_history
+from .normalizer import keyword_name_hash
+from .search_index import keyword_search_index
+
+# 기준 변경과 재분류가 서로 겹치지 않도록 직렬화합니다
+_golden_criteria_lock = threading.Lock()
+
+# PostgreSQL unique_violation 오류 코드입니다
+UNIQUE_VIOLATION_CODE = "23505"
+
+
+def _is_unique_violation(error: Exception) -> bool:
+    return getattr(error, "code", None) == UNIQUE_VIOLATION_CODE
 
 
 def get_keyword_service():
@@ -19,52 +63,384 @@ class KeywordService:
     def __init__(self, db=None):
         self.db = db
     
-    def get_keywords(self, skip: int = 0, limit: int = 100) -> List[KeywordResponse]:
+    def get_keywords(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[KeywordResponse]:
         """키워드 목록을 조회합니다."""
         try:
-            logger.info(f"Fetching keywords from database: skip={skip}, limit={limit}")
-            # TODO: 데이터베이스에서 키워드 목록 조회 로직 구현
-            return []
+            logger.info(f"Fetching keywords from database: skip={skip}, limit={limit}, cursor={cursor}")
+            query = paginate_query(self.db.table("keywords").select("*"), skip=skip, limit=limit, cursor=cursor)
+            return [KeywordResponse.model_validate(row) for row in query.execute().data]
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch keywords: {e}", exc_info=True)
             raise CustomException("Failed to fetch keywords")
     
-    def get_keyword_by_id(self, keyword_id: int) -> Optional[KeywordResponse]:
+    def get_keyword_by_id(self, keyword_id: str) -> Optional[KeywordResponse]:
         """ID로 키워드를 조회합니다."""
         try:
             logger.info(f"Fetching keyword by id: {keyword_id}")
-            # TODO: 데이터베이스에서 키워드 조회 로직 구현
-            return None
+            rows = self.db.table("keywords").select("*").eq("id", keyword_id).limit(1).execute().data
+            return KeywordResponse.model_validate(rows[0]) if rows else None
         except Exception as e:
             logger.error(f"Failed to fetch keyword: {e}", exc_info=True)
             raise CustomException("Failed to fetch keyword")
     
     def create_keyword(self, keyword_data: KeywordCreate) -> KeywordResponse:
-        """새 키워드를 생성합니다."""
+        """새 키워드를 생성합니다.
+        
+        띄어쓰기 등만 다른 같은 이름의 키워드가 이미 있으면 ConflictException(409)을 발생시킵니다.
+        """
         try:
             logger.info(f"Creating keyword: {keyword_data.name}")
-            # TODO: 데이터베이스에 키워드 생성 로직 구현
-            raise NotImplementedError("Keyword creation not implemented")
+            values = {**keyword_data.model_dump(), "normalized_hash": keyword_name_hash(keyword_data.name)}
+            self._ensure_keyword_name_available(None, values["normalized_hash"])
+            row = self.db.table("keywords").insert(values).execute().data[0]
+            keyword_search_index.add(row["id"], row["name"])
+            return KeywordResponse.model_validate(row)
+        except CustomException:
+            raise
         except Exception as e:
+            if _is_unique_violation(e):
+                raise ConflictException(f"Keyword already exists: {keyword_data.name}")
             logger.error(f"Failed to create keyword: {e}", exc_info=True)
             raise CustomException("Failed to create keyword")
     
-    def update_keyword(self, keyword_id: int, keyword_data: KeywordUpdate) -> Optional[KeywordResponse]:
-        """키워드를 업데이트합니다."""
+    def update_keyword(self, keyword_id: str, keyword_data: KeywordUpdate) -> Optional[KeywordResponse]:
+        """키워드를 업데이트합니다.
+        
+        바꾼 이름이 같은 주제의 다른 키워드와 같은 표준형이면 ConflictException(409)을 발생시킵니다.
+        """
         try:
             logger.info(f"Updating keyword: id={keyword_id}")
-            # TODO: 데이터베이스에서 키워드 업데이트 로직 구현
-            return None
+            values = keyword_data.model_dump(exclude_unset=True)
+            if not values:
+                return self.get_keyword_by_id(keyword_id)
+            if "name" in values:
+                values["normalized_hash"] = keyword_name_hash(values["name"])
+                current = self.db.table("keywords").select("subject_id").eq("id", keyword_id).limit(1).execute().data
+                if not current:
+                    return None
+                self._ensure_keyword_name_available(current[0].get("subject_id"), values["normalized_hash"], keyword_id)
+            rows = self.db.table("keywords").update(values).eq("id", keyword_id).execute().data
+            if not rows:
+                return None
+            keyword_search_index.add(rows[0]["id"], rows[0]["name"])
+            return KeywordResponse.model_validate(rows[0])
+        except CustomException:
+            raise
         except Exception as e:
+            if _is_unique_violation(e):
+                raise ConflictException(f"Keyword already exists: {keyword_data.name}")
             logger.error(f"Failed to update keyword: {e}", exc_info=True)
             raise CustomException("Failed to update keyword")
     
-    def delete_keyword(self, keyword_id: int) -> bool:
+    def _ensure_keyword_name_available(
+        self,
+        subject_id: Optional[str],
+        normalized_hash: str,
+        exclude_id: Optional[str] = None
+    ) -> None:
+        # (subject_id, normalized_hash) 고유 인덱스와 같은 기준입니다. 동시에 들어온 요청은 인덱스가 막습니다
+        query = self.db.table("keywords").select("id,name").eq("normalized_hash", normalized_hash)
+        query = query.eq("subject_id", subject_id) if subject_id is not None else query.is_("subject_id", "null")
+        if exclude_id is not None:
+            query = query.neq("id", exclude_id)
+        rows = query.limit(1).execute().data
+        if rows:
+            raise ConflictException(f"Keyword already exists: {rows[0]['name']}")
+    
+    def delete_keyword(self, keyword_id: str) -> bool:
         """키워드를 삭제합니다."""
         try:
             logger.info(f"Deleting keyword: id={keyword_id}")
-            # TODO: 데이터베이스에서 키워드 삭제 로직 구현
-            return False
+            rows = self.db.table("keywords").delete().eq("id", keyword_id).execute().data
+            if not rows:
+                return False
+            keyword_search_index.remove(rows[0]["id"])
+            return True
         except Exception as e:
             logger.error(f"Failed to delete keyword: {e}", exc_info=True)
             raise CustomException("Failed to delete keyword")
+    
+    def get_subject(self, subject_id: str) -> Optional[Subject]:
+        """ID로 주제를 조회합니다."""
+        try:
+            logger.info(f"Fetching subject by id: {subject_id}")
+            rows = self.db.table("subjects").select("*").eq("id", subject_id).limit(1).execute().data
+            return Subject(**rows[0]) if rows else None
+        except Exception as e:
+            logger.error(f"Failed to fetch subject: {e}", exc_info=True)
+            raise CustomException("Failed to fetch subject")
+    
+    def search_keywords(self, query: str, limit: int = 10) -> List[KeywordSearchResult]:
+        """메모리 인덱스에서 접두어/부분 일치 키워드를 검색합니다."""
+        try:
+            return [
+                KeywordSearchResult(id=keyword_id, name=name)
+                for keyword_id, name in keyword_search_index.search(query, limit)
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search keywords: {e}", exc_info=True)
+            raise CustomException("Failed to search keywords")
+    
+    def rebuild_search_index(self) -> int:
+        """키워드 테이블 전체로 검색 인덱스를 다시 구축하고 색인된 키워드 수를 반환합니다."""
+        try:
+            logger.info("Building keyword search index")
+            started_at = time.perf_counter()
+            rows = self._fetch_all_rows(lambda: self.db.table("keywords").select("id,name").order("id"))
+            keyword_search_index.rebuild((row["id"], row["name"]) for row in rows)
+            logger.info(
+                f"Keyword search index built: keywords={len(keyword_search_index)}, "
+                f"elapsed_ms={(time.perf_counter() - started_at) * 1000:.1f}"
+            )
+            return len(keyword_search_index)
+        except Exception as e:
+            logger.error(f"Failed to build keyword search index: {e}", exc_info=True)
+            raise CustomException("Failed to build keyword search index")
+    
+    def extract_golden(self, subject_id: str, criteria: Optional[GoldenCriteria] = None) -> GoldenExtractionResponse:
+        """주제의 연관키워드를 필터링해 황금키워드를 추출합니다.
+        
+        저장된 기준과 다른 기준을 지정하면 결과만 계산하고 저장하지 않습니다. is_golden은 항상 저장된 기준과
+        일치해야 기준 변경 시 바뀌는 구간만 재분류할 수 있기 때문입니다.
+        """
+        try:
+            stored_criteria = GoldenCriteriaStore(self.db).get()
+            persisted = criteria is None or criteria == stored_criteria
+            criteria = criteria or stored_criteria
+            logger.info(
+                f"Extracting golden keywords: subject_id={subject_id}, criteria={criteria.model_dump()}, "
+                f"persisted={persisted}"
+            )
+            started_at = time.perf_counter()
+            
+            rows = self._fetch_all_rows(
+                lambda: self.db.table("keywords").select(KEYWORD_METRIC_COLUMNS).eq("subject_id", subject_id).order("id")
+            )
+            columns = KeywordMetricColumns.from_rows(rows)
+            golden_mask = compute_golden_mask(columns, criteria)
+            
+            # 상태가 바뀌는 행만 갱신합니다
+            promoted_ids = columns.select_ids(golden_mask & ~columns.is_golden)
+            demoted_ids = columns.select_ids(~golden_mask & columns.is_golden)
+            if persisted:
+                self._update_rows_by_ids(promoted_ids, {"is_golden": True, "type": KeywordType.GOLDEN.value})
+                self._update_rows_by_ids(demoted_ids, {"is_golden": False, "type": KeywordType.RELATED.value})
+            
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            golden_ids = columns.select_ids(golden_mask)
+            logger.info(
+                f"Golden keywords extracted: subject_id={subject_id}, total={len(columns)}, "
+                f"golden={len(golden_ids)}, elapsed_ms={elapsed_ms:.1f}"
+            )
+            return GoldenExtractionResponse(
+                subject_id=subject_id,
+                total_count=len(columns),
+                golden_count=len(golden_ids),
+                promoted_count=len(promoted_ids),
+                demoted_count=len(demoted_ids),
+                golden_keyword_ids=golden_ids,
+                persisted=persisted,
+                elapsed_ms=elapsed_ms,
+            )
+        except Exception as e:
+            logger.error(f"Failed to extract golden keywords: {e}", exc_info=True)
+            raise CustomException("Failed to extract golden keywords")
+    
+    def get_top_keywords(self, subject_id: str, k: int) -> List[KeywordRankingItem]:
+        """주제의 키워드를 기회 점수 내림차순으로 상위 k개 조회합니다.
+        
+        (subject_id, opportunity_score DESC) 인덱스 순서대로 k개만 읽으므로 전체 정렬이 일어나지 않습니다.
+        """
+        try:
+            logger.info(f"Fetching top keywords: subject_id={subject_id}, k={k}")
+            rows = (
+                self.db.table("keywords")
+                .select(f"id,name,search_volume,view_count,document_count,{OPPORTUNITY_SCORE_COLUMN},is_golden")
+                .eq("subject_id", subject_id)
+                .order(OPPORTUNITY_SCORE_COLUMN, desc=True)
+                .order("id")
+                .limit(k)
+                .execute()
+                .data
+            )
+            return [KeywordRankingItem.model_validate(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to fetch top keywords: {e}", exc_info=True)
+            raise CustomException("Failed to fetch top keywords")
+    
+    def get_keyword_history(
+        self,
+        keyword_ids: List[str],
+        points: int,
+        since: Optional[datetime] = None
+    ) -> List[KeywordMetricsHistory]:
+        """여러 키워드의 지표 이력을 한 번의 쿼리로 조회하고 키워드당 최대 points개로 다운샘플링합니다."""
+        try:
+            logger.info(f"Fetching keyword metrics history: keywords={len(keyword_ids)}, points={points}")
+            rows = KeywordMetricsHistoryStore(self.db).fetch(keyword_ids)
+            rows_by_id = {str(row["keyword_id"]): row for row in rows}
+            return [
+                build_history(keyword_id, rows_by_id.get(keyword_id), points, since) for keyword_id in keyword_ids
+            ]
+        except Exception as e:
+            logger.error(f"Failed to fetch keyword metrics history: {e}", exc_info=True)
+            raise CustomException("Failed to fetch keyword metrics history")
+    
+    def get_golden_criteria(self) -> GoldenCriteria:
+        """현재 적용 중인 황금키워드 기준을 조회합니다."""
+        try:
+            return GoldenCriteriaStore(self.db).get()
+        except Exception as e:
+            logger.error(f"Failed to fetch golden criteria: {e}", exc_info=True)
+            raise CustomException("Failed to fetch golden criteria")
+    
+    def update_golden_criteria(self, criteria: GoldenCriteria) -> GoldenReclassificationResponse:
+        """황금키워드 기준을 변경하고 상태가 바뀌는 키워드만 찾아 재분류합니다.
+        
+        키워드는 기록될 때마다 DB 트리거가 저장된 기준으로 분류하므로 현재 is_golden 값은 이전 기준과 일치합니다.
+        엄격해진 조건이 있으면 기존 황금키워드만, 완화된 조건이 있으면 이전 기준에서 탈락했던 구간의
+        비황금키워드만 인덱스 범위 조건으로 조회합니다. 기준을 먼저 저장하므로 그 사이에 기록된 행도 새 기준으로
+        분류됩니다. 같은 기준을 다시 저장하면 전체를 다시 분류합니다(재분류가 중간에 실패했을 때 복구용).
+        """
+        try:
+            with _golden_criteria_lock:
+                store = GoldenCriteriaStore(self.db)
+                previous = store.get()
+                logger.info(
+                    f"Updating golden criteria: previous={previous.model_dump()}, criteria={criteria.model_dump()}"
+                )
+                started_at = time.perf_counter()
+                store.save(criteria)
+                
+                scanned_count = 0
+                demoted_ids: List[str] = []
+                promoted_ids: List[str] = []
+                if criteria == previous:
+                    columns = self._fetch_reclassification_candidates()
+                    scanned_count = len(columns)
+                    golden_mask = compute_golden_mask(columns, criteria)
+                    promoted_ids = columns.select_ids(golden_mask & ~columns.is_golden)
+                    demoted_ids = columns.select_ids(~golden_mask & columns.is_golden)
+                
+                if is_criteria_tightened(previous, criteria):
+                    columns = self._fetch_reclassification_candidates(
+                        is_golden=True, band_filter=build_demotion_band_filter(previous, criteria)
+                    )
+                    scanned_count += len(columns)
+                    demoted_ids = columns.select_ids(~compute_golden_mask(columns, criteria))
+                
+                if is_criteria_loosened(previous, criteria):
+                    columns = self._fetch_reclassification_candidates(
+                        is_golden=False,
+                        band_filter=build_promotion_band_filter(previous, criteria),
+                        criteria=criteria,
+                    )
+                    scanned_count += len(columns)
+                    promoted_ids = columns.select_ids(compute_golden_mask(columns, criteria))
+                
+                self._update_rows_by_ids(promoted_ids, {"is_golden": True, "type": KeywordType.GOLDEN.value})
+                self._update_rows_by_ids(demoted_ids, {"is_golden": False, "type": KeywordType.RELATED.value})
+                
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                logger.info(
+                    f"Golden criteria updated: scanned={scanned_count}, promoted={len(promoted_ids)}, "
+                    f"demoted={len(demoted_ids)}, elapsed_ms={elapsed_ms:.1f}"
+                )
+                return GoldenReclassificationResponse(
+                    previous_criteria=previous,
+                    criteria=criteria,
+                    scanned_count=scanned_count,
+                    promoted_count=len(promoted_ids),
+                    demoted_count=len(demoted_ids),
+                    elapsed_ms=elapsed_ms,
+                )
+        except Exception as e:
+            logger.error(f"Failed to update golden criteria: {e}", exc_info=True)
+            raise CustomException("Failed to update golden criteria")
+    
+    def bulk_upsert_keywords(self, raw_rows: List[Any], chunk_size: Optional[int] = None) -> KeywordBulkResponse:
+        """키워드 목록을 (name, subject_id) 기준으로 청크 단위 일괄 업서트합니다."""
+        try:
+            logger.info(f"Bulk upserting keywords: rows={len(raw_rows)}, chunk_size={chunk_size}")
+            writer = KeywordBulkWriter(self.db, chunk_size)
+            for index, raw_row in enumerate(raw_rows):
+                if isinstance(raw_row, BulkRowError):
+                    writer.reject(index, None, raw_row.message)
+                    continue
+                try:
+                    item = KeywordBulkItem.model_validate(raw_row)
+                except ValidationError as e:
+                    name = raw_row.get("name") if isinstance(raw_row, dict) else None
+                    writer.reject(index, name, format_validation_error(e))
+                    continue
+                writer.add(index, item)
+            
+            result = writer.finish()
+            logger.info(
+                f"Bulk upsert finished: upserted={result.upserted_count}, failed={result.failed_count}, "
+                f"chunks={result.chunk_count}, rows_per_second={result.rows_per_second:.1f}"
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert keywords: {e}", exc_info=True)
+            raise CustomException("Failed to bulk upsert keywords")
+    
+    def _fetch_all_rows(self, build_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+        """range 페이지 단위로 나누어 쿼리 결과 전체를 조회합니다."""
+        rows: List[Dict[str, Any]] = []
+        page_size = settings.DB_FETCH_PAGE_SIZE
+        start = 0
+        while True:
+            page = build_query().range(start, start + page_size - 1).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            start += page_size
+    
+    def _fetch_reclassification_candidates(
+        self,
+        is_golden: Optional[bool] = None,
+        band_filter: str = "",
+        criteria: Optional[GoldenCriteria] = None
+    ) -> KeywordMetricColumns:
+        """주제에 속한 키워드 중 재분류 후보를 지표 열 배열로 조회합니다. 조건을 모두 생략하면 전체를 조회합니다.
+        
+        criteria가 주어지면 새 기준의 임계값 범위로, band_filter가 주어지면 상태가 바뀔 수 있는 구간으로 좁힙니다.
+        """
+        def build_query():
+            query = self.db.table("keywords").select(KEYWORD_METRIC_COLUMNS).not_.is_("subject_id", "null")
+            if is_golden is not None:
+                query = query.eq("is_golden", is_golden)
+            if criteria is not None:
+                query = (
+                    query.gte("search_volume", criteria.min_search_volume)
+                    .lte("document_count", criteria.max_document_count)
+                    .gte("view_count", criteria.min_view_count)
+                    .gte(OPPORTUNITY_SCORE_COLUMN, criteria.min_search_document_ratio)
+                )
+            if band_filter:
+                query = query.or_(band_filter)
+            return query.order("id")
+        
+        return KeywordMetricColumns.from_rows(self._fetch_all_rows(build_query))
+    
+    def _update_rows_by_ids(self, keyword_ids: List[str], values: Dict[str, Any]) -> None:
+        """ID 목록을 청크로 나누어 같은 값으로 일괄 업데이트합니다."""
+        chunk_size = settings.DB_UPDATE_CHUNK_SIZE
+        for start in range(0, len(keyword_ids), chunk_size):
+            chunk = keyword_ids[start:start + chunk_size]
+            self.db.table("keywords").update(values).in_("id", chunk).execute()
+
+
+def load_keyword_search_index() -> None:
+    """서버 기동을 막지 않도록 키워드 검색 인덱스를 백그라운드 스레드에서 구축합니다."""
+    threading.Thread(target=_rebuild_keyword_search_index, name="keyword-search-index", daemon=True).start()
+
+
+def _rebuild_keyword_search_index() -> None:
+    try:
+        get_keyword_service().rebuild_search_index()
+    except Exception as e:
+        logger.error(f"Keyword search index was not loaded: {e}")
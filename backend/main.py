@@ -1,20 +1,51 @@
 # FastAPI app definition file
 # Server execution code should not be included here
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
 from core.logger import logger
 from core.exceptions import CustomException
+from core.pagination import NEXT_CURSOR_HEADER
 from keyword.router import router as keyword_router
+from keyword.service import load_keyword_search_index
+from script.jobs import get_script_job_manager
 from script.router import router as script_router
+from script.service import load_script_duplicate_index
+from upload.naver_html import prune_naver_html_cache
+from upload.publish_queue import get_publish_queue
 from upload.router import router as upload_router
+from upload.sessions import get_upload_session_store
+from image.derivatives import get_image_derivative_pipeline
+from image.gc import get_image_garbage_collector
 from image.router import router as image_router
+from image.service import load_image_similarity_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작/종료 시 필요한 작업을 등록합니다."""
+    load_keyword_search_index()
+    load_script_duplicate_index()
+    load_image_similarity_index()
+    prune_naver_html_cache()
+    get_image_garbage_collector().start()
+    get_upload_session_store().start()
+    get_publish_queue().start()
+    yield
+    await get_publish_queue().shutdown()
+    await get_upload_session_store().shutdown()
+    await get_image_garbage_collector().shutdown()
+    await get_image_derivative_pipeline().shutdown()
+    await get_script_job_manager().shutdown()
+
 
 app = FastAPI(
     title="PPOP Blog API",
     description="PPOP Blog Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -24,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # 라우터 등록
@@ -0,0 +1,27 @@
+-- Unique key for keyword bulk upsert
+-- ON CONFLICT (name, subject_id) requires a unique index on the same columns
+
+-- Merge existing exact duplicates into the oldest row of each (name, subject_id) group
+CREATE TEMP TABLE keyword_duplicates AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (PARTITION BY name, subject_id ORDER BY created_at, id) AS keep_id
+    FROM keywords
+) ranked
+WHERE id <> keep_id;
+
+UPDATE posts SET keyword_id = d.keep_id
+FROM keyword_duplicates d
+WHERE posts.keyword_id = d.id;
+
+UPDATE keywords SET related_keyword_id = d.keep_id
+FROM keyword_duplicates d
+WHERE keywords.related_keyword_id = d.id;
+
+DELETE FROM keywords USING keyword_duplicates d WHERE keywords.id = d.id;
+
+DROP TABLE keyword_duplicates;
+
+CREATE UNIQUE INDEX idx_keywords_name_subject_id ON keywords(name, subject_id) NULLS NOT DISTINCT;
@@ -0,0 +1,20 @@
+-- Keyset (cursor) pagination support
+-- List endpoints order by (created_at DESC, id DESC) and page with
+-- WHERE (created_at, id) < (cursor_created_at, cursor_id)
+
+-- posts: reuses the existing idx_posts_created_at index
+
+CREATE INDEX idx_keywords_created_at_id ON keywords(created_at DESC, id DESC);
+CREATE INDEX idx_images_created_at_id ON images(created_at DESC, id DESC);
+
+-- Create uploads table (backs the upload module list endpoints)
+CREATE TABLE uploads (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    filename VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    file_size BIGINT NOT NULL DEFAULT 0,
+    content_type VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_uploads_created_at_id ON uploads(created_at DESC, id DESC);
@@ -0,0 +1,13 @@
+-- Golden keyword criteria store
+-- Holds the single active set of thresholds. Changing it re-classifies only
+-- the keywords whose is_golden flag flips, using the existing
+-- idx_keywords_is_golden / idx_keywords_search_volume / idx_keywords_document_count indexes.
+
+CREATE TABLE golden_criteria (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    min_search_volume INTEGER NOT NULL DEFAULT 1000,
+    max_document_count INTEGER NOT NULL DEFAULT 10000,
+    min_view_count INTEGER NOT NULL DEFAULT 0,
+    min_search_document_ratio DOUBLE PRECISION NOT NULL DEFAULT 0.5,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
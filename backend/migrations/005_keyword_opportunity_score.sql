@@ -0,0 +1,14 @@
+-- Keyword opportunity score
+-- search_volume / document_count, recomputed by Postgres whenever either metric
+-- changes. Same expression as the golden ratio condition, so criteria changes
+-- can also narrow re-classification candidates by score.
+
+ALTER TABLE keywords
+    ADD COLUMN opportunity_score DOUBLE PRECISION
+    GENERATED ALWAYS AS (
+        COALESCE(search_volume, 0)::DOUBLE PRECISION / GREATEST(COALESCE(document_count, 0), 1)
+    ) STORED;
+
+-- GET /api/keywords/top reads the first k entries of this index per subject
+CREATE INDEX idx_keywords_subject_id_opportunity_score
+    ON keywords(subject_id, opportunity_score DESC, id);
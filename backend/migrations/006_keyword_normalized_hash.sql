@@ -0,0 +1,47 @@
+-- Keyword name normalization and hash-based dedup
+-- normalized_hash = md5(normalized name), see keyword/normalizer.py:
+-- NFKC, lower case, collapse whitespace, drop spaces next to Hangul.
+-- Variants that differ only by spacing, width or NFC/NFD form share one row per subject.
+
+ALTER TABLE keywords ADD COLUMN normalized_hash CHAR(32);
+
+UPDATE keywords
+SET normalized_hash = md5(
+    regexp_replace(
+        btrim(regexp_replace(lower(normalize(name, NFKC)), '\s+', ' ', 'g')),
+        '\s+(?=[가-힣ㄱ-ㅣ])|(?<=[가-힣ㄱ-ㅣ])\s+',
+        '',
+        'g'
+    )
+);
+
+-- Merge existing variants into the oldest row of each (subject_id, normalized_hash) group
+CREATE TEMP TABLE keyword_duplicates AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (PARTITION BY subject_id, normalized_hash ORDER BY created_at, id) AS keep_id
+    FROM keywords
+) ranked
+WHERE id <> keep_id;
+
+UPDATE posts SET keyword_id = d.keep_id
+FROM keyword_duplicates d
+WHERE posts.keyword_id = d.id;
+
+UPDATE keywords SET related_keyword_id = d.keep_id
+FROM keyword_duplicates d
+WHERE keywords.related_keyword_id = d.id;
+
+DELETE FROM keywords USING keyword_duplicates d WHERE keywords.id = d.id;
+
+DROP TABLE keyword_duplicates;
+
+ALTER TABLE keywords ALTER COLUMN normalized_hash SET NOT NULL;
+
+-- Bulk upsert now resolves conflicts on (subject_id, normalized_hash)
+CREATE UNIQUE INDEX idx_keywords_subject_id_normalized_hash
+    ON keywords(subject_id, normalized_hash) NULLS NOT DISTINCT;
+
+DROP INDEX idx_keywords_name_subject_id;
@@ -0,0 +1,51 @@
+-- Keyword metrics history
+-- One row per keyword holding parallel arrays instead of one row per observation.
+-- offsets are seconds since base_time (the first observation).
+
+CREATE TABLE keyword_metrics_history (
+    keyword_id UUID PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    base_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    offsets INTEGER[] NOT NULL DEFAULT '{}',
+    search_volume INTEGER[] NOT NULL DEFAULT '{}',
+    view_count INTEGER[] NOT NULL DEFAULT '{}',
+    document_count INTEGER[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Appends one snapshot per keyword in a single statement.
+-- p_snapshots: [{"keyword_id": ..., "search_volume": ..., "view_count": ..., "document_count": ...}, ...]
+CREATE OR REPLACE FUNCTION append_keyword_metrics_history(p_observed_at TIMESTAMP WITH TIME ZONE, p_snapshots JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH appended AS (
+        INSERT INTO keyword_metrics_history AS h
+            (keyword_id, base_time, offsets, search_volume, view_count, document_count)
+        SELECT
+            s.keyword_id,
+            p_observed_at,
+            ARRAY[0],
+            ARRAY[COALESCE(s.search_volume, 0)],
+            ARRAY[COALESCE(s.view_count, 0)],
+            ARRAY[COALESCE(s.document_count, 0)]
+        FROM jsonb_to_recordset(p_snapshots)
+            AS s(keyword_id UUID, search_volume INTEGER, view_count INTEGER, document_count INTEGER)
+        ON CONFLICT (keyword_id) DO UPDATE SET
+            offsets = h.offsets || EXTRACT(EPOCH FROM (p_observed_at - h.base_time))::INTEGER,
+            search_volume = h.search_volume || EXCLUDED.search_volume,
+            view_count = h.view_count || EXCLUDED.view_count,
+            document_count = h.document_count || EXCLUDED.document_count,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM appended;
+$$;
+
+-- Loads the series of many keywords in one query (ids travel in the request body)
+CREATE OR REPLACE FUNCTION get_keyword_metrics_history(p_keyword_ids UUID[])
+RETURNS SETOF keyword_metrics_history
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT * FROM keyword_metrics_history WHERE keyword_id = ANY(p_keyword_ids);
+$$;
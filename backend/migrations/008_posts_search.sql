@@ -0,0 +1,86 @@
+-- Full-text search over posts with Korean bigram tokens
+-- Text is lower-cased and split on anything that is not [0-9a-z가-힣]. Each token
+-- becomes overlapping 2-character grams ("캠핑의자" -> 캠핑, 핑의, 의자) and
+-- one-character tokens are kept as is. Lexemes are built directly as tsvector
+-- literals so the result does not depend on the text search parser or locale.
+-- search_vector is a generated column, so inserts and updates re-index the row.
+
+CREATE OR REPLACE FUNCTION korean_bigram_tsvector(p_text TEXT)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT COALESCE(string_agg('''' || gram || ''':' || LEAST(position, 16383)::TEXT, ' '), '')::tsvector
+    FROM (
+        SELECT substr(t.token, i, 2) AS gram, row_number() OVER (ORDER BY t.ord, i) AS position
+        FROM regexp_split_to_table(lower(COALESCE(p_text, '')), '[^0-9a-z가-힣]+') WITH ORDINALITY AS t(token, ord)
+        CROSS JOIN LATERAL generate_series(1, GREATEST(char_length(t.token) - 1, 1)) AS i
+        WHERE t.token <> ''
+    ) grams;
+$$;
+
+-- Grams of one token must be adjacent (<->), tokens are AND-ed, a one-character token is a prefix match
+CREATE OR REPLACE FUNCTION korean_bigram_tsquery(p_query TEXT)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT COALESCE(string_agg(
+        CASE
+            WHEN char_length(t.token) = 1 THEN '''' || t.token || ''':*'
+            ELSE (
+                SELECT string_agg('''' || substr(t.token, i, 2) || '''', ' <-> ' ORDER BY i)
+                FROM generate_series(1, char_length(t.token) - 1) AS i
+            )
+        END,
+        ' & ' ORDER BY t.ord
+    ), '')::tsquery
+    FROM regexp_split_to_table(lower(COALESCE(p_query, '')), '[^0-9a-z가-힣]+') WITH ORDINALITY AS t(token, ord)
+    WHERE t.token <> '';
+$$;
+
+ALTER TABLE posts
+    ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(korean_bigram_tsvector(title), 'A') || setweight(korean_bigram_tsvector(content), 'D')
+    ) STORED;
+
+CREATE INDEX idx_posts_search_vector ON posts USING GIN (search_vector);
+
+-- Ranked search with a short snippet around the first query token
+CREATE OR REPLACE FUNCTION search_posts(p_query TEXT, p_limit INTEGER DEFAULT 20, p_status post_status DEFAULT NULL)
+RETURNS TABLE (
+    id UUID,
+    title VARCHAR,
+    status post_status,
+    keyword_id UUID,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    rank REAL,
+    snippet TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (
+        SELECT
+            korean_bigram_tsquery(p_query) AS query,
+            split_part(btrim(regexp_replace(lower(p_query), '[^0-9a-z가-힣]+', ' ', 'g')), ' ', 1) AS first_token
+    )
+    SELECT
+        p.id,
+        p.title,
+        p.status,
+        p.keyword_id,
+        p.created_at,
+        p.updated_at,
+        ts_rank(p.search_vector, q.query) AS rank,
+        substr(p.content, GREATEST(strpos(lower(p.content), q.first_token) - 60, 1), 200) AS snippet
+    FROM posts p, q
+    WHERE p.search_vector @@ q.query
+      AND (p_status IS NULL OR p.status = p_status)
+    ORDER BY rank DESC, p.created_at DESC
+    LIMIT p_limit;
+$$;
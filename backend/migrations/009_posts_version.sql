@@ -0,0 +1,4 @@
+-- Optimistic concurrency for post edits
+-- Every write bumps version; updates are applied with WHERE version = <expected>.
+
+ALTER TABLE posts ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
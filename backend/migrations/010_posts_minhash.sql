@@ -0,0 +1,6 @@
+-- Near-duplicate detection
+-- MinHash signature of the post content (num_perm little-endian uint32 values).
+-- The API keeps the signatures in an in-memory LSH index, loaded at startup;
+-- rows without a signature are backfilled by the API on load.
+
+ALTER TABLE posts ADD COLUMN minhash_signature BYTEA;
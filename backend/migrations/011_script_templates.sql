@@ -0,0 +1,19 @@
+-- Script templates
+-- Per-subject title/body templates with {{ field }} placeholders.
+-- version is bumped on every edit; the API caches compiled templates by (id, version).
+
+CREATE TABLE script_templates (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name VARCHAR(100) NOT NULL,
+    subject_id UUID REFERENCES subjects(id) ON DELETE SET NULL,
+    title_template VARCHAR(500) NOT NULL,
+    body_template TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_script_templates_subject_id ON script_templates(subject_id);
+
+CREATE TRIGGER update_script_templates_updated_at BEFORE UPDATE ON script_templates
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
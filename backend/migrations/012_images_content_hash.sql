@@ -0,0 +1,80 @@
+-- Content-addressed image storage
+-- Uploaded files are stored under their SHA-256 (see image/storage.py); one images row per content.
+-- Images created from external URLs have no content_hash.
+
+ALTER TABLE images ADD COLUMN content_hash CHAR(64);
+
+-- Uploaded file URLs end with /<sha256>.<ext>
+UPDATE images
+SET content_hash = substring(url from '/([0-9a-f]{64})\.[a-z0-9]+$')
+WHERE content_hash IS NULL;
+
+-- Merge duplicate uploads into the oldest row of each hash
+CREATE TEMP TABLE image_duplicates AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (PARTITION BY content_hash ORDER BY created_at, id) AS keep_id
+    FROM images
+    WHERE content_hash IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+INSERT INTO post_images (post_id, image_id, display_order, created_at)
+SELECT pi.post_id, d.keep_id, MIN(pi.display_order), MIN(pi.created_at)
+FROM post_images pi
+JOIN image_duplicates d ON d.id = pi.image_id
+GROUP BY pi.post_id, d.keep_id
+ON CONFLICT (post_id, image_id) DO NOTHING;
+
+-- Cascades to the old post_images links
+DELETE FROM images USING image_duplicates d WHERE images.id = d.id;
+
+DROP TABLE image_duplicates;
+
+CREATE UNIQUE INDEX idx_images_content_hash ON images(content_hash);
+
+-- Images whose last post_images link was deleted; drained by the API's image GC
+CREATE TABLE image_gc_queue (
+    image_id UUID PRIMARY KEY,
+    queued_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX idx_image_gc_queue_queued_at ON image_gc_queue(queued_at);
+
+CREATE OR REPLACE FUNCTION queue_orphaned_images()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO image_gc_queue (image_id)
+    SELECT DISTINCT o.image_id
+    FROM old_rows o
+    WHERE EXISTS (SELECT 1 FROM images i WHERE i.id = o.image_id AND i.content_hash IS NOT NULL)
+      AND NOT EXISTS (SELECT 1 FROM post_images pi WHERE pi.image_id = o.image_id)
+    ON CONFLICT (image_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER queue_orphaned_images AFTER DELETE ON post_images
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION queue_orphaned_images();
+
+-- Takes up to p_limit queued images and deletes those that are still unreferenced.
+-- Images re-attached to a post since being queued are just dropped from the queue.
+-- Returns the deleted rows so the caller can remove their files.
+CREATE OR REPLACE FUNCTION collect_orphaned_images(p_limit INTEGER)
+RETURNS TABLE (id UUID, content_hash CHAR(64), mime_type VARCHAR) AS $$
+    WITH batch AS (
+        DELETE FROM image_gc_queue q
+        WHERE q.image_id IN (
+            SELECT image_id FROM image_gc_queue ORDER BY queued_at LIMIT p_limit FOR UPDATE SKIP LOCKED
+        )
+        RETURNING q.image_id
+    )
+    DELETE FROM images i
+    USING batch b
+    WHERE i.id = b.image_id
+      AND NOT EXISTS (SELECT 1 FROM post_images pi WHERE pi.image_id = i.id)
+    RETURNING i.id, i.content_hash, i.mime_type;
+$$ LANGUAGE sql;
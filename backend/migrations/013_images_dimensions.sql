@@ -0,0 +1,25 @@
+-- Image dimensions read from file headers (see image/metadata.py)
+-- Filled on upload; existing uploads are backfilled through POST /api/images/dimensions/backfill.
+
+ALTER TABLE images ADD COLUMN width INTEGER;
+ALTER TABLE images ADD COLUMN height INTEGER;
+
+-- Backfill scans uploaded images that are still missing dimensions
+CREATE INDEX idx_images_missing_dimensions ON images(id)
+    WHERE content_hash IS NOT NULL AND width IS NULL;
+
+-- Sets dimensions for many images in one call.
+-- p_dimensions: [{"id": ..., "width": ..., "height": ...}, ...]
+CREATE OR REPLACE FUNCTION set_image_dimensions(p_dimensions JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE images i
+        SET width = d.width, height = d.height, updated_at = NOW()
+        FROM jsonb_to_recordset(p_dimensions) AS d(id UUID, width INTEGER, height INTEGER)
+        WHERE i.id = d.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
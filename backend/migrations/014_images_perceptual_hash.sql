@@ -0,0 +1,20 @@
+-- Perceptual (difference) hash for near-duplicate image detection (see image/similarity.py)
+-- The 64-bit hash is stored as a signed BIGINT; the similarity index itself lives in the API process.
+
+ALTER TABLE images ADD COLUMN perceptual_hash BIGINT;
+
+-- Sets perceptual hashes for many images in one call.
+-- p_hashes: [{"id": ..., "perceptual_hash": ...}, ...]
+CREATE OR REPLACE FUNCTION set_image_perceptual_hashes(p_hashes JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE images i
+        SET perceptual_hash = h.perceptual_hash, updated_at = NOW()
+        FROM jsonb_to_recordset(p_hashes) AS h(id UUID, perceptual_hash BIGINT)
+        WHERE i.id = h.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
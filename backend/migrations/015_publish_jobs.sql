@@ -0,0 +1,63 @@
+-- Durable Naver publish queue (see upload/publish_queue.py)
+-- Jobs are claimed with a lease; a running job whose lease expired (worker crashed or restarted)
+-- is claimed again. Jobs that exhaust their attempts are kept in the 'dead' state for inspection.
+
+CREATE TYPE publish_job_status AS ENUM ('queued', 'running', 'succeeded', 'dead');
+
+CREATE TABLE publish_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    post_id UUID NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+    blog_account_id UUID REFERENCES blog_accounts(id) ON DELETE SET NULL,
+    status publish_job_status NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    published_url TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- At most one queued/running job per post
+CREATE UNIQUE INDEX idx_publish_jobs_active_post ON publish_jobs(post_id) WHERE status IN ('queued', 'running');
+CREATE INDEX idx_publish_jobs_queued_run_at ON publish_jobs(run_at) WHERE status = 'queued';
+CREATE INDEX idx_publish_jobs_running_locked_until ON publish_jobs(locked_until) WHERE status = 'running';
+CREATE INDEX idx_publish_jobs_created_at_id ON publish_jobs(created_at DESC, id DESC);
+
+CREATE TRIGGER update_publish_jobs_updated_at BEFORE UPDATE ON publish_jobs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Claims up to p_limit due jobs for p_lease_seconds and counts the attempt.
+CREATE OR REPLACE FUNCTION claim_publish_jobs(p_limit INTEGER, p_lease_seconds INTEGER)
+RETURNS SETOF publish_jobs
+LANGUAGE sql
+AS $$
+    UPDATE publish_jobs j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        locked_until = NOW() + make_interval(secs => p_lease_seconds)
+    WHERE j.id IN (
+        SELECT id FROM publish_jobs
+        WHERE (status = 'queued' AND run_at <= NOW())
+           OR (status = 'running' AND locked_until < NOW())
+        ORDER BY run_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+$$;
+
+-- Marks the job succeeded and the post published in one transaction.
+CREATE OR REPLACE FUNCTION complete_publish_job(p_job_id UUID, p_published_url TEXT)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE publish_jobs
+    SET status = 'succeeded', published_url = p_published_url, locked_until = NULL, last_error = NULL
+    WHERE id = p_job_id;
+
+    UPDATE posts
+    SET status = 'published'
+    WHERE id = (SELECT post_id FROM publish_jobs WHERE id = p_job_id);
+$$;
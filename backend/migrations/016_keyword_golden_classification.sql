@@ -0,0 +1,48 @@
+-- Classify subject keywords against the stored golden criteria on every write
+-- Band-only re-classification (PUT /api/keywords/golden/criteria) assumes every row's is_golden
+-- matches the stored criteria. Bulk upserts, creates and the expansion pipeline write rows directly,
+-- so the classification is done here instead of in each code path.
+-- Keywords without a subject are never classified (same scope as the re-classification queries).
+
+-- The stored row is the single source of truth from now on (defaults match the GOLDEN_* settings)
+INSERT INTO golden_criteria (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION classify_golden_keyword()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    criteria golden_criteria%ROWTYPE;
+BEGIN
+    IF NEW.subject_id IS NULL THEN
+        RETURN NEW;
+    END IF;
+    SELECT * INTO criteria FROM golden_criteria WHERE id = 1;
+    IF NOT FOUND THEN
+        RETURN NEW;
+    END IF;
+
+    -- Same conditions as keyword/golden.py compute_golden_mask; opportunity_score is a generated
+    -- column and is not available yet in a BEFORE trigger, so the ratio is computed inline
+    NEW.is_golden :=
+        COALESCE(NEW.search_volume, 0) >= criteria.min_search_volume
+        AND COALESCE(NEW.document_count, 0) <= criteria.max_document_count
+        AND COALESCE(NEW.view_count, 0) >= criteria.min_view_count
+        AND COALESCE(NEW.search_volume, 0)::DOUBLE PRECISION / GREATEST(COALESCE(NEW.document_count, 0), 1)
+            >= criteria.min_search_document_ratio;
+    IF NEW.is_golden THEN
+        NEW.type := 'golden';
+    ELSIF NEW.type = 'golden' THEN
+        NEW.type := 'related';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER classify_golden_keyword
+    BEFORE INSERT OR UPDATE OF search_volume, view_count, document_count, subject_id, type, is_golden
+    ON keywords
+    FOR EACH ROW EXECUTE FUNCTION classify_golden_keyword();
+
+-- Repair rows that drifted from the stored criteria (the trigger recomputes them)
+UPDATE keywords SET is_golden = is_golden WHERE subject_id IS NOT NULL;
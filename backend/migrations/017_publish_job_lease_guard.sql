@@ -0,0 +1,25 @@
+-- Only the worker that still holds a publish job's lease may finish it
+-- A job whose lease expired can be claimed again while the first worker is still publishing.
+-- complete_publish_job updated the row by id only, so a stale worker could overwrite the new
+-- attempt's state. Each claim increments attempts, so (status = 'running', attempts) identifies
+-- the current lease; a stale call now changes nothing and returns FALSE.
+
+DROP FUNCTION IF EXISTS complete_publish_job(UUID, TEXT);
+
+CREATE OR REPLACE FUNCTION complete_publish_job(p_job_id UUID, p_attempts INT, p_published_url TEXT)
+RETURNS BOOLEAN
+LANGUAGE sql
+AS $$
+    WITH completed AS (
+        UPDATE publish_jobs
+        SET status = 'succeeded', published_url = p_published_url, locked_until = NULL, last_error = NULL
+        WHERE id = p_job_id AND status = 'running' AND attempts = p_attempts
+        RETURNING post_id
+    ), published AS (
+        UPDATE posts
+        SET status = 'published'
+        WHERE id IN (SELECT post_id FROM completed)
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT 1 FROM completed);
+$$;
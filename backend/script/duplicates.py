@@ -0,0 +1,152 @@
+# Near-duplicate post detection with MinHash signatures and an LSH index
+
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from core.config import settings
+from utils.string_utils import normalize_search_text, remove_whitespace
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# 서명은 DB에 저장되므로 재시작 후에도 같은 해시 함수군을 쓰도록 시드를 고정합니다
+MINHASH_SEED = 20240601
+
+
+class MinHasher:
+    """문자 k-shingle 집합의 MinHash 서명을 계산합니다."""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = MINHASH_SEED):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        """공백을 제거한 정규화 문자열의 k-shingle 해시(32비트) 배열을 반환합니다."""
+        compact = remove_whitespace(normalize_search_text(text))
+        size = self.shingle_size
+        shingles = {compact[i:i + size] for i in range(max(len(compact) - size + 1, 1))}
+        return np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """본문의 MinHash 서명(uint32 배열)을 반환합니다."""
+        hashes = self.shingle_hashes(text)
+        # (num_perm, shingle 수) 행렬에서 순열별 최솟값을 한 번에 구합니다
+        permuted = ((np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME) & MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """서명을 PostgREST bytea 입력 형식(\\x16진수)으로 변환합니다."""
+    return "\\x" + signature.astype("<u4").tobytes().hex()
+
+
+def decode_signature(value: Optional[str], num_perm: int) -> Optional[np.ndarray]:
+    """저장된 bytea 값을 서명으로 변환합니다. 없거나 길이가 다르면 None을 반환합니다."""
+    if not value or not value.startswith("\\x"):
+        return None
+    signature = np.frombuffer(bytes.fromhex(value[2:]), dtype="<u4").astype(np.uint32)
+    return signature if len(signature) == num_perm else None
+
+
+class ScriptDuplicateIndex:
+    """MinHash 서명을 밴드로 나눠 버킷에 넣는 LSH 인덱스입니다.
+
+    어느 한 밴드라도 같은 버킷에 들어간 글만 후보로 비교하므로 전체 글과 비교하지 않습니다.
+    """
+
+    def __init__(self, hasher: MinHasher, bands: int):
+        if hasher.num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = hasher
+        self.bands = bands
+        self.rows_per_band = hasher.num_perm // bands
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def rebuild(self, signatures: List[Tuple[str, np.ndarray]]) -> None:
+        """(글 ID, 서명) 목록으로 인덱스를 새로 구축합니다."""
+        with self._lock:
+            self._reset()
+            for post_id, signature in signatures:
+                self._insert(str(post_id), signature)
+
+    def add(self, post_id: str, signature: np.ndarray) -> None:
+        """글의 서명을 추가하거나 교체합니다."""
+        with self._lock:
+            post_id = str(post_id)
+            self._delete(post_id)
+            self._insert(post_id, signature)
+
+    def remove(self, post_id: str) -> None:
+        """글을 인덱스에서 제거합니다."""
+        with self._lock:
+            self._delete(str(post_id))
+
+    def get(self, post_id: str) -> Optional[np.ndarray]:
+        return self._signatures.get(str(post_id))
+
+    def query(
+        self,
+        signature: np.ndarray,
+        limit: int,
+        min_similarity: float = 0.0,
+        exclude_id: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """후보 글의 추정 Jaccard 유사도를 계산해 높은 순으로 (글 ID, 유사도) 목록을 반환합니다."""
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(exclude_id)
+            if not candidates:
+                return []
+            candidate_ids = list(candidates)
+            matrix = np.stack([self._signatures[post_id] for post_id in candidate_ids])
+        # 같은 위치의 최솟값이 일치하는 비율이 Jaccard 유사도의 추정치입니다
+        similarities = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind="stable")
+        return [
+            (candidate_ids[position], float(similarities[position]))
+            for position in order[:limit]
+            if similarities[position] >= min_similarity
+        ]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows_per_band
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def _insert(self, post_id: str, signature: np.ndarray) -> None:
+        self._signatures[post_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band][key].add(post_id)
+
+    def _delete(self, post_id: str) -> None:
+        signature = self._signatures.pop(post_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(post_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+
+script_duplicate_index = ScriptDuplicateIndex(
+    MinHasher(settings.SCRIPT_MINHASH_NUM_PERM, settings.SCRIPT_MINHASH_SHINGLE_SIZE),
+    bands=settings.SCRIPT_MINHASH_BANDS,
+)
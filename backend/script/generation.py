@@ -0,0 +1,43 @@
+# Streaming script generation over Server-Sent Events
+
+from typing import AsyncIterator, List
+from fastapi.concurrency import run_in_threadpool
+from core.exceptions import CustomException
+from core.logger import logger
+from core.sse import format_sse_event
+from .generator import ScriptGenerator
+from .schemas import ScriptCreate, ScriptGenerateRequest
+from .service import ScriptService
+
+
+async def stream_script_generation(
+    service: ScriptService,
+    generator: ScriptGenerator,
+    request: ScriptGenerateRequest
+) -> AsyncIterator[str]:
+    """생성되는 본문 조각을 SSE 이벤트로 바로 내보내고, 생성이 끝나면 글을 저장합니다.
+
+    이벤트 순서: start -> chunk (여러 번) -> done, 실패 시 error
+    """
+    title = request.title or generator.build_title(request.keyword)
+    yield format_sse_event("start", {"title": title, "keyword": request.keyword})
+
+    parts: List[str] = []
+    try:
+        async for chunk in generator.stream(request.keyword, title):
+            parts.append(chunk)
+            yield format_sse_event("chunk", {"index": len(parts) - 1, "text": chunk})
+        script = await run_in_threadpool(
+            service.create_script,
+            ScriptCreate(title=title, content="".join(parts), keyword_id=request.keyword_id),
+        )
+    except CustomException as e:
+        yield format_sse_event("error", {"detail": str(e)})
+        return
+    except Exception as e:
+        logger.error(f"Failed to generate script: {e}", exc_info=True)
+        yield format_sse_event("error", {"detail": "Failed to generate script"})
+        return
+
+    logger.info(f"Script generated: id={script.id}, chunks={len(parts)}")
+    yield format_sse_event("done", {"script": script.model_dump(mode="json")})
@@ -0,0 +1,69 @@
+# Script generator backends
+
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import AsyncIterator
+from core.config import settings
+
+FAKE_SECTION_TOPICS = ["개요", "선택 기준", "장점", "단점", "가격대", "추천 대상", "사용 팁", "자주 묻는 질문", "정리"]
+
+
+class ScriptGenerator(ABC):
+    """키워드로 블로그 글을 생성하는 생성기 인터페이스입니다. 본문을 생성되는 대로 조각 단위로 내보냅니다."""
+
+    def build_title(self, keyword: str) -> str:
+        """키워드로 기본 글 제목을 만듭니다."""
+        return f"{keyword} 총정리"
+
+    @abstractmethod
+    def stream(self, keyword: str, title: str) -> AsyncIterator[str]:
+        """글 본문을 생성하면서 조각 단위로 반환합니다."""
+
+
+class FakeScriptGenerator(ScriptGenerator):
+    """키워드 해시로 결정적인 본문을 만드는 로컬 생성기입니다. 조각 사이 지연을 흉내낼 수 있습니다."""
+
+    def __init__(self, chunk_delay_seconds: float = 0.0, paragraph_count: int = 8):
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.paragraph_count = paragraph_count
+
+    async def stream(self, keyword: str, title: str) -> AsyncIterator[str]:
+        seed = int.from_bytes(hashlib.sha256(keyword.encode("utf-8")).digest()[:4], "big")
+        yield f"# {title}\n\n"
+        for index in range(self.paragraph_count):
+            if self.chunk_delay_seconds > 0:
+                await asyncio.sleep(self.chunk_delay_seconds)
+            topic = FAKE_SECTION_TOPICS[(seed + index) % len(FAKE_SECTION_TOPICS)]
+            yield (
+                f"## {index + 1}. {keyword} {topic}\n\n"
+                f"{keyword}의 {topic}에 대해 알아보겠습니다. "
+                f"{keyword}을(를) 처음 접하는 분들도 이해할 수 있도록 핵심만 정리했습니다.\n\n"
+            )
+
+
+SCRIPT_GENERATOR_FACTORIES = {
+    "fake": lambda: FakeScriptGenerator(
+        chunk_delay_seconds=settings.SCRIPT_GENERATOR_FAKE_CHUNK_DELAY_MS / 1000,
+        paragraph_count=settings.SCRIPT_GENERATOR_FAKE_PARAGRAPH_COUNT,
+    ),
+}
+
+
+@lru_cache()
+def get_script_generator() -> ScriptGenerator:
+    """설정된 글 생성기 싱글톤 인스턴스를 반환합니다."""
+    factory = SCRIPT_GENERATOR_FACTORIES.get(settings.SCRIPT_GENERATOR_PROVIDER)
+    if factory is None:
+        raise ValueError(f"Unknown script generator provider: {settings.SCRIPT_GENERATOR_PROVIDER}")
+    return factory()
+
+
+def render_script(keyword: str, title: str) -> str:
+    """설정된 생성기로 본문 전체를 생성합니다. 프로세스 풀 작업자에서 호출되는 동기 진입점입니다."""
+    return asyncio.run(_collect_script(get_script_generator(), keyword, title))
+
+
+async def _collect_script(generator: ScriptGenerator, keyword: str, title: str) -> str:
+    return "".join([chunk async for chunk in generator.stream(keyword, title)])
@@ -0,0 +1,212 @@
+# Batch script generation jobs on a process pool
+
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from core.config import settings
+from core.exceptions import NotFoundException
+from core.logger import logger
+from .generator import get_script_generator, render_script
+from .schemas import ScriptCreate, ScriptJobItemResult, ScriptJobResponse, ScriptJobStatus
+from .service import ScriptService
+from .templates import CompiledScriptTemplate
+
+
+class ScriptJob:
+    """글 일괄 생성 작업 하나의 진행 상태입니다."""
+
+    def __init__(
+        self,
+        service: ScriptService,
+        keyword_ids: List[str],
+        template: Optional[CompiledScriptTemplate] = None
+    ):
+        self.id = uuid.uuid4().hex
+        self.service = service
+        self.keyword_ids = keyword_ids
+        self.template = template
+        self.status = ScriptJobStatus.QUEUED
+        self.results: List[ScriptJobItemResult] = []
+        self.completed_count = 0
+        self.failed_count = 0
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._started_clock: Optional[float] = None
+        self._finished_clock: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.completed_count + self.failed_count >= len(self.keyword_ids)
+
+    def mark_started(self) -> None:
+        if self.started_at is None:
+            self.status = ScriptJobStatus.RUNNING
+            self.started_at = datetime.now(timezone.utc)
+            self._started_clock = time.perf_counter()
+
+    def record(self, result: ScriptJobItemResult) -> None:
+        """키워드 하나의 처리 결과를 기록하고, 모두 끝나면 작업을 완료 상태로 바꿉니다."""
+        self.results.append(result)
+        if result.error is None:
+            self.completed_count += 1
+        else:
+            self.failed_count += 1
+        if self.is_finished:
+            self.finished_at = datetime.now(timezone.utc)
+            self._finished_clock = time.perf_counter()
+            self.status = ScriptJobStatus.COMPLETED if self.completed_count else ScriptJobStatus.FAILED
+
+    def to_response(self) -> ScriptJobResponse:
+        elapsed_seconds = 0.0
+        if self._started_clock is not None:
+            elapsed_seconds = (self._finished_clock or time.perf_counter()) - self._started_clock
+        return ScriptJobResponse(
+            id=self.id,
+            status=self.status,
+            total_count=len(self.keyword_ids),
+            completed_count=self.completed_count,
+            failed_count=self.failed_count,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            elapsed_ms=elapsed_seconds * 1000,
+            scripts_per_second=self.completed_count / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            results=list(self.results),
+        )
+
+
+WorkItem = Tuple[ScriptJob, str, Optional[Dict[str, str]]]
+
+
+class ScriptJobManager:
+    """크기 제한 큐로 글 생성 작업을 받아 프로세스 풀에서 병렬로 생성하고 draft 글로 저장합니다.
+
+    작업 상태는 API 프로세스 메모리에 보관하며 최근 history_size개까지만 유지합니다.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int, history_size: int):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, ScriptJob]" = OrderedDict()
+        self._queue: Optional["asyncio.Queue[WorkItem]"] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers: List[asyncio.Task] = []
+        self._feeders: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """프로세스 풀과 작업자 태스크를 시작합니다."""
+        if self._pool is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # 이벤트 루프와 백그라운드 스레드가 있는 프로세스를 fork하지 않도록 spawn을 사용합니다
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._workers = [
+            asyncio.create_task(self._run_worker(), name=f"script-job-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+        logger.info(f"Script job workers started: workers={self.max_workers}, queue_size={self.queue_size}")
+
+    async def shutdown(self) -> None:
+        """작업자 태스크를 멈추고 프로세스 풀을 종료합니다."""
+        for task in [*self._feeders, *self._workers]:
+            task.cancel()
+        await asyncio.gather(*self._feeders, *self._workers, return_exceptions=True)
+        self._workers = []
+        self._feeders = set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        logger.info("Script job workers stopped")
+
+    async def submit(
+        self,
+        service: ScriptService,
+        keyword_ids: List[str],
+        template_id: Optional[str] = None
+    ) -> ScriptJob:
+        """작업을 등록하고 바로 반환합니다. 키워드는 큐에 여유가 생기는 대로 백그라운드에서 투입됩니다.
+
+        template_id를 지정하면 템플릿을 작업 시작 전에 한 번만 컴파일해 모든 키워드에 재사용합니다.
+        """
+        template = None
+        if template_id is not None:
+            template = await asyncio.to_thread(service.get_compiled_template, template_id)
+            if template is None:
+                raise NotFoundException("Script template not found")
+        await self.start()
+        job = ScriptJob(service, keyword_ids, template)
+        self._remember(job)
+        keyword_contexts = await asyncio.to_thread(service.get_keyword_contexts, keyword_ids)
+        feeder = asyncio.create_task(self._feed(job, keyword_contexts))
+        self._feeders.add(feeder)
+        feeder.add_done_callback(self._feeders.discard)
+        logger.info(f"Script job submitted: id={job.id}, keywords={len(keyword_ids)}, template_id={template_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ScriptJob]:
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: ScriptJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            oldest_id = next((job_id for job_id, old in self._jobs.items() if old.is_finished), None)
+            if oldest_id is None:
+                break
+            del self._jobs[oldest_id]
+
+    async def _feed(self, job: ScriptJob, keyword_contexts: Dict[str, Dict[str, str]]) -> None:
+        for keyword_id in job.keyword_ids:
+            # 큐가 가득 차면 여기서 대기하므로 큰 작업도 메모리를 일정하게 사용합니다
+            await self._queue.put((job, keyword_id, keyword_contexts.get(keyword_id)))
+
+    async def _run_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        generator = get_script_generator()
+        while True:
+            job, keyword_id, keyword_context = await self._queue.get()
+            try:
+                job.mark_started()
+                if keyword_context is None:
+                    job.record(ScriptJobItemResult(keyword_id=keyword_id, error="Keyword not found"))
+                    continue
+                if job.template is not None:
+                    # 컴파일된 템플릿 렌더링은 문자열 치환뿐이라 프로세스 풀을 거치지 않습니다
+                    title, content = job.template.render(keyword_context)
+                else:
+                    title = generator.build_title(keyword_context["keyword"])
+                    content = await loop.run_in_executor(
+                        self._pool, render_script, keyword_context["keyword"], title
+                    )
+                script = await asyncio.to_thread(
+                    job.service.create_script,
+                    ScriptCreate(title=title, content=content, keyword_id=keyword_id),
+                )
+                job.record(ScriptJobItemResult(keyword_id=keyword_id, post_id=script.id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Script job item failed: job={job.id}, keyword_id={keyword_id}, error={e}")
+                job.record(ScriptJobItemResult(keyword_id=keyword_id, error=str(e)))
+            finally:
+                self._queue.task_done()
+
+
+@lru_cache()
+def get_script_job_manager() -> ScriptJobManager:
+    """글 일괄 생성 작업 관리자 싱글톤 인스턴스를 반환합니다."""
+    return ScriptJobManager(
+        max_workers=settings.SCRIPT_JOB_WORKERS or os.cpu_count() or 1,
+        queue_size=settings.SCRIPT_JOB_QUEUE_SIZE,
+        history_size=settings.SCRIPT_JOB_HISTORY_SIZE,
+    )
@@ -1,34 +1,226 @@
 # Script API router
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from core.logger import logger
+from core.models import PostStatus
 from core.exceptions import CustomException
-from .schemas import ScriptCreate, ScriptResponse, ScriptUpdate
+from core.pagination import set_next_cursor_header
+from core.sse import sse_response
+from .generation import stream_script_generation
+from .generator import ScriptGenerator, get_script_generator
+from .jobs import ScriptJobManager, get_script_job_manager
+from .schemas import (
+    ScriptCreate,
+    ScriptDuplicate,
+    ScriptDuplicateCheck,
+    ScriptGenerateRequest,
+    ScriptJobCreate,
+    ScriptJobResponse,
+    ScriptPatch,
+    ScriptResponse,
+    ScriptSearchResult,
+    ScriptTemplateCacheStats,
+    ScriptTemplateCreate,
+    ScriptTemplateRenderRequest,
+    ScriptTemplateRenderResponse,
+    ScriptTemplateResponse,
+    ScriptTemplateUpdate,
+    ScriptUpdate,
+)
 from .service import ScriptService, get_script_service
+from .templates import script_template_cache
 
 router = APIRouter(prefix="/api/scripts", tags=["scripts"])
 
 
 @router.get("/", response_model=List[ScriptResponse])
 def get_scripts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: ScriptService = Depends(get_script_service)
 ) -> List[ScriptResponse]:
     """스크립트 목록을 조회합니다."""
     try:
-        logger.info(f"Fetching scripts: skip={skip}, limit={limit}")
-        scripts = service.get_scripts(skip=skip, limit=limit)
+        logger.info(f"Fetching scripts: skip={skip}, limit={limit}, cursor={cursor}")
+        scripts = service.get_scripts(skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor_header(response, scripts, limit)
         return scripts
     except CustomException as e:
         logger.error(f"Error fetching scripts: {e}")
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/search", response_model=List[ScriptSearchResult])
+def search_scripts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[PostStatus] = None,
+    service: ScriptService = Depends(get_script_service)
+) -> List[ScriptSearchResult]:
+    """글 제목과 본문을 검색합니다."""
+    try:
+        return service.search_scripts(q, limit, status)
+    except CustomException as e:
+        logger.error(f"Error searching scripts: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/templates", response_model=List[ScriptTemplateResponse])
+def get_script_templates(
+    subject_id: Optional[str] = None,
+    service: ScriptService = Depends(get_script_service)
+) -> List[ScriptTemplateResponse]:
+    """글 템플릿 목록을 조회합니다."""
+    try:
+        return service.get_templates(subject_id)
+    except CustomException as e:
+        logger.error(f"Error fetching script templates: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/templates", response_model=ScriptTemplateResponse)
+def create_script_template(
+    template_data: ScriptTemplateCreate,
+    service: ScriptService = Depends(get_script_service)
+) -> ScriptTemplateResponse:
+    """글 템플릿을 생성합니다."""
+    try:
+        return service.create_template(template_data)
+    except CustomException as e:
+        logger.error(f"Error creating script template: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/templates/cache", response_model=ScriptTemplateCacheStats)
+def get_script_template_cache_stats() -> ScriptTemplateCacheStats:
+    """컴파일된 템플릿 캐시 통계를 조회합니다."""
+    return script_template_cache.stats()
+
+
+@router.get("/templates/{template_id}", response_model=ScriptTemplateResponse)
+def get_script_template(
+    template_id: str,
+    service: ScriptService = Depends(get_script_service)
+) -> ScriptTemplateResponse:
+    """특정 글 템플릿을 조회합니다."""
+    try:
+        template = service.get_template(template_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Script template not found")
+        return template
+    except CustomException as e:
+        logger.error(f"Error fetching script template: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.put("/templates/{template_id}", response_model=ScriptTemplateResponse)
+def update_script_template(
+    template_id: str,
+    template_data: ScriptTemplateUpdate,
+    service: ScriptService = Depends(get_script_service)
+) -> ScriptTemplateResponse:
+    """글 템플릿을 수정합니다. 수정할 때마다 버전이 올라갑니다."""
+    try:
+        template = service.update_template(template_id, template_data)
+        if not template:
+            raise HTTPException(status_code=404, detail="Script template not found")
+        return template
+    except CustomException as e:
+        logger.error(f"Error updating script template: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.delete("/templates/{template_id}")
+def delete_script_template(
+    template_id: str,
+    service: ScriptService = Depends(get_script_service)
+) -> dict[str, str]:
+    """글 템플릿을 삭제합니다."""
+    try:
+        if not service.delete_template(template_id):
+            raise HTTPException(status_code=404, detail="Script template not found")
+        return {"message": "Script template deleted successfully"}
+    except CustomException as e:
+        logger.error(f"Error deleting script template: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/templates/{template_id}/render", response_model=ScriptTemplateRenderResponse)
+def render_script_template(
+    template_id: str,
+    request: ScriptTemplateRenderRequest,
+    service: ScriptService = Depends(get_script_service)
+) -> ScriptTemplateRenderResponse:
+    """키워드 하나로 템플릿을 렌더링해 미리 봅니다."""
+    try:
+        rendered = service.render_template(template_id, request.keyword_id)
+        if not rendered:
+            raise HTTPException(status_code=404, detail="Script template not found")
+        return rendered
+    except CustomException as e:
+        logger.error(f"Error rendering script template: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/generate/stream")
+async def generate_script_stream(
+    request: ScriptGenerateRequest,
+    service: ScriptService = Depends(get_script_service),
+    generator: ScriptGenerator = Depends(get_script_generator)
+) -> StreamingResponse:
+    """키워드로 글을 생성하면서 본문을 SSE로 스트리밍하고, 완료되면 저장합니다."""
+    logger.info(f"Streaming script generation: keyword={request.keyword}")
+    return sse_response(stream_script_generation(service, generator, request))
+
+
+@router.post("/jobs", response_model=ScriptJobResponse, status_code=202)
+async def create_script_job(
+    job_data: ScriptJobCreate,
+    service: ScriptService = Depends(get_script_service),
+    manager: ScriptJobManager = Depends(get_script_job_manager)
+) -> ScriptJobResponse:
+    """키워드 목록으로 글 일괄 생성 작업을 등록합니다."""
+    try:
+        logger.info(f"Creating script job: keywords={len(job_data.keyword_ids)}")
+        job = await manager.submit(service, job_data.keyword_ids, job_data.template_id)
+        return job.to_response()
+    except CustomException as e:
+        logger.error(f"Error creating script job: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=ScriptJobResponse)
+def get_script_job(
+    job_id: str,
+    manager: ScriptJobManager = Depends(get_script_job_manager)
+) -> ScriptJobResponse:
+    """글 일괄 생성 작업의 진행 상태와 처리량을 조회합니다."""
+    job = manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Script job not found")
+    return job.to_response()
+
+
+@router.post("/duplicates", response_model=List[ScriptDuplicate])
+def check_duplicate_scripts(
+    check: ScriptDuplicateCheck,
+    service: ScriptService = Depends(get_script_service)
+) -> List[ScriptDuplicate]:
+    """저장 전 본문과 유사한 기존 글을 조회합니다."""
+    try:
+        return service.check_duplicates(check.content, check.limit)
+    except CustomException as e:
+        logger.error(f"Error checking duplicate scripts: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.get("/{script_id}", response_model=ScriptResponse)
 def get_script(
-    script_id: int,
+    script_id: str,
     service: ScriptService = Depends(get_script_service)
 ) -> ScriptResponse:
     """특정 스크립트를 조회합니다."""
@@ -58,9 +250,26 @@ def create_script(
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.get("/{script_id}/duplicates", response_model=List[ScriptDuplicate])
+def get_similar_scripts(
+    script_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    service: ScriptService = Depends(get_script_service)
+) -> List[ScriptDuplicate]:
+    """글과 유사한 기존 글을 조회합니다."""
+    try:
+        duplicates = service.find_similar_scripts(script_id, limit)
+        if duplicates is None:
+            raise HTTPException(status_code=404, detail="Script not found")
+        return duplicates
+    except CustomException as e:
+        logger.error(f"Error finding similar scripts: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.put("/{script_id}", response_model=ScriptResponse)
 def update_script(
-    script_id: int,
+    script_id: str,
     script_data: ScriptUpdate,
     service: ScriptService = Depends(get_script_service)
 ) -> ScriptResponse:
@@ -76,9 +285,27 @@ def update_script(
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.patch("/{script_id}", response_model=ScriptResponse)
+def patch_script(
+    script_id: str,
+    patch: ScriptPatch,
+    service: ScriptService = Depends(get_script_service)
+) -> ScriptResponse:
+    """기준 버전에 대한 편집 목록만 받아 글을 부분 수정합니다."""
+    try:
+        logger.info(f"Patching script: id={script_id}")
+        script = service.patch_script(script_id, patch)
+        if not script:
+            raise HTTPException(status_code=404, detail="Script not found")
+        return script
+    except CustomException as e:
+        logger.error(f"Error patching script: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.delete("/{script_id}")
 def delete_script(
-    script_id: int,
+    script_id: str,
     service: ScriptService = Depends(get_script_service)
 ) -> dict[str, str]:
     """스크립트를 삭제합니다."""
@@ -1,8 +1,11 @@
 # Script Pydantic schemas
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from enum import Enum
+from core.config import settings
+from core.models import PostStatus
 
 
 class ScriptBase(BaseModel):
@@ -12,19 +15,144 @@ class ScriptBase(BaseModel):
 
 
 class ScriptCreate(ScriptBase):
-    pass
+    keyword_id: Optional[str] = Field(None, description="글 생성에 사용한 키워드 ID")
 
 
 class ScriptUpdate(BaseModel):
     title: Optional[str] = Field(None, description="스크립트 제목", min_length=1, max_length=200)
     content: Optional[str] = Field(None, description="스크립트 내용", min_length=1)
     description: Optional[str] = Field(None, description="스크립트 설명", max_length=1000)
+    version: Optional[int] = Field(None, description="수정 기준 버전 (지정하면 버전이 다를 때 409)", ge=1)
+
+
+class ScriptContentEdit(BaseModel):
+    start: int = Field(..., description="바꿀 구간 시작 위치 (코드 포인트 기준)", ge=0)
+    end: int = Field(..., description="바꿀 구간 끝 위치 (포함하지 않음)", ge=0)
+    text: str = Field("", description="구간을 대체할 문자열 (비우면 삭제)")
+
+
+class ScriptPatch(BaseModel):
+    version: int = Field(..., description="편집 기준 버전", ge=1)
+    edits: List[ScriptContentEdit] = Field(
+        default_factory=list, description="기준 버전 본문에 대한 편집 목록", max_length=settings.SCRIPT_PATCH_MAX_EDITS
+    )
+    title: Optional[str] = Field(None, description="스크립트 제목", min_length=1, max_length=200)
 
 
 class ScriptResponse(ScriptBase):
-    id: int
+    id: str
+    keyword_id: Optional[str] = None
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class ScriptGenerateRequest(BaseModel):
+    keyword: str = Field(..., description="글 생성 키워드", min_length=1, max_length=100)
+    keyword_id: Optional[str] = Field(None, description="키워드 ID")
+    title: Optional[str] = Field(None, description="글 제목 (생략 시 키워드로 생성)", min_length=1, max_length=200)
+
+
+class ScriptJobCreate(BaseModel):
+    keyword_ids: List[str] = Field(
+        ..., description="글을 생성할 키워드 ID 목록", min_length=1, max_length=settings.SCRIPT_JOB_MAX_KEYWORDS
+    )
+    template_id: Optional[str] = Field(None, description="글 템플릿 ID (생략 시 글 생성기 사용)")
+
+
+class ScriptJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ScriptJobItemResult(BaseModel):
+    keyword_id: str
+    post_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ScriptJobResponse(BaseModel):
+    id: str
+    status: ScriptJobStatus
+    total_count: int = Field(..., description="요청한 키워드 수")
+    completed_count: int = Field(..., description="글 생성과 저장을 마친 수")
+    failed_count: int = Field(..., description="실패한 수")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_ms: float = Field(..., description="첫 작업 시작 이후 경과 시간 (ms)")
+    scripts_per_second: float = Field(..., description="초당 생성한 글 수")
+    results: List[ScriptJobItemResult] = Field(default_factory=list, description="처리가 끝난 키워드별 결과")
+
+
+class ScriptSearchResult(BaseModel):
+    id: str
+    title: str
+    status: PostStatus
+    keyword_id: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    rank: float = Field(..., description="검색 점수 (제목 일치에 가중치)")
+    snippet: str = Field(..., description="첫 검색어 주변 본문 발췌")
+
+
+class ScriptDuplicateCheck(BaseModel):
+    content: str = Field(..., description="유사 글을 찾을 본문", min_length=1)
+    limit: int = Field(10, description="최대 결과 수", ge=1, le=100)
+
+
+class ScriptDuplicate(BaseModel):
+    id: str
+    similarity: float = Field(..., description="추정 Jaccard 유사도 (0~1)")
+
+
+class ScriptTemplateBase(BaseModel):
+    name: str = Field(..., description="템플릿 이름", min_length=1, max_length=100)
+    subject_id: Optional[str] = Field(None, description="템플릿을 사용하는 주제 ID")
+    title_template: str = Field(..., description="제목 템플릿 (예: {{ keyword }} 추천 총정리)", min_length=1, max_length=500)
+    body_template: str = Field(..., description="본문 템플릿", min_length=1)
+
+
+class ScriptTemplateCreate(ScriptTemplateBase):
+    pass
+
+
+class ScriptTemplateUpdate(BaseModel):
+    name: Optional[str] = Field(None, description="템플릿 이름", min_length=1, max_length=100)
+    subject_id: Optional[str] = Field(None, description="템플릿을 사용하는 주제 ID")
+    title_template: Optional[str] = Field(None, description="제목 템플릿", min_length=1, max_length=500)
+    body_template: Optional[str] = Field(None, description="본문 템플릿", min_length=1)
+
+
+class ScriptTemplateResponse(ScriptTemplateBase):
+    id: str
+    version: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class ScriptTemplateRenderRequest(BaseModel):
+    keyword_id: str = Field(..., description="템플릿에 채울 키워드 ID")
+
+
+class ScriptTemplateRenderResponse(BaseModel):
+    template_id: str
+    version: int
+    title: str
+    content: str
+
+
+class ScriptTemplateCacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    compiles: int = Field(..., description="템플릿 컴파일 횟수")
+    compile_ms: float = Field(..., description="컴파일에 쓴 누적 시간")
+    invalidations: int = Field(..., description="템플릿 수정/삭제로 제거한 항목 수")
@@ -1,10 +1,36 @@
 # Script business logic service
 
-from typing import List, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from core.config import settings
 from core.logger import logger
-from core.exceptions import CustomException
+from core.exceptions import ConflictException, CustomException, NotFoundException, ValidationException
 from core.database import get_db
-from .schemas import ScriptCreate, ScriptUpdate, ScriptResponse
+from core.pagination import paginate_query
+from core.models import PostStatus
+from utils.string_utils import apply_text_edits
+from .duplicates import decode_signature, encode_signature, script_duplicate_index
+from .schemas import (
+    ScriptCreate,
+    ScriptDuplicate,
+    ScriptPatch,
+    ScriptUpdate,
+    ScriptResponse,
+    ScriptSearchResult,
+    ScriptTemplateCreate,
+    ScriptTemplateRenderResponse,
+    ScriptTemplateResponse,
+    ScriptTemplateUpdate,
+)
+from .templates import CompiledScriptTemplate, script_template_cache
+
+# search_vector처럼 응답에 쓰지 않는 큰 열은 조회하지 않습니다
+POST_COLUMNS = "id,title,content,keyword_id,status,version,created_at,updated_at"
+TEMPLATE_TABLE = "script_templates"
+TEMPLATE_COLUMNS = "id,name,subject_id,title_template,body_template,version,created_at,updated_at"
+KEYWORD_CONTEXT_COLUMNS = "id,name,search_volume,view_count,document_count,subjects(name)"
 
 
 def get_script_service():
@@ -13,28 +39,65 @@ def get_script_service():
     return ScriptService(db=db)
 
 
+def build_keyword_context(row: Dict[str, Any]) -> Dict[str, str]:
+    """키워드 행을 템플릿과 생성기에 넘길 값으로 변환합니다. 지표는 천 단위 구분 기호를 붙입니다."""
+    subject = row.get("subjects") or {}
+    return {
+        "keyword": row["name"],
+        "subject": subject.get("name") or "",
+        "search_volume": f"{row.get('search_volume') or 0:,}",
+        "view_count": f"{row.get('view_count') or 0:,}",
+        "document_count": f"{row.get('document_count') or 0:,}",
+    }
+
+
+def _validate_template(title_template: str, body_template: str) -> None:
+    try:
+        CompiledScriptTemplate("", 0, title_template, body_template)
+    except ValueError as e:
+        raise ValidationException(str(e))
+
+
 class ScriptService:
     """스크립트 관련 비즈니스 로직을 처리합니다."""
     
     def __init__(self, db=None):
         self.db = db
     
-    def get_scripts(self, skip: int = 0, limit: int = 100) -> List[ScriptResponse]:
+    def get_scripts(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[ScriptResponse]:
         """스크립트 목록을 조회합니다."""
         try:
-            logger.info(f"Fetching scripts from database: skip={skip}, limit={limit}")
-            # TODO: 데이터베이스에서 스크립트 목록 조회 로직 구현
-            return []
+            logger.info(f"Fetching scripts from database: skip={skip}, limit={limit}, cursor={cursor}")
+            query = paginate_query(self.db.table("posts").select(POST_COLUMNS), skip=skip, limit=limit, cursor=cursor)
+            return [ScriptResponse.model_validate(row) for row in query.execute().data]
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch scripts: {e}", exc_info=True)
             raise CustomException("Failed to fetch scripts")
     
-    def get_script_by_id(self, script_id: int) -> Optional[ScriptResponse]:
+    def search_scripts(
+        self,
+        query: str,
+        limit: int = 20,
+        status: Optional[PostStatus] = None
+    ) -> List[ScriptSearchResult]:
+        """제목과 본문을 한글 bigram 색인으로 검색해 점수순으로 반환합니다."""
+        try:
+            logger.info(f"Searching scripts: query={query}, limit={limit}, status={status}")
+            params = {"p_query": query, "p_limit": limit, "p_status": status.value if status else None}
+            rows = self.db.rpc("search_posts", params).execute().data
+            return [ScriptSearchResult.model_validate(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to search scripts: {e}", exc_info=True)
+            raise CustomException("Failed to search scripts")
+    
+    def get_script_by_id(self, script_id: str) -> Optional[ScriptResponse]:
         """ID로 스크립트를 조회합니다."""
         try:
             logger.info(f"Fetching script by id: {script_id}")
-            # TODO: 데이터베이스에서 스크립트 조회 로직 구현
-            return None
+            row = self._fetch_post(script_id)
+            return ScriptResponse.model_validate(row) if row else None
         except Exception as e:
             logger.error(f"Failed to fetch script: {e}", exc_info=True)
             raise CustomException("Failed to fetch script")
@@ -43,28 +106,326 @@ class ScriptService:
         """새 스크립트를 생성합니다."""
         try:
             logger.info(f"Creating script: {script_data.title}")
-            # TODO: 데이터베이스에 스크립트 생성 로직 구현
-            raise NotImplementedError("Script creation not implemented")
+            # posts 테이블에는 description 열이 없습니다
+            values = script_data.model_dump(exclude={"description"})
+            signature = script_duplicate_index.hasher.signature(script_data.content)
+            values["minhash_signature"] = encode_signature(signature)
+            row = self.db.table("posts").insert(values).execute().data[0]
+            script_duplicate_index.add(row["id"], signature)
+            return ScriptResponse.model_validate(row)
         except Exception as e:
             logger.error(f"Failed to create script: {e}", exc_info=True)
             raise CustomException("Failed to create script")
     
-    def update_script(self, script_id: int, script_data: ScriptUpdate) -> Optional[ScriptResponse]:
+    def get_keyword_contexts(self, keyword_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """키워드 ID 목록의 글 생성용 값(이름, 주제, 지표)을 청크 단위로 조회합니다. 없는 ID는 결과에서 빠집니다."""
+        try:
+            contexts: Dict[str, Dict[str, str]] = {}
+            chunk_size = settings.DB_UPDATE_CHUNK_SIZE
+            for start in range(0, len(keyword_ids), chunk_size):
+                chunk = keyword_ids[start:start + chunk_size]
+                rows = self.db.table("keywords").select(KEYWORD_CONTEXT_COLUMNS).in_("id", chunk).execute().data
+                contexts.update({str(row["id"]): build_keyword_context(row) for row in rows})
+            return contexts
+        except Exception as e:
+            logger.error(f"Failed to fetch keyword contexts: {e}", exc_info=True)
+            raise CustomException("Failed to fetch keyword contexts")
+    
+    def update_script(self, script_id: str, script_data: ScriptUpdate) -> Optional[ScriptResponse]:
         """스크립트를 업데이트합니다."""
         try:
             logger.info(f"Updating script: id={script_id}")
-            # TODO: 데이터베이스에서 스크립트 업데이트 로직 구현
-            return None
+            # posts 테이블에는 description 열이 없습니다
+            values = script_data.model_dump(exclude_unset=True, exclude={"description", "version"})
+            row = self._fetch_post(script_id, "id,version")
+            if not row:
+                return None
+            if script_data.version is not None and script_data.version != row["version"]:
+                raise ConflictException(f"Script version conflict: current version is {row['version']}")
+            if not values:
+                return self.get_script_by_id(script_id)
+            return self._write_versioned(script_id, row["version"], values)
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to update script: {e}", exc_info=True)
             raise CustomException("Failed to update script")
     
-    def delete_script(self, script_id: int) -> bool:
+    def patch_script(self, script_id: str, patch: ScriptPatch) -> Optional[ScriptResponse]:
+        """기준 버전 본문에 편집 목록을 적용하고 버전을 올립니다. 버전이 다르면 ConflictException을 발생시킵니다."""
+        try:
+            logger.info(f"Patching script: id={script_id}, version={patch.version}, edits={len(patch.edits)}")
+            row = self._fetch_post(script_id, "id,content,version")
+            if not row:
+                return None
+            if row["version"] != patch.version:
+                raise ConflictException(f"Script version conflict: current version is {row['version']}")
+            
+            values: Dict[str, Any] = {}
+            if patch.edits:
+                try:
+                    content = apply_text_edits(row["content"], [(edit.start, edit.end, edit.text) for edit in patch.edits])
+                except ValueError as e:
+                    raise ValidationException(str(e))
+                if not content.strip():
+                    raise ValidationException("Script content cannot be empty")
+                values["content"] = content
+            if patch.title is not None:
+                values["title"] = patch.title
+            if not values:
+                return self.get_script_by_id(script_id)
+            return self._write_versioned(script_id, patch.version, values)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to patch script: {e}", exc_info=True)
+            raise CustomException("Failed to patch script")
+    
+    def delete_script(self, script_id: str) -> bool:
         """스크립트를 삭제합니다."""
         try:
             logger.info(f"Deleting script: id={script_id}")
-            # TODO: 데이터베이스에서 스크립트 삭제 로직 구현
-            return False
+            rows = self.db.table("posts").delete().eq("id", script_id).execute().data
+            if not rows:
+                return False
+            script_duplicate_index.remove(script_id)
+            return True
         except Exception as e:
             logger.error(f"Failed to delete script: {e}", exc_info=True)
             raise CustomException("Failed to delete script")
+    
+    def find_similar_scripts(self, script_id: str, limit: int = 10) -> Optional[List[ScriptDuplicate]]:
+        """글과 유사한 기존 글을 추정 Jaccard 유사도 순으로 조회합니다. 글이 없으면 None을 반환합니다."""
+        try:
+            logger.info(f"Finding similar scripts: id={script_id}, limit={limit}")
+            signature = script_duplicate_index.get(script_id)
+            if signature is None:
+                row = self._fetch_post(script_id, "id,content")
+                if not row:
+                    return None
+                signature = script_duplicate_index.hasher.signature(row["content"])
+            return self._query_duplicates(signature, limit, exclude_id=script_id)
+        except Exception as e:
+            logger.error(f"Failed to find similar scripts: {e}", exc_info=True)
+            raise CustomException("Failed to find similar scripts")
+    
+    def check_duplicates(self, content: str, limit: int = 10) -> List[ScriptDuplicate]:
+        """저장 전 본문과 유사한 기존 글을 추정 Jaccard 유사도 순으로 조회합니다."""
+        try:
+            logger.info(f"Checking duplicate scripts: length={len(content)}, limit={limit}")
+            return self._query_duplicates(script_duplicate_index.hasher.signature(content), limit)
+        except Exception as e:
+            logger.error(f"Failed to check duplicate scripts: {e}", exc_info=True)
+            raise CustomException("Failed to check duplicate scripts")
+    
+    def rebuild_duplicate_index(self) -> int:
+        """저장된 MinHash 서명으로 유사 글 인덱스를 다시 구축하고 색인된 글 수를 반환합니다.
+        
+        서명이 없거나 설정이 바뀌어 길이가 다른 글은 본문으로 다시 계산해 저장합니다.
+        """
+        try:
+            logger.info("Building script duplicate index")
+            started_at = time.perf_counter()
+            num_perm = script_duplicate_index.hasher.num_perm
+            rows = self._fetch_all_rows(lambda: self.db.table("posts").select("id,minhash_signature").order("id"))
+            signatures = []
+            missing_ids = []
+            for row in rows:
+                signature = decode_signature(row.get("minhash_signature"), num_perm)
+                if signature is None:
+                    missing_ids.append(row["id"])
+                else:
+                    signatures.append((row["id"], signature))
+            signatures.extend(self._backfill_signatures(missing_ids))
+            script_duplicate_index.rebuild(signatures)
+            logger.info(
+                f"Script duplicate index built: posts={len(script_duplicate_index)}, backfilled={len(missing_ids)}, "
+                f"elapsed_ms={(time.perf_counter() - started_at) * 1000:.1f}"
+            )
+            return len(script_duplicate_index)
+        except Exception as e:
+            logger.error(f"Failed to build script duplicate index: {e}", exc_info=True)
+            raise CustomException("Failed to build script duplicate index")
+    
+    def get_templates(self, subject_id: Optional[str] = None) -> List[ScriptTemplateResponse]:
+        """글 템플릿 목록을 조회합니다."""
+        try:
+            logger.info(f"Fetching script templates: subject_id={subject_id}")
+            query = self.db.table(TEMPLATE_TABLE).select(TEMPLATE_COLUMNS)
+            if subject_id:
+                query = query.eq("subject_id", subject_id)
+            return [ScriptTemplateResponse.model_validate(row) for row in query.order("name").execute().data]
+        except Exception as e:
+            logger.error(f"Failed to fetch script templates: {e}", exc_info=True)
+            raise CustomException("Failed to fetch script templates")
+    
+    def get_template(self, template_id: str) -> Optional[ScriptTemplateResponse]:
+        """ID로 글 템플릿을 조회합니다."""
+        try:
+            row = self._fetch_template(template_id)
+            return ScriptTemplateResponse.model_validate(row) if row else None
+        except Exception as e:
+            logger.error(f"Failed to fetch script template: {e}", exc_info=True)
+            raise CustomException("Failed to fetch script template")
+    
+    def create_template(self, template_data: ScriptTemplateCreate) -> ScriptTemplateResponse:
+        """글 템플릿을 생성합니다. 자리표시자가 잘못되었으면 ValidationException을 발생시킵니다."""
+        try:
+            logger.info(f"Creating script template: {template_data.name}")
+            _validate_template(template_data.title_template, template_data.body_template)
+            row = self.db.table(TEMPLATE_TABLE).insert(template_data.model_dump()).execute().data[0]
+            return ScriptTemplateResponse.model_validate(row)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to create script template: {e}", exc_info=True)
+            raise CustomException("Failed to create script template")
+    
+    def update_template(self, template_id: str, template_data: ScriptTemplateUpdate) -> Optional[ScriptTemplateResponse]:
+        """글 템플릿을 수정하고 버전을 올린 뒤 이전 버전의 컴파일 결과를 캐시에서 제거합니다."""
+        try:
+            logger.info(f"Updating script template: id={template_id}")
+            row = self._fetch_template(template_id)
+            if not row:
+                return None
+            values = template_data.model_dump(exclude_unset=True)
+            if not values:
+                return ScriptTemplateResponse.model_validate(row)
+            _validate_template(
+                values.get("title_template", row["title_template"]), values.get("body_template", row["body_template"])
+            )
+            rows = (
+                self.db.table(TEMPLATE_TABLE)
+                .update({**values, "version": row["version"] + 1})
+                .eq("id", template_id)
+                .eq("version", row["version"])
+                .execute()
+                .data
+            )
+            if not rows:
+                raise ConflictException("Script template was modified by another request")
+            script_template_cache.invalidate(template_id)
+            return ScriptTemplateResponse.model_validate(rows[0])
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to update script template: {e}", exc_info=True)
+            raise CustomException("Failed to update script template")
+    
+    def delete_template(self, template_id: str) -> bool:
+        """글 템플릿을 삭제합니다."""
+        try:
+            logger.info(f"Deleting script template: id={template_id}")
+            rows = self.db.table(TEMPLATE_TABLE).delete().eq("id", template_id).execute().data
+            script_template_cache.invalidate(template_id)
+            return bool(rows)
+        except Exception as e:
+            logger.error(f"Failed to delete script template: {e}", exc_info=True)
+            raise CustomException("Failed to delete script template")
+    
+    def get_compiled_template(self, template_id: str) -> Optional[CompiledScriptTemplate]:
+        """템플릿의 현재 버전을 컴파일 캐시에서 가져옵니다. 캐시에 없을 때만 파싱합니다."""
+        try:
+            row = self._fetch_template(template_id)
+            return script_template_cache.get_or_compile(row) if row else None
+        except Exception as e:
+            logger.error(f"Failed to load script template: {e}", exc_info=True)
+            raise CustomException("Failed to load script template")
+    
+    def render_template(self, template_id: str, keyword_id: str) -> Optional[ScriptTemplateRenderResponse]:
+        """키워드 하나로 템플릿을 렌더링해 미리 봅니다. 글은 저장하지 않습니다."""
+        try:
+            logger.info(f"Rendering script template: id={template_id}, keyword_id={keyword_id}")
+            template = self.get_compiled_template(template_id)
+            if template is None:
+                return None
+            context = self.get_keyword_contexts([keyword_id]).get(keyword_id)
+            if context is None:
+                raise NotFoundException("Keyword not found")
+            title, content = template.render(context)
+            return ScriptTemplateRenderResponse(
+                template_id=template.template_id, version=template.version, title=title, content=content
+            )
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to render script template: {e}", exc_info=True)
+            raise CustomException("Failed to render script template")
+    
+    def _fetch_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.table(TEMPLATE_TABLE).select(TEMPLATE_COLUMNS).eq("id", template_id).limit(1).execute().data
+        return rows[0] if rows else None
+    
+    def _query_duplicates(
+        self,
+        signature: np.ndarray,
+        limit: int,
+        exclude_id: Optional[str] = None
+    ) -> List[ScriptDuplicate]:
+        matches = script_duplicate_index.query(
+            signature, limit, min_similarity=settings.SCRIPT_DUPLICATE_MIN_SIMILARITY, exclude_id=exclude_id
+        )
+        return [ScriptDuplicate(id=post_id, similarity=similarity) for post_id, similarity in matches]
+    
+    def _backfill_signatures(self, post_ids: List[str]) -> List[Tuple[str, np.ndarray]]:
+        """서명이 없는 글의 서명을 본문으로 계산해 저장합니다."""
+        signatures = []
+        chunk_size = settings.DB_UPDATE_CHUNK_SIZE
+        for start in range(0, len(post_ids), chunk_size):
+            chunk = post_ids[start:start + chunk_size]
+            rows = self.db.table("posts").select("id,content").in_("id", chunk).execute().data
+            for row in rows:
+                signature = script_duplicate_index.hasher.signature(row["content"])
+                self.db.table("posts").update({"minhash_signature": encode_signature(signature)}).eq(
+                    "id", row["id"]
+                ).execute()
+                signatures.append((row["id"], signature))
+        return signatures
+    
+    def _fetch_all_rows(self, build_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+        """range 페이지 단위로 나누어 쿼리 결과 전체를 조회합니다."""
+        rows: List[Dict[str, Any]] = []
+        page_size = settings.DB_FETCH_PAGE_SIZE
+        start = 0
+        while True:
+            page = build_query().range(start, start + page_size - 1).execute().data
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            start += page_size
+    
+    def _fetch_post(self, script_id: str, columns: str = POST_COLUMNS) -> Optional[Dict[str, Any]]:
+        rows = self.db.table("posts").select(columns).eq("id", script_id).limit(1).execute().data
+        return rows[0] if rows else None
+    
+    def _write_versioned(self, script_id: str, expected_version: int, values: Dict[str, Any]) -> ScriptResponse:
+        """버전이 expected_version일 때만 기록하고 버전을 올립니다. 그 사이 다른 수정이 있었으면 ConflictException."""
+        signature = None
+        if "content" in values:
+            signature = script_duplicate_index.hasher.signature(values["content"])
+            values = {**values, "minhash_signature": encode_signature(signature)}
+        rows = (
+            self.db.table("posts")
+            .update({**values, "version": expected_version + 1})
+            .eq("id", script_id)
+            .eq("version", expected_version)
+            .execute()
+            .data
+        )
+        if not rows:
+            raise ConflictException("Script was modified by another request")
+        if signature is not None:
+            script_duplicate_index.add(script_id, signature)
+        return ScriptResponse.model_validate(rows[0])
+
+
+def load_script_duplicate_index() -> None:
+    """서버 기동을 막지 않도록 유사 글 인덱스를 백그라운드 스레드에서 구축합니다."""
+    threading.Thread(target=_rebuild_script_duplicate_index, name="script-duplicate-index", daemon=True).start()
+
+
+def _rebuild_script_duplicate_index() -> None:
+    try:
+        get_script_service().rebuild_duplicate_index()
+    except Exception as e:
+        logger.error(f"Script duplicate index was not loaded: {e}")
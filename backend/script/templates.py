@@ -0,0 +1,118 @@
+# Compiled script templates and cache
+
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+from core.cache import LRUCache
+from core.config import settings
+from .schemas import ScriptTemplateCacheStats
+
+# 템플릿에서 사용할 수 있는 값. title은 제목을 먼저 렌더링한 뒤 본문에서만 사용할 수 있습니다
+TITLE_TEMPLATE_FIELDS = frozenset({"keyword", "subject", "search_volume", "view_count", "document_count"})
+BODY_TEMPLATE_FIELDS = TITLE_TEMPLATE_FIELDS | {"title"}
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def compile_template_source(source: str, fields: frozenset) -> str:
+    """`{{ 필드 }}` 자리표시자를 str.format 형식 문자열로 변환합니다.
+
+    리터럴 중괄호는 이스케이프하므로 렌더링은 format_map 한 번으로 끝납니다.
+    알 수 없는 필드나 닫히지 않은 자리표시자가 있으면 ValueError를 발생시킵니다.
+    """
+    parts = []
+    cursor = 0
+    for match in PLACEHOLDER_PATTERN.finditer(source):
+        parts.append(_escape_literal(source[cursor:match.start()]))
+        field = match.group(1)
+        if field not in fields:
+            raise ValueError(f"Unknown template field: {field}")
+        parts.append("{" + field + "}")
+        cursor = match.end()
+    parts.append(_escape_literal(source[cursor:]))
+    return "".join(parts)
+
+
+def _escape_literal(text: str) -> str:
+    if "{{" in text or "}}" in text:
+        raise ValueError(f"Malformed template placeholder near: {text[:50]}")
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class CompiledScriptTemplate:
+    """파싱이 끝난 글 템플릿입니다. 프로세스 간에 그대로 전달할 수 있습니다."""
+
+    __slots__ = ("template_id", "version", "title_format", "body_format")
+
+    def __init__(self, template_id: str, version: int, title_template: str, body_template: str):
+        self.template_id = template_id
+        self.version = version
+        self.title_format = compile_template_source(title_template, TITLE_TEMPLATE_FIELDS)
+        self.body_format = compile_template_source(body_template, BODY_TEMPLATE_FIELDS)
+
+    def render(self, context: Mapping[str, Any]) -> Tuple[str, str]:
+        """키워드 정보로 (제목, 본문)을 렌더링합니다."""
+        title = self.title_format.format_map(context)
+        return title, self.body_format.format_map({**context, "title": title})
+
+
+class ScriptTemplateCache:
+    """컴파일된 템플릿을 (템플릿 ID, 버전) 키로 보관하는 LRU 캐시입니다.
+
+    템플릿이 수정되면 버전이 바뀌므로 이전 버전 항목은 다시 조회되지 않으며,
+    invalidate로 즉시 제거해 용량을 차지하지 않도록 합니다.
+    """
+
+    def __init__(self, max_size: int):
+        self.compiles = 0
+        self.compile_seconds = 0.0
+        self.invalidations = 0
+        self._cache = LRUCache(max_size)
+        # 템플릿별로 캐시에 올라가 있는 버전
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, row: Mapping[str, Any]) -> CompiledScriptTemplate:
+        """템플릿 행(id, version, title_template, body_template)의 컴파일 결과를 반환합니다."""
+        template_id = str(row["id"])
+        key = (template_id, row["version"])
+        compiled: Optional[CompiledScriptTemplate] = self._cache.get(key)
+        if compiled is not None:
+            return compiled
+
+        started_at = time.perf_counter()
+        compiled = CompiledScriptTemplate(template_id, row["version"], row["title_template"], row["body_template"])
+        with self._lock:
+            self.compiles += 1
+            self.compile_seconds += time.perf_counter() - started_at
+            previous_version = self._versions.get(template_id)
+            if previous_version is not None and previous_version != row["version"]:
+                self._cache.pop((template_id, previous_version))
+            self._versions[template_id] = row["version"]
+            self._cache.set(key, compiled)
+        return compiled
+
+    def invalidate(self, template_id: str) -> None:
+        """템플릿의 캐시 항목을 제거합니다."""
+        with self._lock:
+            version = self._versions.pop(str(template_id), None)
+            if version is not None and self._cache.pop((str(template_id), version)) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> ScriptTemplateCacheStats:
+        """캐시 적중/미스/제거와 컴파일 통계를 반환합니다."""
+        cache_stats = self._cache.stats()
+        return ScriptTemplateCacheStats(
+            size=cache_stats["size"],
+            max_size=cache_stats["max_size"],
+            hits=cache_stats["hits"],
+            misses=cache_stats["misses"],
+            evictions=cache_stats["evictions"],
+            compiles=self.compiles,
+            compile_ms=self.compile_seconds * 1000,
+            invalidations=self.invalidations,
+        )
+
+
+script_template_cache = ScriptTemplateCache(settings.SCRIPT_TEMPLATE_CACHE_SIZE)
@@ -0,0 +1,151 @@
+# Markdown to Naver blog HTML conversion with a two-level cache
+
+import html
+import json
+import re
+import threading
+import time
+from typing import Optional, Sequence, Tuple
+import markdown
+from core.cache import LRUCache
+from core.config import settings
+from core.disk_cache import DiskCache
+from core.logger import logger
+from utils.hash_utils import sha256_hex
+from .schemas import NaverHtmlCacheStats, PostImage
+
+# 변환 결과가 달라지도록 변환기를 고치면 올려서 이전 캐시를 쓰지 않게 합니다
+NAVER_HTML_CONVERTER_VERSION = 1
+# 네이버 에디터는 문단 안 줄바꿈을 그대로 보여주므로 nl2br로 유지합니다
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "nl2br"]
+LEADING_HEADING_PATTERN = re.compile(r"\A\s*#\s+(.+?)\s*(?:\n|\Z)")
+SECTION_HEADING_END_PATTERN = re.compile(r"</h2>")
+
+CacheSource = str
+CACHE_SOURCE_MEMORY = "memory"
+CACHE_SOURCE_DISK = "disk"
+CACHE_SOURCE_CONVERTED = "converted"
+
+
+def build_naver_html_cache_key(title: str, content: str, images: Sequence[PostImage]) -> str:
+    """변환기 버전, 제목, 본문, 표시 순서대로 정렬된 이미지 목록의 해시를 반환합니다."""
+    payload = json.dumps(
+        [NAVER_HTML_CONVERTER_VERSION, title, content, [[image.id, image.url] for image in images]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return sha256_hex(payload)
+
+
+def convert_markdown_to_naver_html(title: str, content: str, images: Sequence[PostImage]) -> str:
+    """글 본문 Markdown을 네이버 에디터에 붙여 넣을 HTML로 변환합니다.
+
+    제목은 별도 필드로 발행하므로 본문 첫 줄의 `# 제목`은 제거합니다.
+    이미지는 순서대로 각 `##` 소제목 바로 아래에 하나씩 넣고, 남는 이미지는 본문 끝에 붙입니다.
+    """
+    leading = LEADING_HEADING_PATTERN.match(content)
+    if leading and leading.group(1).strip() == title.strip():
+        content = content[leading.end():]
+    body = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, output_format="html").convert(content)
+
+    image_tags = [_image_tag(image) for image in images]
+    pending = iter(image_tags)
+    inserted = 0
+
+    def insert_after_heading(match: "re.Match[str]") -> str:
+        nonlocal inserted
+        image_tag = next(pending, None)
+        if image_tag is None:
+            return match.group(0)
+        inserted += 1
+        return match.group(0) + "\n" + image_tag
+
+    body = SECTION_HEADING_END_PATTERN.sub(insert_after_heading, body)
+    remaining = image_tags[inserted:]
+    return "\n".join([body, *remaining]) if remaining else body
+
+
+def _image_tag(image: PostImage) -> str:
+    return f'<p><img src="{html.escape(image.url, quote=True)}" alt=""></p>'
+
+
+class NaverHtmlCache:
+    """변환 결과를 메모리 LRU와 디스크에 함께 보관합니다.
+
+    키가 본문과 이미지 목록의 해시이므로 글이 바뀌면 자연히 새 키가 되고,
+    같은 글을 다시 미리보기하거나 발행을 재시도할 때는 변환 없이 결과를 돌려줍니다.
+    서버를 다시 시작해도 디스크 캐시는 유지됩니다.
+    """
+
+    def __init__(self, memory_size: int, directory: str):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.conversions = 0
+        self.conversion_seconds = 0.0
+        self._memory = LRUCache(memory_size)
+        self._disk = DiskCache(directory, suffix=".html")
+        self._lock = threading.Lock()
+
+    def get_or_convert(
+        self,
+        title: str,
+        content: str,
+        images: Sequence[PostImage]
+    ) -> Tuple[str, str, CacheSource]:
+        """(캐시 키, HTML, 결과 출처)를 반환합니다. 두 캐시에 모두 없을 때만 변환합니다."""
+        key = build_naver_html_cache_key(title, content, images)
+        cached: Optional[str] = self._memory.get(key)
+        if cached is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return key, cached, CACHE_SOURCE_MEMORY
+
+        data = self._disk.get(key)
+        if data is not None:
+            converted = data.decode("utf-8")
+            self._memory.set(key, converted)
+            with self._lock:
+                self.disk_hits += 1
+            return key, converted, CACHE_SOURCE_DISK
+
+        started_at = time.perf_counter()
+        converted = convert_markdown_to_naver_html(title, content, images)
+        elapsed = time.perf_counter() - started_at
+        self._disk.set(key, converted.encode("utf-8"))
+        self._memory.set(key, converted)
+        with self._lock:
+            self.conversions += 1
+            self.conversion_seconds += elapsed
+        return key, converted, CACHE_SOURCE_CONVERTED
+
+    def prune_disk(self, max_age_seconds: float) -> int:
+        """오래 사용하지 않은 디스크 캐시 파일을 삭제합니다."""
+        return self._disk.prune(max_age_seconds)
+
+    def stats(self) -> NaverHtmlCacheStats:
+        """메모리/디스크 적중 수와 변환 통계를 반환합니다."""
+        memory_stats = self._memory.stats()
+        return NaverHtmlCacheStats(
+            memory_size=memory_stats["size"],
+            memory_max_size=memory_stats["max_size"],
+            memory_hits=self.memory_hits,
+            disk_hits=self.disk_hits,
+            conversions=self.conversions,
+            conversion_ms=self.conversion_seconds * 1000,
+        )
+
+
+naver_html_cache = NaverHtmlCache(settings.NAVER_HTML_CACHE_SIZE, settings.NAVER_HTML_CACHE_DIR)
+
+
+def prune_naver_html_cache() -> None:
+    """서버 기동을 막지 않도록 오래된 디스크 캐시를 백그라운드 스레드에서 정리합니다."""
+    threading.Thread(target=_prune_naver_html_cache, name="naver-html-cache-prune", daemon=True).start()
+
+
+def _prune_naver_html_cache() -> None:
+    try:
+        removed = naver_html_cache.prune_disk(settings.NAVER_HTML_CACHE_MAX_AGE_DAYS * 86400)
+        logger.info(f"Naver HTML cache pruned: removed={removed}")
+    except Exception as e:
+        logger.error(f"Naver HTML cache was not pruned: {e}")
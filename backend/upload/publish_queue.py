@@ -0,0 +1,194 @@
+# Background worker pool for the durable Naver publish queue
+
+import asyncio
+import random
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set
+from core.config import settings
+from core.logger import logger
+from core.rate_limit import AsyncRateLimiter
+from .publisher import NaverPublisher, PublishError, get_naver_publisher
+from .service import UploadService, get_upload_service
+
+DEFAULT_ACCOUNT_KEY = "default"
+
+
+def publish_retry_delay_seconds(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """attempts번째 시도가 실패한 뒤 다음 시도까지 기다릴 시간입니다.
+
+    base_seconds부터 두 배씩 늘리되 max_seconds를 넘지 않고, 같은 때 실패한 작업이 한꺼번에
+    다시 몰리지 않도록 절반은 무작위로 흩뜨립니다.
+    """
+    delay = min(max_seconds, base_seconds * (2 ** max(0, attempts - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class PublishQueue:
+    """publish_jobs 테이블의 작업을 가져와 발행하는 백그라운드 작업자입니다.
+
+    - 동시에 실행하는 작업은 workers개까지이며, 빈 자리만큼만 작업을 점유합니다.
+    - 블로그 계정마다 분당 rate_per_minute건까지만 발행합니다.
+    - 실패한 작업은 지수 백오프로 다시 시도하고, max_attempts번 실패하면 dead 상태로 남깁니다.
+
+    작업 상태는 DB에 있으므로 서버가 재시작되어도 잃지 않습니다. 실행 중에 중단된 작업은 점유 시간이
+    지나면 다시 실행되므로, 발행 직후 중단되면 같은 글이 한 번 더 발행될 수 있습니다(최소 한 번 실행).
+    점유 시간 안에 끝나지 않은 발행은 재시도로 처리하고, 점유를 잃은 작업자는 작업 상태를 바꾸지 못합니다.
+    """
+
+    def __init__(
+        self,
+        publisher: NaverPublisher,
+        workers: int,
+        rate_per_minute: float,
+        lease_seconds: int,
+        poll_interval_seconds: float,
+        retry_base_seconds: float,
+        retry_max_seconds: float
+    ):
+        self.publisher = publisher
+        self.workers = workers
+        self.rate_per_minute = rate_per_minute
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.published_count = 0
+        self.retried_count = 0
+        self.dead_count = 0
+        self._rate_limiters: Dict[str, AsyncRateLimiter] = {}
+        self._running: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.workers > 0:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run(), name="naver-publish-queue")
+
+    async def shutdown(self) -> None:
+        """작업 가져오기를 멈추고 실행 중인 발행을 취소합니다. 취소된 작업은 점유 시간이 지나면 다시 실행됩니다."""
+        tasks = [self._task, *self._running] if self._task is not None else list(self._running)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+
+    def notify(self) -> None:
+        """새 작업이 들어왔음을 알려 폴링 간격을 기다리지 않고 바로 가져가게 합니다. 다른 스레드에서 호출해도 됩니다."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            # 가져오기 전에 지워야 그 사이에 끝난 작업이나 새 작업 알림을 놓치지 않습니다
+            self._wakeup.clear()
+            free_slots = self.workers - len(self._running)
+            if free_slots > 0:
+                try:
+                    jobs = await asyncio.to_thread(
+                        get_upload_service().claim_publish_jobs, free_slots, self.lease_seconds
+                    )
+                except Exception as e:
+                    logger.error(f"Publish job claim failed: {e}")
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(self._process(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._on_job_done)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_job_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._wakeup.set()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        service = get_upload_service()
+        job_id = job["id"]
+        account_id = job.get("blog_account_id")
+        loop = asyncio.get_running_loop()
+        lease_deadline = loop.time() + self.lease_seconds
+        try:
+            if job["attempts"] > job["max_attempts"]:
+                # 실행 중 중단되어 점유 시간이 지나 다시 가져온 작업이 시도 횟수를 넘긴 경우입니다
+                await self._fail(service, job, job.get("last_error") or "Publish lease expired too many times")
+                return
+            post = await asyncio.to_thread(service.get_post_html, job["post_id"])
+            if post is None:
+                await self._fail(service, job, "Post not found")
+                return
+            await self._rate_limiter(account_id).acquire()
+            # 점유 시간이 지나면 다른 작업자가 같은 작업을 다시 가져가므로 그 전에 발행을 끝냅니다
+            published_url = await asyncio.wait_for(
+                self.publisher.publish(account_id, post), timeout=max(0.0, lease_deadline - loop.time())
+            )
+            completed = await asyncio.to_thread(service.complete_publish_job, job_id, job["attempts"], published_url)
+            if not completed:
+                logger.warning(f"Publish job lease was lost before completion: job_id={job_id}, url={published_url}")
+                return
+            self.published_count += 1
+            logger.info(f"Post published: job_id={job_id}, post_id={job['post_id']}, url={published_url}")
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            await self._retry(service, job, "Publish did not finish before the lease expired")
+        except PublishError as e:
+            if e.retryable:
+                await self._retry(service, job, str(e))
+            else:
+                await self._fail(service, job, str(e))
+        except Exception as e:
+            await self._retry(service, job, str(e) or type(e).__name__)
+
+    async def _retry(self, service: UploadService, job: Dict[str, Any], error: str) -> None:
+        if job["attempts"] >= job["max_attempts"]:
+            await self._fail(service, job, error)
+            return
+        delay = publish_retry_delay_seconds(job["attempts"], self.retry_base_seconds, self.retry_max_seconds)
+        logger.warning(
+            f"Publish job failed, retrying: job_id={job['id']}, attempts={job['attempts']}, "
+            f"delay={delay:.1f}s, error={error}"
+        )
+        try:
+            if await asyncio.to_thread(service.retry_publish_job, job["id"], job["attempts"], delay, error):
+                self.retried_count += 1
+            else:
+                logger.warning(f"Publish job lease was lost before rescheduling: job_id={job['id']}")
+        except Exception as e:
+            # 점유 시간이 지나면 다시 실행됩니다
+            logger.error(f"Failed to reschedule publish job: job_id={job['id']}, error={e}")
+
+    async def _fail(self, service: UploadService, job: Dict[str, Any], error: str) -> None:
+        logger.error(f"Publish job dead: job_id={job['id']}, attempts={job['attempts']}, error={error}")
+        try:
+            if await asyncio.to_thread(service.fail_publish_job, job["id"], job["attempts"], error):
+                self.dead_count += 1
+            else:
+                logger.warning(f"Publish job lease was lost before marking it dead: job_id={job['id']}")
+        except Exception as e:
+            logger.error(f"Failed to mark publish job dead: job_id={job['id']}, error={e}")
+
+    def _rate_limiter(self, account_id: Optional[str]) -> AsyncRateLimiter:
+        key = account_id or DEFAULT_ACCOUNT_KEY
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            limiter = self._rate_limiters[key] = AsyncRateLimiter(self.rate_per_minute / 60, burst=1)
+        return limiter
+
+
+@lru_cache()
+def get_publish_queue() -> PublishQueue:
+    """네이버 발행 큐 작업자 싱글톤 인스턴스를 반환합니다."""
+    return PublishQueue(
+        publisher=get_naver_publisher(),
+        workers=settings.NAVER_PUBLISH_WORKERS,
+        rate_per_minute=settings.NAVER_PUBLISH_RATE_PER_MINUTE,
+        lease_seconds=settings.NAVER_PUBLISH_LEASE_SECONDS,
+        poll_interval_seconds=settings.NAVER_PUBLISH_POLL_INTERVAL_SECONDS,
+        retry_base_seconds=settings.NAVER_PUBLISH_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.NAVER_PUBLISH_RETRY_MAX_SECONDS,
+    )
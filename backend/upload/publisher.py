@@ -0,0 +1,67 @@
+# Naver blog publisher backends
+
+import asyncio
+import hashlib
+import random
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+from core.config import settings
+from .schemas import NaverHtmlPreview
+
+
+class PublishError(Exception):
+    """발행 실패입니다. retryable이 False면 다시 시도해도 성공할 수 없는 실패(예: 잘못된 계정)입니다."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        self.retryable = retryable
+        super().__init__(message)
+
+
+class NaverPublisher(ABC):
+    """변환된 글을 네이버 블로그에 발행하는 발행기 인터페이스입니다."""
+
+    @abstractmethod
+    async def publish(self, blog_account_id: Optional[str], post: NaverHtmlPreview) -> str:
+        """글을 발행하고 발행된 글의 URL을 반환합니다. 실패하면 PublishError를 발생시킵니다."""
+
+
+class FakeNaverPublisher(NaverPublisher):
+    """실제로 발행하지 않는 로컬 발행기입니다. 지연과 일정 비율의 일시적 실패를 흉내낼 수 있습니다.
+
+    실패 여부는 seed로 초기화한 난수로 정하므로 같은 설정이면 같은 순서로 실패합니다.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.call_count = 0
+        self.failure_count = 0
+        self._random = random.Random(seed)
+
+    async def publish(self, blog_account_id: Optional[str], post: NaverHtmlPreview) -> str:
+        self.call_count += 1
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            self.failure_count += 1
+            raise PublishError("Fake publisher transient failure")
+        log_no = int.from_bytes(hashlib.sha256(post.post_id.encode("utf-8")).digest()[:6], "big")
+        return f"https://blog.naver.com/{blog_account_id or 'fake'}/{log_no}"
+
+
+PUBLISHER_FACTORIES = {
+    "fake": lambda: FakeNaverPublisher(
+        latency_seconds=settings.NAVER_PUBLISH_FAKE_LATENCY_MS / 1000,
+        failure_rate=settings.NAVER_PUBLISH_FAKE_FAILURE_RATE,
+    ),
+}
+
+
+@lru_cache()
+def get_naver_publisher() -> NaverPublisher:
+    """설정된 발행기 싱글톤 인스턴스를 반환합니다."""
+    factory = PUBLISHER_FACTORIES.get(settings.NAVER_PUBLISHER)
+    if factory is None:
+        raise ValueError(f"Unknown Naver publisher: {settings.NAVER_PUBLISHER}")
+    return factory()
@@ -1,24 +1,57 @@
 # Upload API router
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from typing import List, Optional
 from core.logger import logger
 from core.exceptions import CustomException
-from .schemas import UploadResponse, UploadListResponse
+from core.pagination import set_next_cursor_header
+from .naver_html import naver_html_cache
+from .schemas import (
+    NaverHtmlCacheStats,
+    NaverHtmlPreview,
+    PublishJobCreate,
+    PublishJobResponse,
+    PublishJobStatus,
+    UploadListResponse,
+    UploadResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+)
+from .publish_queue import get_publish_queue
 from .service import UploadService, get_upload_service
 
 router = APIRouter(prefix="/api/uploads", tags=["uploads"])
 
+# tus와 같은 헤더 이름으로 현재 offset을 함께 알려 줍니다
+UPLOAD_OFFSET_HEADER = "Upload-Offset"
+UPLOAD_CHUNK_REQUEST_BODY = {
+    "required": True,
+    "content": {"application/offset+octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+}
+# 본문을 직접 스트리밍으로 파싱하므로 문서용 요청 스키마를 따로 명시합니다
+UPLOAD_FILE_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+                "required": ["file"],
+            }
+        }
+    },
+}
 
-@router.post("/", response_model=UploadResponse)
-def upload_file(
-    file: UploadFile = File(...),
+
+@router.post("/", response_model=UploadResponse, openapi_extra={"requestBody": UPLOAD_FILE_REQUEST_BODY})
+async def upload_file(
+    request: Request,
     service: UploadService = Depends(get_upload_service)
 ) -> UploadResponse:
-    """파일을 업로드합니다."""
+    """파일을 한 번에 업로드합니다. 큰 파일은 이어받기 세션을 사용합니다."""
     try:
-        logger.info(f"Uploading file: {file.filename}")
-        upload_result = service.upload_file(file)
+        logger.info(f"Uploading file: content_length={request.headers.get('content-length')}")
+        upload_result = await service.upload_file(request)
         return upload_result
     except CustomException as e:
         logger.error(f"Error uploading file: {e}")
@@ -27,23 +60,217 @@ def upload_file(
 
 @router.get("/", response_model=List[UploadListResponse])
 def get_uploads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: UploadService = Depends(get_upload_service)
 ) -> List[UploadListResponse]:
     """업로드된 파일 목록을 조회합니다."""
     try:
-        logger.info(f"Fetching uploads: skip={skip}, limit={limit}")
-        uploads = service.get_uploads(skip=skip, limit=limit)
+        logger.info(f"Fetching uploads: skip={skip}, limit={limit}, cursor={cursor}")
+        uploads = service.get_uploads(skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor_header(response, uploads, limit)
         return uploads
     except CustomException as e:
         logger.error(f"Error fetching uploads: {e}")
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
 
+@router.post("/sessions", response_model=UploadSessionResponse, status_code=201)
+def create_upload_session(
+    session_data: UploadSessionCreate,
+    response: Response,
+    service: UploadService = Depends(get_upload_service)
+) -> UploadSessionResponse:
+    """이어받기 업로드 세션을 만듭니다."""
+    try:
+        session = service.create_upload_session(session_data)
+        response.headers[UPLOAD_OFFSET_HEADER] = str(session.offset)
+        return session
+    except CustomException as e:
+        logger.error(f"Error creating upload session: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/sessions/{session_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    session_id: str,
+    response: Response,
+    service: UploadService = Depends(get_upload_service)
+) -> UploadSessionResponse:
+    """세션의 현재 offset을 조회합니다. 연결이 끊긴 뒤 이 위치부터 다시 보냅니다."""
+    try:
+        session = service.get_upload_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        response.headers[UPLOAD_OFFSET_HEADER] = str(session.offset)
+        return session
+    except CustomException as e:
+        logger.error(f"Error fetching upload session: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.patch(
+    "/sessions/{session_id}",
+    response_model=UploadSessionResponse,
+    openapi_extra={"requestBody": UPLOAD_CHUNK_REQUEST_BODY},
+)
+async def append_upload_chunk(
+    session_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias=UPLOAD_OFFSET_HEADER, ge=0),
+    service: UploadService = Depends(get_upload_service)
+) -> UploadSessionResponse:
+    """Upload-Offset 위치부터 본문 바이트를 이어 받습니다. offset이 현재 받은 크기와 다르면 409를 반환합니다."""
+    try:
+        content_length = request.headers.get("content-length")
+        session = await service.append_upload_chunk(
+            session_id,
+            upload_offset,
+            request.stream(),
+            int(content_length) if content_length and content_length.isdigit() else None,
+        )
+        if not session:
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        response.headers[UPLOAD_OFFSET_HEADER] = str(session.offset)
+        return session
+    except CustomException as e:
+        logger.error(f"Error appending upload chunk: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/sessions/{session_id}/complete", response_model=UploadResponse)
+async def complete_upload_session(
+    session_id: str,
+    service: UploadService = Depends(get_upload_service)
+) -> UploadResponse:
+    """다 받은 업로드를 저장하고 업로드 정보를 반환합니다."""
+    try:
+        upload = await service.complete_upload_session(session_id)
+        if not upload:
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        return upload
+    except CustomException as e:
+        logger.error(f"Error completing upload session: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.delete("/sessions/{session_id}")
+def delete_upload_session(
+    session_id: str,
+    service: UploadService = Depends(get_upload_service)
+) -> dict[str, str]:
+    """업로드를 취소하고 받은 바이트를 삭제합니다."""
+    try:
+        if not service.delete_upload_session(session_id):
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        return {"message": "Upload session deleted successfully"}
+    except CustomException as e:
+        logger.error(f"Error deleting upload session: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/html-cache", response_model=NaverHtmlCacheStats)
+def get_naver_html_cache_stats() -> NaverHtmlCacheStats:
+    """발행용 HTML 변환 캐시 통계를 조회합니다."""
+    return naver_html_cache.stats()
+
+
+@router.get("/posts/{post_id}/preview", response_model=NaverHtmlPreview)
+def preview_post_html(
+    post_id: str,
+    service: UploadService = Depends(get_upload_service)
+) -> NaverHtmlPreview:
+    """글을 발행할 HTML로 변환해 미리 봅니다."""
+    try:
+        preview = service.get_post_html(post_id)
+        if not preview:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return preview
+    except CustomException as e:
+        logger.error(f"Error previewing post HTML: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/posts/{post_id}", response_model=PublishJobResponse, status_code=202)
+def publish_post(
+    post_id: str,
+    job_data: Optional[PublishJobCreate] = None,
+    service: UploadService = Depends(get_upload_service)
+) -> PublishJobResponse:
+    """검수된 글의 발행 작업을 큐에 넣고 바로 반환합니다. 진행 상황은 발행 작업 조회로 확인합니다.
+    
+    이미 대기 중이거나 실행 중인 작업이 있으면 그 작업을 반환합니다.
+    """
+    try:
+        logger.info(f"Enqueueing post publish: post_id={post_id}")
+        job = service.enqueue_publish(post_id, job_data.blog_account_id if job_data else None)
+        if not job:
+            raise HTTPException(status_code=404, detail="Post not found")
+        get_publish_queue().notify()
+        return job
+    except CustomException as e:
+        logger.error(f"Error enqueueing post publish: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/publish-jobs", response_model=List[PublishJobResponse])
+def get_publish_jobs(
+    response: Response,
+    status: Optional[PublishJobStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    service: UploadService = Depends(get_upload_service)
+) -> List[PublishJobResponse]:
+    """발행 작업 목록을 최신순으로 조회합니다. status로 dead 작업만 모아 볼 수 있습니다."""
+    try:
+        jobs = service.get_publish_jobs(status=status, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor_header(response, jobs, limit)
+        return jobs
+    except CustomException as e:
+        logger.error(f"Error fetching publish jobs: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.get("/publish-jobs/{job_id}", response_model=PublishJobResponse)
+def get_publish_job(
+    job_id: str,
+    service: UploadService = Depends(get_upload_service)
+) -> PublishJobResponse:
+    """발행 작업의 상태를 조회합니다."""
+    try:
+        job = service.get_publish_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Publish job not found")
+        return job
+    except CustomException as e:
+        logger.error(f"Error fetching publish job: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+@router.post("/publish-jobs/{job_id}/retry", response_model=PublishJobResponse, status_code=202)
+def retry_publish_job(
+    job_id: str,
+    service: UploadService = Depends(get_upload_service)
+) -> PublishJobResponse:
+    """시도 횟수를 모두 써서 dead 상태가 된 작업을 다시 큐에 넣습니다."""
+    try:
+        job = service.requeue_publish_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Publish job not found")
+        get_publish_queue().notify()
+        return job
+    except CustomException as e:
+        logger.error(f"Error retrying publish job: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 @router.get("/{upload_id}", response_model=UploadResponse)
 def get_upload(
-    upload_id: int,
+    upload_id: str,
     service: UploadService = Depends(get_upload_service)
 ) -> UploadResponse:
     """특정 업로드 파일을 조회합니다."""
@@ -60,7 +287,7 @@ def get_upload(
 
 @router.delete("/{upload_id}")
 def delete_upload(
-    upload_id: int,
+    upload_id: str,
     service: UploadService = Depends(get_upload_service)
 ) -> dict[str, str]:
     """업로드된 파일을 삭제합니다."""
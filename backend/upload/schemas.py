@@ -1,5 +1,6 @@
 # Upload Pydantic schemas
 
+from enum import Enum
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
@@ -13,7 +14,7 @@ class UploadBase(BaseModel):
 
 
 class UploadResponse(UploadBase):
-    id: int
+    id: str
     created_at: datetime
 
     class Config:
@@ -21,7 +22,7 @@ class UploadResponse(UploadBase):
 
 
 class UploadListResponse(BaseModel):
-    id: int
+    id: str
     filename: str
     file_size: int
     content_type: Optional[str] = None
@@ -29,3 +30,72 @@ class UploadListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., description="파일명", min_length=1, max_length=255)
+    length: int = Field(..., description="전체 파일 크기 (bytes)", ge=1)
+    content_type: Optional[str] = Field(None, description="파일 MIME 타입", max_length=100)
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    length: int = Field(..., description="전체 파일 크기 (bytes)")
+    offset: int = Field(..., description="지금까지 받은 바이트 수. 다음 청크는 이 위치부터 보냅니다")
+    content_type: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime = Field(..., description="이때까지 청크를 받지 못하면 세션이 삭제됩니다")
+
+    class Config:
+        from_attributes = True
+
+
+class PostImage(BaseModel):
+    id: str
+    url: str
+
+
+class NaverHtmlPreview(BaseModel):
+    post_id: str
+    title: str
+    html: str = Field(..., description="네이버 에디터용 HTML")
+    cache_key: str = Field(..., description="본문과 이미지 목록의 해시")
+    cache_source: str = Field(..., description="memory | disk | converted")
+
+
+class NaverHtmlCacheStats(BaseModel):
+    memory_size: int
+    memory_max_size: int
+    memory_hits: int
+    disk_hits: int
+    conversions: int = Field(..., description="실제 변환 횟수")
+    conversion_ms: float = Field(..., description="변환에 쓴 누적 시간")
+
+
+class PublishJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+
+class PublishJobCreate(BaseModel):
+    blog_account_id: Optional[str] = Field(None, description="발행할 블로그 계정. 없으면 기본 계정으로 발행합니다")
+
+
+class PublishJobResponse(BaseModel):
+    id: str
+    post_id: str
+    blog_account_id: Optional[str] = None
+    status: PublishJobStatus
+    attempts: int = Field(..., description="지금까지 시도한 횟수")
+    max_attempts: int
+    run_at: datetime = Field(..., description="다음 시도 예정 시각")
+    last_error: Optional[str] = None
+    published_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,11 +1,34 @@
 # Upload business logic service
 
-from typing import List, Optional
-from fastapi import UploadFile
+import asyncio
+import mimetypes
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import Request
+from core.config import settings
 from core.logger import logger
-from core.exceptions import CustomException
+from core.exceptions import ConflictException, CustomException, PayloadTooLargeException
 from core.database import get_db
-from .schemas import UploadResponse, UploadListResponse
+from core.pagination import paginate_query
+from core.upload_stream import StreamedFile, receive_multipart_file
+from .naver_html import naver_html_cache
+from .schemas import (
+    NaverHtmlPreview,
+    PostImage,
+    PublishJobResponse,
+    PublishJobStatus,
+    UploadListResponse,
+    UploadResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+)
+from .sessions import UploadSession, get_upload_session_store, upload_storage_path
+
+ACTIVE_PUBLISH_JOB_STATUSES = [PublishJobStatus.QUEUED.value, PublishJobStatus.RUNNING.value]
+# 한 번에 올리는 파일은 형식을 제한하지 않으므로 내용으로 판별하지 않습니다
+DEFAULT_UPLOAD_CONTENT_TYPE = "application/octet-stream"
 
 
 def get_upload_service():
@@ -20,44 +43,372 @@ class UploadService:
     def __init__(self, db=None):
         self.db = db
     
-    def upload_file(self, file: UploadFile) -> UploadResponse:
-        """파일을 업로드합니다."""
+    async def upload_file(self, request: Request) -> UploadResponse:
+        """multipart 본문의 file 필드를 업로드 저장소에 저장하고 업로드 정보를 저장합니다.
+        
+        본문은 UPLOAD_CHUNK_WRITE_SIZE 단위로 디스크에 바로 기록하며, UPLOAD_MAX_BYTES를 넘으면
+        PayloadTooLargeException을 발생시킵니다. 연결이 끊기면 처음부터 다시 보내야 하므로 큰 파일은 세션을 사용합니다.
+        """
         try:
-            logger.info(f"Uploading file: {file.filename}, content_type: {file.content_type}")
-            # TODO: 파일 저장 로직 구현
-            # TODO: 데이터베이스에 업로드 정보 저장 로직 구현
-            raise NotImplementedError("File upload not implemented")
+            upload = await receive_multipart_file(
+                request,
+                field_name="file",
+                directory=os.path.join(settings.UPLOAD_STORAGE_DIR, ".incoming"),
+                max_bytes=settings.UPLOAD_MAX_BYTES,
+                chunk_size=settings.UPLOAD_CHUNK_WRITE_SIZE,
+                sniff=lambda head: DEFAULT_UPLOAD_CONTENT_TYPE,
+                sniff_bytes=0,
+            )
+            try:
+                return await asyncio.to_thread(self._save_uploaded_file, upload)
+            finally:
+                upload.discard()
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to upload file: {e}", exc_info=True)
             raise CustomException("Failed to upload file")
     
-    def get_uploads(self, skip: int = 0, limit: int = 100) -> List[UploadListResponse]:
+    def create_upload_session(self, session_data: UploadSessionCreate) -> UploadSessionResponse:
+        """이어받기 업로드 세션을 만듭니다. 이후 청크를 PATCH로 보내고 다 보내면 완료합니다."""
+        try:
+            if session_data.length > settings.UPLOAD_MAX_BYTES:
+                raise PayloadTooLargeException(f"File exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+            session = get_upload_session_store().create(
+                session_data.filename, session_data.length, session_data.content_type
+            )
+            logger.info(f"Upload session created: id={session.id}, filename={session.filename}, length={session.length}")
+            return UploadSessionResponse.model_validate(session)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to create upload session: {e}", exc_info=True)
+            raise CustomException("Failed to create upload session")
+    
+    def get_upload_session(self, session_id: str) -> Optional[UploadSessionResponse]:
+        """세션의 현재 offset을 조회합니다. 연결이 끊긴 뒤 어디서부터 다시 보낼지 확인할 때 사용합니다."""
+        try:
+            session = get_upload_session_store().get(session_id)
+            return UploadSessionResponse.model_validate(session) if session else None
+        except Exception as e:
+            logger.error(f"Failed to fetch upload session: {e}", exc_info=True)
+            raise CustomException("Failed to fetch upload session")
+    
+    async def append_upload_chunk(
+        self,
+        session_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        content_length: Optional[int] = None
+    ) -> Optional[UploadSessionResponse]:
+        """offset 위치부터 청크를 이어 받아 임시 파일에 바로 기록합니다. 세션이 없으면 None을 반환합니다.
+        
+        offset이 현재 받은 크기와 다르면 ConflictException(409)을 발생시킵니다.
+        """
+        try:
+            session = await get_upload_session_store().append(session_id, offset, chunks, content_length)
+            return UploadSessionResponse.model_validate(session) if session else None
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to append upload chunk: {e}", exc_info=True)
+            raise CustomException("Failed to append upload chunk")
+    
+    async def complete_upload_session(self, session_id: str) -> Optional[UploadResponse]:
+        """다 받은 세션의 파일을 업로드 저장소로 옮기고 업로드 정보를 저장합니다. 세션이 없으면 None을 반환합니다.
+        
+        아직 다 받지 못했으면 ConflictException을 발생시킵니다.
+        """
+        store = get_upload_session_store()
+        try:
+            async with store.lock(session_id):
+                session = await asyncio.to_thread(store.get, session_id)
+                if session is None:
+                    return None
+                if not session.is_complete:
+                    raise ConflictException(f"Upload is incomplete: {session.offset}/{session.length} bytes")
+                return await asyncio.to_thread(self._save_completed_upload, session)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to complete upload session: {e}", exc_info=True)
+            raise CustomException("Failed to complete upload session")
+    
+    def delete_upload_session(self, session_id: str) -> bool:
+        """업로드를 취소하고 받은 바이트를 삭제합니다."""
+        try:
+            store = get_upload_session_store()
+            return store.get(session_id) is not None and store.remove(session_id)
+        except Exception as e:
+            logger.error(f"Failed to delete upload session: {e}", exc_info=True)
+            raise CustomException("Failed to delete upload session")
+    
+    def get_uploads(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[UploadListResponse]:
         """업로드된 파일 목록을 조회합니다."""
         try:
-            logger.info(f"Fetching uploads from database: skip={skip}, limit={limit}")
-            # TODO: 데이터베이스에서 업로드 목록 조회 로직 구현
-            return []
+            logger.info(f"Fetching uploads from database: skip={skip}, limit={limit}, cursor={cursor}")
+            query = paginate_query(self.db.table("uploads").select("*"), skip=skip, limit=limit, cursor=cursor)
+            return [UploadListResponse.model_validate(row) for row in query.execute().data]
+        except CustomException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch uploads: {e}", exc_info=True)
             raise CustomException("Failed to fetch uploads")
     
-    def get_upload_by_id(self, upload_id: int) -> Optional[UploadResponse]:
+    def get_upload_by_id(self, upload_id: str) -> Optional[UploadResponse]:
         """ID로 업로드 파일을 조회합니다."""
         try:
             logger.info(f"Fetching upload by id: {upload_id}")
-            # TODO: 데이터베이스에서 업로드 조회 로직 구현
-            return None
+            rows = self.db.table("uploads").select("*").eq("id", upload_id).limit(1).execute().data
+            return UploadResponse.model_validate(rows[0]) if rows else None
         except Exception as e:
             logger.error(f"Failed to fetch upload: {e}", exc_info=True)
             raise CustomException("Failed to fetch upload")
     
-    def delete_upload(self, upload_id: int) -> bool:
-        """업로드된 파일을 삭제합니다."""
+    def delete_upload(self, upload_id: str) -> bool:
+        """업로드 정보와 저장된 파일을 삭제합니다."""
         try:
             logger.info(f"Deleting upload: id={upload_id}")
-            # TODO: 파일 삭제 로직 구현
-            # TODO: 데이터베이스에서 업로드 정보 삭제 로직 구현
-            return False
+            rows = self.db.table("uploads").delete().eq("id", upload_id).execute().data
+            if not rows:
+                return False
+            try:
+                os.unlink(rows[0]["file_path"])
+            except FileNotFoundError:
+                pass
+            return True
         except Exception as e:
             logger.error(f"Failed to delete upload: {e}", exc_info=True)
             raise CustomException("Failed to delete upload")
+    
+    def _save_uploaded_file(self, upload: StreamedFile) -> UploadResponse:
+        file_path = upload_storage_path(uuid.uuid4().hex, upload.filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(upload.path, file_path)
+        try:
+            row = self.db.table("uploads").insert({
+                "filename": upload.filename,
+                "file_path": file_path,
+                "file_size": upload.size,
+                "content_type": mimetypes.guess_type(upload.filename)[0] or upload.mime_type,
+            }).execute().data[0]
+        except Exception:
+            os.unlink(file_path)
+            raise
+        logger.info(f"Upload saved: id={row['id']}, size={upload.size}")
+        return UploadResponse.model_validate(row)
+    
+    def _save_completed_upload(self, session: UploadSession) -> UploadResponse:
+        store = get_upload_session_store()
+        file_path = upload_storage_path(session.id, session.filename)
+        store.take_file(session, file_path)
+        try:
+            row = self.db.table("uploads").insert({
+                "filename": session.filename,
+                "file_path": file_path,
+                "file_size": session.length,
+                "content_type": session.content_type,
+            }).execute().data[0]
+        except Exception:
+            # 세션을 남겨 두어 완료를 다시 요청할 수 있게 합니다
+            store.restore_file(session, file_path)
+            raise
+        store.remove(session.id)
+        logger.info(f"Upload completed: id={row['id']}, session={session.id}, size={session.length}")
+        return UploadResponse.model_validate(row)
+    
+    def get_post_html(self, post_id: str) -> Optional[NaverHtmlPreview]:
+        """글을 네이버 에디터용 HTML로 변환합니다. 미리보기와 발행이 같은 캐시를 사용합니다.
+        
+        글이 없으면 None을 반환합니다.
+        """
+        try:
+            logger.info(f"Rendering post HTML: post_id={post_id}")
+            rows = self.db.table("posts").select("id,title,content").eq("id", post_id).limit(1).execute().data
+            if not rows:
+                return None
+            post = rows[0]
+            images = self.get_post_images(post_id)
+            cache_key, html, cache_source = naver_html_cache.get_or_convert(post["title"], post["content"], images)
+            return NaverHtmlPreview(
+                post_id=post_id, title=post["title"], html=html, cache_key=cache_key, cache_source=cache_source
+            )
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to render post HTML: {e}", exc_info=True)
+            raise CustomException("Failed to render post HTML")
+    
+    def get_post_images(self, post_id: str) -> List[PostImage]:
+        """글에 첨부된 이미지를 표시 순서대로 조회합니다."""
+        rows = (
+            self.db.table("post_images")
+            .select("image_id,display_order,images(url)")
+            .eq("post_id", post_id)
+            .order("display_order")
+            .order("image_id")
+            .execute()
+            .data
+        )
+        return [PostImage(id=str(row["image_id"]), url=row["images"]["url"]) for row in rows if row.get("images")]
+    
+    def enqueue_publish(self, post_id: str, blog_account_id: Optional[str] = None) -> Optional[PublishJobResponse]:
+        """검수된 글의 발행 작업을 큐에 넣습니다. 글이 없으면 None을 반환합니다.
+        
+        이미 대기 중이거나 실행 중인 작업이 있으면 새로 만들지 않고 그 작업을 반환합니다.
+        이미 발행되었거나 검수 전인 글은 ConflictException을 발생시킵니다.
+        """
+        try:
+            rows = self.db.table("posts").select("id,status").eq("id", post_id).limit(1).execute().data
+            if not rows:
+                return None
+            if rows[0]["status"] == "published":
+                raise ConflictException("Post is already published")
+            if rows[0]["status"] != "reviewed":
+                raise ConflictException("Post must be reviewed before publishing")
+            
+            active_job = self._get_active_publish_job(post_id)
+            if active_job is not None:
+                return active_job
+            try:
+                row = self.db.table("publish_jobs").insert({
+                    "post_id": post_id,
+                    "blog_account_id": blog_account_id,
+                    "max_attempts": settings.NAVER_PUBLISH_MAX_ATTEMPTS,
+                }).execute().data[0]
+            except Exception:
+                # 동시에 들어온 요청이 먼저 작업을 만들어 글별 유니크 인덱스에 걸린 경우입니다
+                active_job = self._get_active_publish_job(post_id)
+                if active_job is None:
+                    raise
+                return active_job
+            logger.info(f"Publish job enqueued: id={row['id']}, post_id={post_id}, blog_account_id={blog_account_id}")
+            return PublishJobResponse.model_validate(row)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to enqueue publish job: {e}", exc_info=True)
+            raise CustomException("Failed to enqueue publish job")
+    
+    def get_publish_jobs(
+        self,
+        status: Optional[PublishJobStatus] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[PublishJobResponse]:
+        """발행 작업 목록을 최신순으로 조회합니다."""
+        try:
+            query = self.db.table("publish_jobs").select("*")
+            if status is not None:
+                query = query.eq("status", status.value)
+            query = paginate_query(query, skip=skip, limit=limit, cursor=cursor)
+            return [PublishJobResponse.model_validate(row) for row in query.execute().data]
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch publish jobs: {e}", exc_info=True)
+            raise CustomException("Failed to fetch publish jobs")
+    
+    def get_publish_job(self, job_id: str) -> Optional[PublishJobResponse]:
+        """ID로 발행 작업을 조회합니다."""
+        try:
+            rows = self.db.table("publish_jobs").select("*").eq("id", job_id).limit(1).execute().data
+            return PublishJobResponse.model_validate(rows[0]) if rows else None
+        except Exception as e:
+            logger.error(f"Failed to fetch publish job: {e}", exc_info=True)
+            raise CustomException("Failed to fetch publish job")
+    
+    def requeue_publish_job(self, job_id: str) -> Optional[PublishJobResponse]:
+        """실패로 끝난(dead) 작업을 시도 횟수를 초기화해 다시 큐에 넣습니다. 작업이 없으면 None을 반환합니다."""
+        try:
+            job = self.get_publish_job(job_id)
+            if job is None:
+                return None
+            if job.status != PublishJobStatus.DEAD:
+                raise ConflictException(f"Only dead publish jobs can be retried: status={job.status.value}")
+            if self._get_active_publish_job(job.post_id) is not None:
+                raise ConflictException("Post already has an active publish job")
+            rows = (
+                self.db.table("publish_jobs")
+                .update({
+                    "status": PublishJobStatus.QUEUED.value,
+                    "attempts": 0,
+                    "run_at": datetime.now(timezone.utc).isoformat(),
+                    "locked_until": None,
+                })
+                .eq("id", job_id)
+                .eq("status", PublishJobStatus.DEAD.value)
+                .execute()
+                .data
+            )
+            if not rows:
+                raise ConflictException("Publish job was changed concurrently")
+            logger.info(f"Publish job requeued: id={job_id}")
+            return PublishJobResponse.model_validate(rows[0])
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to requeue publish job: {e}", exc_info=True)
+            raise CustomException("Failed to requeue publish job")
+    
+    def claim_publish_jobs(self, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """실행할 때가 된 작업을 최대 limit개 가져와 lease_seconds 동안 점유합니다. 시도 횟수가 1 늘어납니다.
+        
+        점유 시간이 지나도록 끝나지 않은 작업(작업자가 중단된 경우)은 다시 가져옵니다.
+        """
+        return self.db.rpc("claim_publish_jobs", {"p_limit": limit, "p_lease_seconds": lease_seconds}).execute().data or []
+    
+    def complete_publish_job(self, job_id: str, attempts: int, published_url: str) -> bool:
+        """작업을 성공으로 표시하고 글 상태를 published로 바꿉니다. 한 트랜잭션에서 처리됩니다.
+        
+        attempts번째 시도의 점유가 아직 유효할 때만 바꾸며, 바꾸지 못했으면 False를 반환합니다.
+        """
+        return bool(self.db.rpc("complete_publish_job", {
+            "p_job_id": job_id,
+            "p_attempts": attempts,
+            "p_published_url": published_url,
+        }).execute().data)
+    
+    def retry_publish_job(self, job_id: str, attempts: int, delay_seconds: float, error: str) -> bool:
+        """작업을 delay_seconds 뒤에 다시 시도하도록 큐에 되돌립니다. 점유를 잃었으면 False를 반환합니다."""
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+        return self._update_running_publish_job(job_id, attempts, {
+            "status": PublishJobStatus.QUEUED.value,
+            "run_at": run_at.isoformat(),
+            "locked_until": None,
+            "last_error": error,
+        })
+    
+    def fail_publish_job(self, job_id: str, attempts: int, error: str) -> bool:
+        """작업을 더 시도하지 않는 dead 상태로 바꿉니다. 점유를 잃었으면 False를 반환합니다."""
+        return self._update_running_publish_job(job_id, attempts, {
+            "status": PublishJobStatus.DEAD.value,
+            "locked_until": None,
+            "last_error": error,
+        })
+    
+    def _update_running_publish_job(self, job_id: str, attempts: int, values: Dict[str, Any]) -> bool:
+        # 점유 시간이 지나 다른 작업자가 다시 가져간 작업은 attempts가 달라 바뀌지 않습니다
+        rows = (
+            self.db.table("publish_jobs")
+            .update(values)
+            .eq("id", job_id)
+            .eq("status", PublishJobStatus.RUNNING.value)
+            .eq("attempts", attempts)
+            .execute()
+            .data
+        )
+        return bool(rows)
+    
+    def _get_active_publish_job(self, post_id: str) -> Optional[PublishJobResponse]:
+        rows = (
+            self.db.table("publish_jobs")
+            .select("*")
+            .eq("post_id", post_id)
+            .in_("status", ACTIVE_PUBLISH_JOB_STATUSES)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return PublishJobResponse.model_validate(rows[0]) if rows else None
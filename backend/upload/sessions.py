@@ -0,0 +1,255 @@
+# Resumable upload sessions stored on local disk
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
+from starlette.requests import ClientDisconnect
+from core.config import settings
+from core.exceptions import ConflictException, PayloadTooLargeException
+from core.logger import logger
+
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadSession:
+    """이어받기 업로드 세션 하나의 상태입니다. offset은 지금까지 기록된 바이트 수입니다."""
+
+    def __init__(
+        self,
+        id: str,
+        filename: str,
+        length: int,
+        content_type: Optional[str],
+        offset: int,
+        created_at: datetime,
+        expires_at: datetime
+    ):
+        self.id = id
+        self.filename = filename
+        self.length = length
+        self.content_type = content_type
+        self.offset = offset
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset == self.length
+
+
+class UploadSessionStore:
+    """세션마다 메타데이터(.json)와 받은 바이트(.part) 파일을 디스크에 둡니다.
+
+    offset은 .part 파일 크기이므로 서버가 재시작되어도 기록된 데까지 이어받을 수 있습니다.
+    마지막으로 청크를 받은 뒤 ttl_seconds가 지난 세션은 만료되어 주기적으로 삭제됩니다.
+    같은 세션에 동시에 들어온 청크는 순서대로 처리하며, 뒤의 요청은 offset이 맞지 않아 거절됩니다.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, prune_interval_seconds: float, write_size: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval_seconds = prune_interval_seconds
+        self.write_size = write_size
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and self.prune_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="upload-session-prune")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def create(self, filename: str, length: int, content_type: Optional[str]) -> UploadSession:
+        """빈 세션을 만듭니다."""
+        os.makedirs(self.directory, exist_ok=True)
+        session_id = uuid.uuid4().hex
+        created_at = datetime.now(timezone.utc)
+        with open(self._meta_path(session_id), "w", encoding="utf-8") as file:
+            json.dump({
+                "filename": filename,
+                "length": length,
+                "content_type": content_type,
+                "created_at": created_at.isoformat(),
+            }, file, ensure_ascii=False)
+        open(self._data_path(session_id), "wb").close()
+        return self.get(session_id)
+
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        """세션을 조회합니다. 없거나 만료되었으면 None을 반환합니다(만료된 세션은 삭제합니다)."""
+        if not SESSION_ID_PATTERN.match(session_id):
+            return None
+        try:
+            with open(self._meta_path(session_id), encoding="utf-8") as file:
+                meta = json.load(file)
+            stat = os.stat(self._data_path(session_id))
+        except FileNotFoundError:
+            return None
+        expires_at = stat.st_mtime + self.ttl_seconds
+        if expires_at < time.time():
+            self.remove(session_id)
+            return None
+        return UploadSession(
+            id=session_id,
+            filename=meta["filename"],
+            length=meta["length"],
+            content_type=meta["content_type"],
+            offset=stat.st_size,
+            created_at=datetime.fromisoformat(meta["created_at"]),
+            expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+        )
+
+    async def append(
+        self,
+        session_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        content_length: Optional[int] = None
+    ) -> Optional[UploadSession]:
+        """offset 위치부터 받은 바이트를 .part 파일 끝에 이어 씁니다. 세션이 없으면 None을 반환합니다.
+
+        offset이 현재 기록된 크기와 다르면 ConflictException, 전체 길이를 넘으면 PayloadTooLargeException을 발생시킵니다.
+        본문은 write_size 단위로 나눠 바로 기록하고, 클라이언트 연결이 끊기면 그때까지 받은 바이트를 남깁니다.
+        """
+        async with self.lock(session_id):
+            session = await asyncio.to_thread(self.get, session_id)
+            if session is None:
+                return None
+            if offset != session.offset:
+                raise ConflictException(f"Upload offset mismatch: expected {session.offset}")
+            remaining = session.length - session.offset
+            if content_length is not None and content_length > remaining:
+                raise PayloadTooLargeException(f"Chunk exceeds the remaining {remaining} bytes")
+
+            file = await asyncio.to_thread(open, self._data_path(session_id), "ab", buffering=0)
+            pending = bytearray()
+            received = 0
+            try:
+                async for chunk in chunks:
+                    received += len(chunk)
+                    if received > remaining:
+                        raise PayloadTooLargeException(f"Chunk exceeds the remaining {remaining} bytes")
+                    pending += chunk
+                    if len(pending) >= self.write_size:
+                        await asyncio.to_thread(file.write, bytes(pending))
+                        pending.clear()
+            except ClientDisconnect:
+                logger.info(f"Upload chunk interrupted: session={session_id}, received={received}")
+            finally:
+                # 한도를 넘긴 청크 전까지 받은 바이트는 유효하므로 남깁니다
+                if pending:
+                    await asyncio.to_thread(file.write, bytes(pending))
+                await asyncio.to_thread(file.close)
+            return await asyncio.to_thread(self.get, session_id)
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """세션별 잠금입니다. 청크 기록과 완료 처리, 정리가 겹치지 않게 합니다.
+
+        잠금은 있는 세션에만 만들어 두고 세션을 삭제할 때 함께 지웁니다. 없는 세션에는 공유하지 않는
+        새 잠금을 돌려주므로, 잘못된 ID로 요청이 계속 들어와도 잠금이 쌓이지 않습니다.
+        """
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            if SESSION_ID_PATTERN.match(session_id) and os.path.exists(self._meta_path(session_id)):
+                self._locks[session_id] = lock
+        return lock
+
+    def take_file(self, session: UploadSession, target_path: str) -> None:
+        """다 받은 .part 파일을 target_path로 옮깁니다."""
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        shutil.move(self._data_path(session.id), target_path)
+
+    def restore_file(self, session: UploadSession, target_path: str) -> None:
+        """take_file 후 완료 처리에 실패했을 때 파일을 세션으로 되돌려 다시 완료할 수 있게 합니다."""
+        shutil.move(target_path, self._data_path(session.id))
+
+    def remove(self, session_id: str) -> bool:
+        """세션 파일을 삭제합니다. 삭제한 것이 있으면 True를 반환합니다."""
+        self._locks.pop(session_id, None)
+        removed = False
+        for path in (self._data_path(session_id), self._meta_path(session_id)):
+            try:
+                os.unlink(path)
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    async def prune(self) -> int:
+        """만료된 세션을 삭제하고 삭제한 수를 반환합니다.
+
+        청크를 받거나 완료 처리 중이라 잠긴 세션은 건너뛰고, 잠금을 잡은 뒤 만료 여부를 다시 확인합니다.
+        """
+        removed = 0
+        for session_id in await asyncio.to_thread(self._expired_session_ids):
+            lock = self.lock(session_id)
+            if lock.locked():
+                continue
+            async with lock:
+                if await asyncio.to_thread(self._remove_if_expired, session_id):
+                    removed += 1
+        return removed
+
+    def _expired_session_ids(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        session_ids = []
+        for file_name in os.listdir(self.directory):
+            session_id, extension = os.path.splitext(file_name)
+            if extension == ".json" and SESSION_ID_PATTERN.match(session_id) and self._is_expired(session_id):
+                session_ids.append(session_id)
+        return session_ids
+
+    def _remove_if_expired(self, session_id: str) -> bool:
+        return self._is_expired(session_id) and self.remove(session_id)
+
+    def _is_expired(self, session_id: str) -> bool:
+        try:
+            last_active = os.stat(self._data_path(session_id)).st_mtime
+        except FileNotFoundError:
+            last_active = 0
+        return last_active + self.ttl_seconds < time.time()
+
+    def _meta_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def _data_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.part")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await self.prune()
+                if removed:
+                    logger.info(f"Expired upload sessions removed: count={removed}")
+            except Exception as e:
+                logger.error(f"Upload session pruning failed: {e}")
+            await asyncio.sleep(self.prune_interval_seconds)
+
+
+def upload_storage_path(session_id: str, filename: str) -> str:
+    """완료된 업로드를 둘 경로입니다. 파일 이름의 디렉터리 부분은 버립니다."""
+    base_name = os.path.basename(filename.replace("\\", "/")).strip() or "upload"
+    return os.path.join(settings.UPLOAD_STORAGE_DIR, session_id[:2], f"{session_id}_{base_name}")
+
+
+@lru_cache()
+def get_upload_session_store() -> UploadSessionStore:
+    """이어받기 업로드 세션 저장소 싱글톤 인스턴스를 반환합니다."""
+    return UploadSessionStore(
+        directory=settings.UPLOAD_SESSION_DIR,
+        ttl_seconds=settings.UPLOAD_SESSION_TTL_SECONDS,
+        prune_interval_seconds=settings.UPLOAD_SESSION_PRUNE_INTERVAL_SECONDS,
+        write_size=settings.UPLOAD_CHUNK_WRITE_SIZE,
+    )
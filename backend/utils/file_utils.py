@@ -0,0 +1,29 @@
+# File type helpers
+
+from typing import Optional
+
+# 형식 판별에 필요한 앞부분 바이트 수
+MIME_SNIFF_BYTES = 16
+
+IMAGE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+
+
+def sniff_image_mime_type(header: bytes) -> Optional[str]:
+    """파일 앞부분 바이트(매직 넘버)로 이미지 MIME 타입을 판별합니다. 지원하지 않는 형식이면 None을 반환합니다.
+
+    클라이언트가 보낸 Content-Type이나 확장자는 신뢰하지 않습니다.
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
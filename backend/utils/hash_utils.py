@@ -0,0 +1,24 @@
+# Hash helpers
+
+import hashlib
+import re
+
+SHA256_HEX_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def md5_hex(text: str) -> str:
+    """문자열의 MD5 16진수 해시를 반환합니다. 보안 용도가 아닌 식별/중복 제거용입니다.
+
+    Postgres의 md5() 함수와 같은 값을 반환합니다.
+    """
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def sha256_hex(text: str) -> str:
+    """문자열의 SHA-256 16진수 해시를 반환합니다. 캐시 키처럼 충돌이 없어야 하는 식별에 사용합니다."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def is_sha256_hex(value: str) -> bool:
+    """소문자 64자리 16진수 SHA-256 문자열인지 확인합니다."""
+    return SHA256_HEX_PATTERN.fullmatch(value) is not None
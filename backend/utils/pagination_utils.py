@@ -0,0 +1,26 @@
+# Keyset pagination cursor helpers
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """(created_at, id) 정렬 키를 불투명한 커서 문자열로 인코딩합니다."""
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """커서 문자열을 (created_at, id) 정렬 키로 디코딩합니다. 형식이 잘못되면 ValueError를 발생시킵니다.
+
+    값은 쿼리 필터 문자열에 들어가므로 시각과 UUID로 파싱한 뒤 표준 형식으로 다시 만들어 반환합니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(row_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
@@ -0,0 +1,96 @@
+# String conversion helpers
+
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Tuple
+
+HANGUL_SYLLABLE_START = 0xAC00
+HANGUL_SYLLABLE_END = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+CONJOINING_CHOSEONG_START = 0x1100
+CONJOINING_JUNGSEONG_START = 0x1161
+CONJOINING_JONGSEONG_START = 0x11A8
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+
+# 입력 중간 상태(예: "달" -> "닭", "고" -> "과")와 맞추기 위해 겹자모를 기본 자모로 나눕니다
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_search_text(text: str) -> str:
+    """NFKC 정규화, 대소문자 통일, 연속 공백 정리를 적용합니다."""
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def remove_whitespace(text: str) -> str:
+    """문자열의 모든 공백을 제거합니다."""
+    return WHITESPACE_PATTERN.sub("", text)
+
+
+def _build_jamo_translation() -> Dict[int, str]:
+    """한글 음절과 자모를 기본 호환용 자모 시퀀스로 바꾸는 변환 테이블을 만듭니다."""
+    table: Dict[int, str] = {}
+    for index in range(HANGUL_SYLLABLE_END - HANGUL_SYLLABLE_START + 1):
+        choseong = CHOSEONG[index // (JUNGSEONG_COUNT * JONGSEONG_COUNT)]
+        jungseong = JUNGSEONG[(index % (JUNGSEONG_COUNT * JONGSEONG_COUNT)) // JONGSEONG_COUNT]
+        jongseong = JONGSEONG[index % JONGSEONG_COUNT]
+        table[HANGUL_SYLLABLE_START + index] = (
+            choseong + COMPOUND_JAMO.get(jungseong, jungseong) + COMPOUND_JAMO.get(jongseong, jongseong)
+        )
+    for compound, basic in COMPOUND_JAMO.items():
+        table[ord(compound)] = basic
+    # NFKC 정규화는 호환용 자모를 첫가끝 자모로 바꾸므로 다시 호환용 자모로 되돌립니다
+    for offset, choseong in enumerate(CHOSEONG):
+        table[CONJOINING_CHOSEONG_START + offset] = choseong
+    for offset, jungseong in enumerate(JUNGSEONG):
+        table[CONJOINING_JUNGSEONG_START + offset] = COMPOUND_JAMO.get(jungseong, jungseong)
+    for offset, jongseong in enumerate(JONGSEONG[1:]):
+        table[CONJOINING_JONGSEONG_START + offset] = COMPOUND_JAMO.get(jongseong, jongseong)
+    return table
+
+
+JAMO_TRANSLATION = _build_jamo_translation()
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 호환용 자모 시퀀스로 분해합니다. 한글이 아닌 문자는 그대로 둡니다.
+
+    예) "닭갈비" -> "ㄷㅏㄹㄱㄱㅏㄹㅂㅣ"
+    """
+    return text.translate(JAMO_TRANSLATION)
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """문자 단위 n-gram 목록을 반환합니다. 문자열이 n보다 짧으면 빈 목록을 반환합니다."""
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def apply_text_edits(text: str, edits: Sequence[Tuple[int, int, str]]) -> str:
+    """원문 기준 (start, end, 대체 문자열) 편집 목록을 한 번에 적용합니다.
+
+    위치는 유니코드 코드 포인트 기준이며, start == end이면 삽입, 대체 문자열이 비어 있으면 삭제입니다.
+    범위가 원문을 벗어나거나 서로 겹치면 ValueError를 발생시킵니다.
+    """
+    parts: List[str] = []
+    cursor = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        if start < cursor or end < start or end > len(text):
+            raise ValueError(f"Invalid or overlapping edit range: [{start}, {end})")
+        parts.append(text[cursor:start])
+        parts.append(replacement)
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts)